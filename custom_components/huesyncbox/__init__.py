@@ -4,52 +4,77 @@ import asyncio
 from dataclasses import dataclass
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import (
-    config_validation as cv,
-    entity_registry as er,
-    issue_registry as ir,
-)
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
 import aiohuesyncbox
 
+from .capabilities import supported_platforms
 from .const import DOMAIN, LOGGER
 from .coordinator import HueSyncBoxCoordinator
 from .helpers import update_config_entry_title, update_device_registry
-from .services import async_register_services
+from .registrations import async_get_unregister_queue
+from .resolver import async_get_host_resolver
+
+# Closing sessions should be quick, but do not let a misbehaving one hold up unload/shutdown
+SESSION_CLOSE_TIMEOUT = 5
 
 
 @dataclass
 class HueSyncBoxRuntimeData:
     coordinator: HueSyncBoxCoordinator
+    platforms: set[Platform]
 
 
 type HueSyncBoxConfigEntry = ConfigEntry[HueSyncBoxRuntimeData]
 
 
-PLATFORMS: list[Platform] = [
-    Platform.NUMBER,
-    Platform.SELECT,
-    Platform.SENSOR,
-    Platform.SWITCH,
-]
-
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
     """Set up the Philips Hue Play HDMI Sync Box integration."""
+    # Service schemas are only needed once the integration is actually set up
+    from .services import async_register_services  # noqa: PLC0415
+
     await async_register_services(hass)
+
+    # Retry cleanup of boxes that were offline when their entry was removed
+    queue = await async_get_unregister_queue(hass)
+    queue.async_retry_pending()
+
+    async def async_close_sessions_on_stop(_event: Event) -> None:
+        await async_close_sessions(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_sessions_on_stop)
+
     return True
 
 
+async def async_close_sessions(hass: HomeAssistant) -> None:
+    """Close the sessions of all loaded boxes concurrently with one overall deadline."""
+    entries: list[HueSyncBoxConfigEntry] = hass.config_entries.async_loaded_entries(
+        DOMAIN
+    )
+    apis = [entry.runtime_data.coordinator.api for entry in entries]
+    if not apis:
+        return
+
+    try:
+        async with asyncio.timeout(SESSION_CLOSE_TIMEOUT):
+            await asyncio.gather(*(api.close() for api in apis), return_exceptions=True)
+    except TimeoutError:
+        LOGGER.warning("Timeout while closing Philips Hue Play HDMI Sync Box sessions")
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: HueSyncBoxConfigEntry) -> bool:
     """Set up Philips Hue Play HDMI Sync Box from a config entry."""
+    address = await async_get_host_resolver(hass).async_resolve(entry.data["host"])
     api = aiohuesyncbox.HueSyncBox(
-        entry.data["host"],
+        address,
         entry.data["unique_id"],
         access_token=entry.data.get("access_token"),
         port=entry.data["port"],
@@ -71,48 +96,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: HueSyncBoxConfigEntry) -
     await update_device_registry(hass, entry, api)
     update_config_entry_title(hass, entry, api.device.name)
 
-    coordinator = HueSyncBoxCoordinator(hass, api)
-    entry.runtime_data = HueSyncBoxRuntimeData(coordinator)
+    coordinator = HueSyncBoxCoordinator(hass, api, address)
+    platforms = supported_platforms(api)
+    entry.runtime_data = HueSyncBoxRuntimeData(coordinator, platforms)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    # Capabilities can show up later, e.g. after a firmware update
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: async_setup_new_platforms(hass, entry), None
+        )
+    )
 
     return True
 
 
+@callback
+def async_setup_new_platforms(
+    hass: HomeAssistant, entry: HueSyncBoxConfigEntry
+) -> None:
+    """Set up platforms for capabilities that were not available before."""
+    runtime_data = entry.runtime_data
+    new_platforms = (
+        supported_platforms(runtime_data.coordinator.api) - runtime_data.platforms
+    )
+    if not new_platforms:
+        return
+
+    LOGGER.debug("Setting up new platforms %s", new_platforms)
+    runtime_data.platforms |= new_platforms
+    entry.async_create_task(
+        hass, hass.config_entries.async_forward_entry_setups(entry, new_platforms)
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: HueSyncBoxConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    ):
         coordinator = entry.runtime_data.coordinator
-        await coordinator.api.close()
+        try:
+            async with asyncio.timeout(SESSION_CLOSE_TIMEOUT):
+                await coordinator.api.close()
+        except TimeoutError:
+            LOGGER.warning("Timeout while closing session of %s", entry.title)
 
     return unload_ok
 
 
 async def async_remove_entry(
-    _hass: HomeAssistant, entry: HueSyncBoxConfigEntry
+    hass: HomeAssistant, entry: HueSyncBoxConfigEntry
 ) -> None:
-    # Best effort cleanup. User might not even have the device anymore or had it factory reset.
+    # Best effort cleanup in the background so removal is not blocked by unreachable boxes.
     # Note that the entry already has been unloaded, so need to create API again
-    try:
-        async with asyncio.timeout(10):
-            async with aiohuesyncbox.HueSyncBox(
-                entry.data["host"],
-                entry.data["unique_id"],
-                access_token=entry.data.get("access_token"),
-                port=entry.data["port"],
-                path=entry.data["path"],
-            ) as api:
-                await api.unregister(entry.data["registration_id"])
-    except Exception as e:  # noqa: BLE001
-        LOGGER.info(
-            "Removing registration from Philips Hue Play HDMI Sync Box failed: %s ", e
-        )
+    queue = await async_get_unregister_queue(hass)
+    queue.async_unregister(dict(entry.data))
 
 
 async def async_migrate_entry(
     hass: HomeAssistant, config_entry: HueSyncBoxConfigEntry
 ) -> bool:
     """Migrate old entry."""
+    # Migrations are rarely needed, so only import them when they are
+    from .migration import migrate_v1_to_v2, migrate_v2_1_to_v2_2  # noqa: PLC0415
+
     from_version = config_entry.version
     LOGGER.debug("Migrating from version %s", from_version)
 
@@ -128,30 +177,3 @@ async def async_migrate_entry(
     )
 
     return True
-
-
-def migrate_v1_to_v2(hass: HomeAssistant, config_entry: HueSyncBoxConfigEntry) -> None:
-    # Mediaplayer entities are obsolete
-    # cleanup so the user does not have to
-    registry = er.async_get(hass)
-    entities = er.async_entries_for_config_entry(registry, config_entry.entry_id)
-
-    for entity in entities:
-        if entity.domain == Platform.MEDIA_PLAYER:
-            registry.async_remove(entity.entity_id)
-
-            # There used to be a repair created here
-            # Removed due to adding dependency on automation
-
-    hass.config_entries.async_update_entry(config_entry, version=2, minor_version=1)
-
-
-def migrate_v2_1_to_v2_2(
-    hass: HomeAssistant, config_entry: HueSyncBoxConfigEntry
-) -> None:
-    # Remove any pending repairs
-    ir.async_delete_issue(
-        hass, DOMAIN, f"automations_using_deleted_mediaplayer_{config_entry.entry_id}"
-    )
-
-    hass.config_entries.async_update_entry(config_entry, version=2, minor_version=2)
@@ -0,0 +1,29 @@
+"""Capability profile of a Philips Hue Play HDMI Sync Box."""
+
+from collections.abc import Callable
+import contextlib
+from typing import Any
+
+from homeassistant.const import Platform
+
+import aiohuesyncbox
+
+# A platform is only loaded when the box reports the data its entities need.
+# Keep these in line with the checks the platforms do for their entities.
+PLATFORM_REQUIREMENTS: dict[Platform, Callable[[aiohuesyncbox.HueSyncBox], Any]] = {
+    Platform.NUMBER: lambda api: api.execution.brightness,
+    Platform.SELECT: lambda api: api.execution.mode,
+    Platform.SENSOR: lambda api: api.hdmi,
+    Platform.SWITCH: lambda api: api.execution.mode,
+}
+
+
+def supported_platforms(api: aiohuesyncbox.HueSyncBox) -> set[Platform]:
+    """Determine the platforms that will have at least one entity for this box."""
+    platforms = set()
+    for platform, requirement in PLATFORM_REQUIREMENTS.items():
+        # When not able to read value, platform is not supported
+        with contextlib.suppress(Exception):
+            if requirement(api) is not None:
+                platforms.add(platform)
+    return platforms
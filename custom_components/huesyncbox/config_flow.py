@@ -2,11 +2,14 @@
 
 import asyncio
 import contextlib
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import (
+    SOURCE_IGNORE,
+    SOURCE_IMPORT,
     SOURCE_REAUTH,
     SOURCE_RECONFIGURE,
     SOURCE_USER,
@@ -21,14 +24,31 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_UNIQUE_ID,
 )
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
+from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+from homeassistant.helpers.typing import DiscoveryInfoType
 import voluptuous as vol
 
 import aiohuesyncbox
 
 from . import HueSyncBoxConfigEntry
 from .const import DEFAULT_PORT, DOMAIN, REGISTRATION_ID
+from .discovery import (
+    DiscoveredBox,
+    async_get_discovered_boxes,
+    async_update_configured_box,
+)
+from .helpers import async_update_host, config_entry_for_mac
+from .tracing import trace_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +65,25 @@ RECONFIGURE_DATA_SCHEMA = vol.Schema(
     }
 )
 
+# Give the user plenty of time to find the box and press the button,
+# but do not keep polling a box forever
+LINK_TIMEOUT = 300
+LINK_POLL_INTERVAL_MIN = 1.0
+LINK_POLL_INTERVAL_MAX = 5.0
+LINK_POLL_INTERVAL_FACTOR = 1.5
+
+# Boxes that are linked at the same time when adding multiple boxes
+BULK_LINK_CONCURRENCY = 20
+
+CONF_DISCOVERED = "discovered"
+CONF_HOSTS = "hosts"
+
+BULK_STATUS_LINKED = "linked"
+BULK_STATUS_ALREADY_CONFIGURED = "already_configured"
+BULK_STATUS_CANNOT_CONNECT = "cannot_connect"
+BULK_STATUS_LINK_TIMEOUT = "link_timeout"
+BULK_STATUS_FAILED = "failed"
+
 
 @dataclass
 class ConnectionInfo:
@@ -56,13 +95,106 @@ class ConnectionInfo:
     path: str = "/api"
 
 
-def entry_data_from_connection_info(connection_info: ConnectionInfo) -> dict[str, Any]:
-    return {
-        CONF_HOST: connection_info.host,
-        CONF_UNIQUE_ID: connection_info.unique_id,
-        CONF_PORT: connection_info.port,
-        CONF_PATH: connection_info.path,
-    }
+@dataclass
+class LinkStatistics:
+    attempts: int = 0
+    started: float = field(default_factory=time.monotonic)
+    duration: float = 0.0
+    timed_out: bool = False
+
+    def as_placeholders(self) -> dict[str, str]:
+        return {"attempts": str(self.attempts), "duration": f"{self.duration:.0f}"}
+
+
+async def register_until_linked(
+    huesyncbox: aiohuesyncbox.HueSyncBox,
+    ha_instance_name: str,
+    statistics: LinkStatistics,
+) -> dict[str, str] | None:
+    """Register until the button is pressed, returns None when it took too long."""
+    interval = LINK_POLL_INTERVAL_MIN
+    try:
+        async with asyncio.timeout(LINK_TIMEOUT):
+            while True:
+                statistics.attempts += 1
+                # InvalidState is expected because syncbox will be in invalid state until button is pressed
+                with contextlib.suppress(aiohuesyncbox.InvalidState):
+                    if registration_info := await huesyncbox.register(
+                        "Home Assistant", ha_instance_name
+                    ):
+                        return registration_info
+                await asyncio.sleep(interval)
+                interval = min(
+                    interval * LINK_POLL_INTERVAL_FACTOR, LINK_POLL_INTERVAL_MAX
+                )
+    except TimeoutError:
+        statistics.timed_out = True
+        return None
+    finally:
+        statistics.duration = time.monotonic() - statistics.started
+
+
+async def link_box(
+    hass: HomeAssistant,
+    connection_info: ConnectionInfo,
+    ha_instance_name: str,
+    statistics: LinkStatistics,
+) -> str | None:
+    """Link with the box and return its name, None when the button was not pressed in time.
+
+    On success the connection_info is updated with the obtained registration.
+    """
+    async with aiohuesyncbox.HueSyncBox(
+        connection_info.host,
+        connection_info.unique_id,
+        connection_info.access_token,
+        connection_info.port,
+        connection_info.path,
+    ) as huesyncbox:
+        trace_api(hass, huesyncbox, None)
+        registration_info = await register_until_linked(
+            huesyncbox, ha_instance_name, statistics
+        )
+        _LOGGER.info(
+            "Linking %s %s after %.1f seconds and %s register attempts",
+            connection_info.host,
+            "succeeded" if registration_info else "timed out",
+            statistics.duration,
+            statistics.attempts,
+        )
+        if not registration_info:
+            return None
+
+        connection_info.access_token = registration_info[CONF_ACCESS_TOKEN]
+        connection_info.registration_id = registration_info[REGISTRATION_ID]
+
+        await huesyncbox.initialize()
+        return huesyncbox.device.name
+
+
+@dataclass
+class BulkResult:
+    connection_info: ConnectionInfo
+    status: str
+    name: str | None = None
+
+    def summary(self) -> str:
+        name = self.name or self.connection_info.host
+        return f"- {name} ({self.connection_info.unique_id}): {self.status}"
+
+
+def parse_host_list(hosts: str) -> list[ConnectionInfo]:
+    """Parse lines of `host,unique_id`, raises ValueError on invalid lines."""
+    connection_infos = []
+    for line in hosts.splitlines():
+        line = line.strip()  # noqa: PLW2901
+        if not line or line.startswith("#"):
+            continue
+        host, _, unique_id = line.partition(",")
+        if not host.strip() or not unique_id.strip():
+            raise ValueError(line)
+        connection_infos.append(ConnectionInfo(host.strip(), unique_id.strip()))
+    return connection_infos
 
 
 def connection_info_from_entry(entry: HueSyncBoxConfigEntry) -> ConnectionInfo:
@@ -102,17 +234,23 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
     MINOR_VERSION = 2
 
     link_task: asyncio.Task | None = None
+    link_statistics: LinkStatistics | None = None
 
     connection_info: ConnectionInfo
     device_name = "Default syncbox name"
 
+    bulk_connection_infos: list[ConnectionInfo]
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
         _LOGGER.debug("async_step_user, %s", user_input)
 
-        return await self.async_step_configure(user_input=user_input)
+        if user_input is not None:
+            return await self.async_step_configure(user_input=user_input)
+
+        return self.async_show_menu(step_id="user", menu_options=["configure", "bulk"])
 
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
@@ -199,15 +337,75 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
         # Also available, do we need it?
         # "devicetype": discovery_info.properties["devicetype"],  value is HSB001
 
-        await self.async_set_unique_id(connection_info.unique_id)
-        self._abort_if_unique_id_configured(
-            updates=entry_data_from_connection_info(connection_info),
-            reload_on_update=True,  # This is the default, but make it more visible
+        return await self._async_handle_discovery(
+            connection_info, discovery_info.properties["name"]
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: DiscoveryInfoType
+    ) -> ConfigFlowResult:
+        """Handle boxes found by scanning subnets."""
+        _LOGGER.debug("async_step_integration_discovery, %s", discovery_info)
+
+        connection_info = ConnectionInfo(
+            discovery_info[CONF_HOST],
+            discovery_info[CONF_UNIQUE_ID],
+            port=discovery_info[CONF_PORT],
+            path=discovery_info[CONF_PATH],
+        )
+        return await self._async_handle_discovery(
+            connection_info, discovery_info[CONF_NAME]
         )
 
-        self.device_name = discovery_info.properties["name"]
+    async def async_step_dhcp(
+        self, discovery_info: DhcpServiceInfo
+    ) -> ConfigFlowResult:
+        """Handle DHCP discovery, used to follow address changes of configured boxes."""
+        _LOGGER.debug("async_step_dhcp, %s", discovery_info)
+
+        if entry := config_entry_for_mac(self.hass, discovery_info.macaddress):
+            if entry.data[CONF_HOST] != discovery_info.ip:
+                _LOGGER.debug(
+                    "Address of %s changed to %s", entry.title, discovery_info.ip
+                )
+                async_update_host(self.hass, entry, discovery_info.ip)
+            return self.async_abort(reason="already_configured")
+
+        unique_id = discovery_info.macaddress.replace(":", "").upper()
+        return await self._async_handle_discovery(
+            ConnectionInfo(discovery_info.ip, unique_id),
+            discovery_info.hostname or unique_id,
+        )
+
+    async def _async_handle_discovery(
+        self, connection_info: ConnectionInfo, device_name: str
+    ) -> ConfigFlowResult:
+        discovered_box = DiscoveredBox(
+            connection_info.unique_id,
+            connection_info.host,
+            connection_info.port,
+            connection_info.path,
+            device_name,
+        )
+
+        await self.async_set_unique_id(connection_info.unique_id)
+        if (
+            entry := self.hass.config_entries.async_entry_for_domain_unique_id(
+                DOMAIN, connection_info.unique_id
+            )
+        ) and entry.source != SOURCE_IGNORE:
+            async_update_configured_box(self.hass, entry, discovered_box)
+            return self.async_abort(reason="already_configured")
+        self._abort_if_unique_id_configured()
+
+        self.device_name = device_name
         self.connection_info = connection_info
 
+        # Remember so it can be offered when adding multiple boxes at once
+        async_get_discovered_boxes(self.hass)[connection_info.unique_id] = (
+            discovered_box
+        )
+
         # This makes sure that the name of the box appears in the card with the discovered device
         self.context.update({"title_placeholders": {CONF_NAME: self.device_name}})
 
@@ -224,43 +422,199 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
             return self.async_show_form(step_id="zeroconf_confirm", last_step=False)
         return await self.async_step_link()
 
+    def _unconfigured_discovered_boxes(self) -> list[DiscoveredBox]:
+        configured = self._async_current_ids(include_ignore=False)
+        return [
+            box
+            for box in async_get_discovered_boxes(self.hass).values()
+            if box.unique_id not in configured
+        ]
+
+    async def async_step_bulk(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add multiple boxes at once from discovered boxes and/or a host list."""
+        _LOGGER.debug("async_step_bulk, %s", user_input)
+
+        discovered_boxes = self._unconfigured_discovered_boxes()
+        errors = {}
+
+        if user_input is not None:
+            discovered = {box.unique_id: box for box in discovered_boxes}
+            connection_infos = [
+                ConnectionInfo(
+                    discovered[unique_id].host,
+                    unique_id,
+                    port=discovered[unique_id].port,
+                    path=discovered[unique_id].path,
+                )
+                for unique_id in user_input.get(CONF_DISCOVERED, [])
+                if unique_id in discovered
+            ]
+            try:
+                connection_infos.extend(
+                    parse_host_list(user_input.get(CONF_HOSTS, ""))
+                )
+            except ValueError:
+                errors[CONF_HOSTS] = "invalid_host_list"
+            else:
+                if connection_infos:
+                    self.bulk_connection_infos = connection_infos
+                    return await self.async_step_bulk_link()
+                errors["base"] = "no_boxes"
+
+        schema: dict[Any, Any] = {}
+        if discovered_boxes:
+            schema[vol.Optional(CONF_DISCOVERED, default=[])] = SelectSelector(
+                SelectSelectorConfig(
+                    options=[
+                        SelectOptionDict(
+                            value=box.unique_id, label=f"{box.name} ({box.host})"
+                        )
+                        for box in discovered_boxes
+                    ],
+                    multiple=True,
+                )
+            )
+        schema[vol.Optional(CONF_HOSTS, default="")] = TextSelector(
+            TextSelectorConfig(multiline=True)
+        )
+
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(schema), user_input or {}
+            ),
+            errors=errors,
+            last_step=False,
+        )
+
+    async def _async_bulk_link_box(
+        self, semaphore: asyncio.Semaphore, connection_info: ConnectionInfo
+    ) -> BulkResult:
+        if connection_info.unique_id in self._async_current_ids(include_ignore=False):
+            return BulkResult(connection_info, BULK_STATUS_ALREADY_CONFIGURED)
+
+        async with semaphore:
+            try:
+                await try_connection(connection_info)
+                name = await link_box(
+                    self.hass,
+                    connection_info,
+                    self.hass.config.location_name,
+                    LinkStatistics(),
+                )
+            except CannotConnectError:
+                return BulkResult(connection_info, BULK_STATUS_CANNOT_CONNECT)
+            except aiohuesyncbox.AiohuesyncboxException:
+                _LOGGER.exception("Linking %s failed", connection_info.host)
+                return BulkResult(connection_info, BULK_STATUS_FAILED)
+
+        if name is None:
+            return BulkResult(connection_info, BULK_STATUS_LINK_TIMEOUT)
+        return BulkResult(connection_info, BULK_STATUS_LINKED, name)
+
+    async def _async_bulk_link(self) -> list[BulkResult]:
+        semaphore = asyncio.Semaphore(BULK_LINK_CONCURRENCY)
+        return await asyncio.gather(
+            *(
+                self._async_bulk_link_box(semaphore, connection_info)
+                for connection_info in self.bulk_connection_infos
+            )
+        )
+
+    async def async_step_bulk_link(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Link all boxes concurrently."""
+        _LOGGER.debug("async_step_bulk_link")
+
+        if not self.link_task:
+            self.link_task = self.hass.async_create_task(self._async_bulk_link())
+
+        if not self.link_task.done():
+            return self.async_show_progress(
+                step_id="bulk_link",
+                progress_action="wait_for_buttons",
+                progress_task=self.link_task,
+                description_placeholders={
+                    "count": str(len(self.bulk_connection_infos))
+                },
+            )
+
+        return self.async_show_progress_done(next_step_id="bulk_finish")
+
+    async def async_step_bulk_finish(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Create entries for all linked boxes and report the results per box."""
+        assert self.link_task is not None  # noqa: S101
+        results: list[BulkResult] = self.link_task.result()
+
+        await asyncio.gather(
+            *(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_IMPORT},
+                    data=asdict(result.connection_info) | {CONF_NAME: result.name},
+                )
+                for result in results
+                if result.status == BULK_STATUS_LINKED
+            )
+        )
+
+        return self.async_abort(
+            reason="bulk_finished",
+            description_placeholders={
+                "linked": str(
+                    sum(result.status == BULK_STATUS_LINKED for result in results)
+                ),
+                "total": str(len(results)),
+                "results": "\n".join(result.summary() for result in results),
+            },
+        )
+
+    async def async_step_import(
+        self, import_data: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Create an entry for a box that was linked while adding multiple boxes."""
+        _LOGGER.debug("async_step_import, %s", import_data[CONF_HOST])
+
+        await self.async_set_unique_id(import_data[CONF_UNIQUE_ID])
+        self._abort_if_unique_id_configured()
+
+        name = import_data.pop(CONF_NAME)
+        return self.async_create_entry(title=name, data=import_data)
+
     async def _async_register(
         self, ha_instance_name: str, connection_info: ConnectionInfo
     ) -> bool:
         _LOGGER.debug("_async_register, %s", connection_info)
 
+        self.link_statistics = LinkStatistics()
         try:
-            async with aiohuesyncbox.HueSyncBox(
-                connection_info.host,
-                connection_info.unique_id,
-                connection_info.access_token,
-                connection_info.port,
-                connection_info.path,
-            ) as huesyncbox:
-                registration_info = None
-                while not registration_info:
-                    # InvalidState is expected because syncbox will be in invalid state until button is pressed
-                    with contextlib.suppress(aiohuesyncbox.InvalidState):
-                        registration_info = await huesyncbox.register(
-                            "Home Assistant", ha_instance_name
-                        )
-                    await asyncio.sleep(1)
-
-                self.connection_info.access_token = registration_info[CONF_ACCESS_TOKEN]
-                self.connection_info.registration_id = registration_info[
-                    REGISTRATION_ID
-                ]
-
-                await huesyncbox.initialize()
-                self.device_name = huesyncbox.device.name
-
-                return True
+            device_name = await link_box(
+                self.hass, connection_info, ha_instance_name, self.link_statistics
+            )
         except aiohuesyncbox.RequestError:
             return False
         except aiohuesyncbox.AiohuesyncboxException:
             _LOGGER.exception("Unknown Philips Hue Play HDMI Sync Box error occurred")
             return False
 
+        if device_name is None:
+            return False
+
+        self.device_name = device_name
+        return True
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop linking when the flow is removed, e.g. when the user closes the dialog."""
+        if self.link_task and not self.link_task.done():
+            _LOGGER.debug("async_remove, cancelling link_task")
+            self.link_task.cancel()
+
     async def async_step_link(
         self, _user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -293,9 +647,10 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
             "async_step_link, asyncio.async_show_progress_done registered=%s",
             registered,
         )
-        return self.async_show_progress_done(
-            next_step_id="finish" if registered else "abort"
-        )
+        next_step_id = "finish" if registered else "abort"
+        if self.link_statistics and self.link_statistics.timed_out:
+            next_step_id = "link_timeout"
+        return self.async_show_progress_done(next_step_id=next_step_id)
 
     async def async_step_finish(
         self, user_input: dict[str, Any] | None = None
@@ -319,6 +674,14 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
                 reason="reconfigure_successful",
             )
 
+        if self.link_statistics:
+            return self.async_create_entry(
+                title=self.device_name,
+                data=asdict(self.connection_info),
+                description="linked",
+                description_placeholders=self.link_statistics.as_placeholders(),
+            )
+
         return self.async_create_entry(
             title=self.device_name, data=asdict(self.connection_info)
         )
@@ -330,6 +693,18 @@ class HueSyncBoxConfigFlow(ConfigFlow, domain=DOMAIN):
         _LOGGER.debug("async_step_abort, %s", user_input)
         return self.async_abort(reason="connection_failed")
 
+    async def async_step_link_timeout(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Abort flow because the button was not pressed in time."""
+        _LOGGER.debug("async_step_link_timeout, %s", user_input)
+        return self.async_abort(
+            reason="link_timeout",
+            description_placeholders=(
+                self.link_statistics.as_placeholders() if self.link_statistics else None
+            ),
+        )
+
     async def async_step_reauth(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
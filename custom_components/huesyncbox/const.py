@@ -15,6 +15,9 @@ MANUFACTURER_NAME = "Signify"
 
 REGISTRATION_ID = "registration_id"
 
+# Keys in the API responses that identify the box, bridge or network
+KEYS_TO_REDACT_API = ["uniqueId", "bridgeUniqueId", "ssid"]
+
 INTENSITY_SUBTLE = "subtle"
 INTENSITY_MODERATE = "moderate"
 INTENSITY_HIGH = "high"
@@ -32,6 +35,9 @@ INPUT_HDMI3 = "input3"
 INPUT_HDMI4 = "input4"
 INPUTS = [INPUT_HDMI1, INPUT_HDMI2, INPUT_HDMI3, INPUT_HDMI4]
 
+# Index is the led mode value of the API
+LED_INDICATOR_MODES = ["off", "normal", "dimmed"]
+
 ATTR_DEVICE_ID = "device_id"
 
 SERVICE_SET_BRIDGE = "set_bridge"
@@ -46,3 +52,21 @@ ATTR_MODE = "mode"
 ATTR_INTENSITY = "intensity"
 ATTR_INPUT = "input"
 ATTR_ENTERTAINMENT_AREA = "entertainment_area"
+
+SERVICE_SCAN = "scan"
+ATTR_SUBNETS = "subnets"
+
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+
+SERVICE_START_TRACING = "start_tracing"
+SERVICE_STOP_TRACING = "stop_tracing"
+ATTR_SAMPLE_RATE = "sample_rate"
+ATTR_WRITE_FILE = "write_file"
+
+SERVICE_START_WATCHDOG = "start_watchdog"
+SERVICE_STOP_WATCHDOG = "stop_watchdog"
+ATTR_THRESHOLD = "threshold"
+
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
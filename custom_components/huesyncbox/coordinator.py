@@ -1,8 +1,10 @@
 """Coordinator for the Philips Hue Play HDMI Sync Box integration."""
 
 import asyncio
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST, CONF_PATH, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
@@ -10,14 +12,24 @@ import aiohuesyncbox
 
 from .const import COORDINATOR_UPDATE_INTERVAL, LOGGER
 from .helpers import update_config_entry_title, update_device_registry
+from .poll_statistics import PollStatistics
+from .recording import record_api
+from .request_history import RequestHistory, instrument_api
+from .resolver import async_get_host_resolver, is_host_name
+from .snapshot import Snapshot, create_snapshot
+from .tracing import OPERATION_POLL, trace_api, trace_span
+from .watchdog import DATA_WATCHDOG
 
 MAX_CONSECUTIVE_ERRORS = 5
+UPDATE_TIMEOUT = 5
 
 
-class HueSyncBoxCoordinator(DataUpdateCoordinator[aiohuesyncbox.HueSyncBox]):
+class HueSyncBoxCoordinator(DataUpdateCoordinator[Snapshot]):
     """My custom coordinator."""
 
-    def __init__(self, hass: HomeAssistant, api: aiohuesyncbox.HueSyncBox) -> None:
+    def __init__(
+        self, hass: HomeAssistant, api: aiohuesyncbox.HueSyncBox, address: str
+    ) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
@@ -26,23 +38,70 @@ class HueSyncBoxCoordinator(DataUpdateCoordinator[aiohuesyncbox.HueSyncBox]):
             name=f"Philips Hue Play HDMI Sync Box ({api.device.name} at {api.device.ip_address})",
             # Polling interval. Will only be polled if there are subscribers.
             update_interval=COORDINATOR_UPDATE_INTERVAL,
+            # Listeners only run when the snapshot changed
+            always_update=False,
         )
         self.api = api
+        self.data = create_snapshot(api)
+        self.address = address
+        self.poll_statistics = PollStatistics()
+        self.request_history = RequestHistory()
+        self._instrument(api)
         self._consecutive_errors = 0
+        self._poll_listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def consecutive_errors(self) -> int:
+        return self._consecutive_errors
+
+    def _instrument(self, api: aiohuesyncbox.HueSyncBox) -> None:
+        assert self.config_entry is not None  # noqa: S101
+        instrument_api(api, self.request_history, self.poll_statistics.record_request)
+        trace_api(self.hass, api, self.config_entry.entry_id)
+        record_api(self.hass, api, self.config_entry.entry_id)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        if (watchdog := self.hass.data.get(DATA_WATCHDOG)) is None:
+            super().async_update_listeners()
+            return
+        watchdog.async_run_listeners(
+            update_callback for update_callback, _ in list(self._listeners.values())
+        )
+
+    @callback
+    def async_add_poll_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for every poll, also the ones that did not change the snapshot."""
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._poll_listeners.remove(update_callback)
+
+        return remove_listener
 
     def _is_consecutive_error_reached(self) -> bool:
         self._consecutive_errors += 1
         LOGGER.debug("Consecutive errors = %s", self._consecutive_errors)
         return self._consecutive_errors >= MAX_CONSECUTIVE_ERRORS
 
-    async def _async_update_data(self) -> aiohuesyncbox.HueSyncBox:
+    async def _async_update_data(self) -> Snapshot:
         """Fetch data from API endpoint."""
+        try:
+            return await self._async_poll()
+        finally:
+            for update_callback in list(self._poll_listeners):
+                update_callback()
+
+    async def _async_poll(self) -> Snapshot:
+        await self._async_follow_resolved_address()
+
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with asyncio.timeout(5):
+            async with asyncio.timeout(UPDATE_TIMEOUT):
                 old_device = self.api.device
-                await self.api.update()
+                await self._async_timed_update()
                 self._consecutive_errors = 0
 
                 if old_device != self.api.device:
@@ -64,4 +123,67 @@ class HueSyncBoxCoordinator(DataUpdateCoordinator[aiohuesyncbox.HueSyncBox]):
             if self._is_consecutive_error_reached():
                 raise
 
-        return self.api
+        return create_snapshot(self.api, self.data)
+
+    async def _async_timed_update(self) -> None:
+        assert self.config_entry is not None  # noqa: S101
+        start = time.monotonic()
+        success = False
+        try:
+            with trace_span(self.hass, OPERATION_POLL, self.config_entry.entry_id):
+                await self.api.update()
+            success = True
+        finally:
+            self.poll_statistics.record_poll(time.monotonic() - start, success=success)
+
+    async def _async_follow_resolved_address(self) -> None:
+        assert self.config_entry is not None  # noqa: S101
+        host = self.config_entry.data[CONF_HOST]
+        if not is_host_name(host):
+            return
+
+        address = await async_get_host_resolver(self.hass).async_resolve(host)
+        if address != self.address:
+            LOGGER.debug("%s now resolves to %s", host, address)
+            await self._async_switch_api(address)
+
+    async def _async_switch_api(self, address: str) -> bool:
+        assert self.config_entry is not None  # noqa: S101
+        api = aiohuesyncbox.HueSyncBox(
+            address,
+            self.api.device.unique_id,
+            access_token=self.config_entry.data.get(CONF_ACCESS_TOKEN),
+            port=self.config_entry.data[CONF_PORT],
+            path=self.config_entry.data[CONF_PATH],
+        )
+        self._instrument(api)
+        try:
+            async with asyncio.timeout(UPDATE_TIMEOUT):
+                await api.update()
+        except (aiohuesyncbox.AiohuesyncboxException, TimeoutError) as err:
+            LOGGER.debug("Box not reachable at new address %s: %s", address, err)
+            await api.close()
+            return False
+
+        if api.last_response is None:
+            await api.close()
+            return False
+
+        LOGGER.debug("Switching %s to new address %s", self.api.device.name, address)
+        old_api, self.api = self.api, api
+        self.address = address
+        await old_api.close()
+
+        self._consecutive_errors = 0
+        return True
+
+    async def async_set_host(self, host: str) -> bool:
+        """Switch to the box at a new address without reloading.
+
+        Returns False when the box could not be reached at the new address.
+        """
+        if not await self._async_switch_api(host):
+            return False
+
+        self.async_set_updated_data(create_snapshot(self.api, self.data))
+        return True
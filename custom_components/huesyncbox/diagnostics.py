@@ -3,17 +3,19 @@
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
-from homeassistant.const import CONF_ACCESS_TOKEN, CONF_UNIQUE_ID
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST, CONF_UNIQUE_ID
 from homeassistant.core import HomeAssistant
 
 from . import HueSyncBoxConfigEntry
+from .const import KEYS_TO_REDACT_API
+from .resolver import async_get_host_resolver
+from .tracing import DATA_TRACER
 
 KEYS_TO_REDACT_CONFIG_ENTRY = [CONF_ACCESS_TOKEN, CONF_UNIQUE_ID]
-KEYS_TO_REDACT_API = ["uniqueId", "bridgeUniqueId", "ssid"]
 
 
 async def async_get_config_entry_diagnostics(
-    _hass: HomeAssistant, entry: HueSyncBoxConfigEntry
+    hass: HomeAssistant, entry: HueSyncBoxConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     data = {}
@@ -22,7 +24,21 @@ async def async_get_config_entry_diagnostics(
         dict(entry.data), KEYS_TO_REDACT_CONFIG_ENTRY
     )
 
+    if host_resolution := async_get_host_resolver(hass).as_dict(
+        entry.data[CONF_HOST]
+    ):
+        data["host_resolution"] = host_resolution
+
+    if tracer := hass.data.get(DATA_TRACER):
+        data["traces"] = [
+            span for span in tracer.spans if span["entry_id"] == entry.entry_id
+        ]
+
     if runtime_data := entry.runtime_data:
+        data["address"] = runtime_data.coordinator.address
+        data["request_history"] = async_redact_data(
+            runtime_data.coordinator.request_history.as_list(), KEYS_TO_REDACT_API
+        )
         data["api"] = {}
         if runtime_data.coordinator.api.last_response is not None:
             data["api"] = async_redact_data(
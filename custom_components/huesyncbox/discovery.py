@@ -0,0 +1,65 @@
+"""Bookkeeping of discovered Philips Hue Play HDMI Sync Boxes."""
+
+from dataclasses import dataclass
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PATH, CONF_PORT
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+from .helpers import async_get_reload_limiter, async_update_host
+from .resolver import async_get_host_resolver, is_host_name
+
+
+@dataclass
+class DiscoveredBox:
+    unique_id: str
+    host: str
+    port: int
+    path: str
+    name: str
+
+
+DATA_DISCOVERED_BOXES: HassKey[dict[str, DiscoveredBox]] = HassKey(
+    f"{DOMAIN}_discovered_boxes"
+)
+
+
+def async_get_discovered_boxes(hass: HomeAssistant) -> dict[str, DiscoveredBox]:
+    """Boxes seen by discovery, by unique_id."""
+    return hass.data.setdefault(DATA_DISCOVERED_BOXES, {})
+
+
+@callback
+def async_update_configured_box(
+    hass: HomeAssistant, entry: ConfigEntry, box: DiscoveredBox
+) -> None:
+    """Apply discovery information of a configured box, reloading only when needed.
+
+    Boxes announce themselves repeatedly, e.g. many at once after a power cut,
+    so announcements that change nothing are ignored and reloads are rate limited.
+    """
+    discovered_boxes = async_get_discovered_boxes(hass)
+    previous = discovered_boxes.get(box.unique_id)
+    discovered_boxes[box.unique_id] = box
+    if previous is not None and (previous.host, previous.port, previous.path) == (
+        box.host,
+        box.port,
+        box.path,
+    ):
+        return
+
+    if (entry.data[CONF_PORT], entry.data[CONF_PATH]) == (box.port, box.path):
+        # Only the address can be followed without a reload
+        async_update_host(hass, entry, box.host)
+        return
+
+    LOGGER.debug("Connection details of %s changed, reloading", entry.title)
+    data = {**entry.data, CONF_PORT: box.port, CONF_PATH: box.path}
+    if is_host_name(entry.data[CONF_HOST]):
+        async_get_host_resolver(hass).async_update(entry.data[CONF_HOST], box.host)
+    else:
+        data[CONF_HOST] = box.host
+    hass.config_entries.async_update_entry(entry, data=data)
+    async_get_reload_limiter(hass).async_schedule_reload(entry.entry_id)
@@ -1,16 +1,25 @@
 """Helpers for the Philips Hue Play HDMI Sync Box integration."""
 
 from collections.abc import Callable
+from datetime import datetime
+import time
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
 
 import aiohuesyncbox
 
-from .const import DOMAIN, LOGGER, MANUFACTURER_NAME
+from .const import DOMAIN, LOGGER, MANUFACTURER_NAME, SYNC_MODES
+from .resolver import async_get_host_resolver, is_host_name
+
+# Minimum time between reloads of an entry triggered by discovery
+RELOAD_COOLDOWN = 60  # seconds
 
 
 async def update_device_registry(
@@ -37,6 +46,100 @@ async def update_device_registry(
     )
 
 
+def config_entry_for_mac(hass: HomeAssistant, mac: str) -> ConfigEntry | None:
+    """Find the config entry of the box with the MAC address, the unique_id of a box is its MAC."""
+    device_registry = dr.async_get(hass)
+
+    if device_entry := device_registry.async_get_device(
+        connections={(CONNECTION_NETWORK_MAC, dr.format_mac(mac))}
+    ):
+        for config_entry_id in device_entry.config_entries:
+            entry = hass.config_entries.async_get_entry(config_entry_id)
+            if entry is not None and entry.domain == DOMAIN:
+                return entry
+
+    return hass.config_entries.async_entry_for_domain_unique_id(
+        DOMAIN, mac.replace(":", "").upper()
+    )
+
+
+@callback
+def async_update_host(hass: HomeAssistant, entry: ConfigEntry, host: str) -> None:
+    """Store the new address of a box and let a running coordinator follow it."""
+    if is_host_name(entry.data[CONF_HOST]):
+        # Configured by host name, keep it and only refresh the resolved address
+        async_get_host_resolver(hass).async_update(entry.data[CONF_HOST], host)
+    elif entry.data[CONF_HOST] != host:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_HOST: host}
+        )
+
+    reload_limiter = async_get_reload_limiter(hass)
+    if entry.state is not ConfigEntryState.LOADED:
+        if entry.state is ConfigEntryState.SETUP_RETRY:
+            # Do not wait for the next retry, the box is probably reachable now
+            reload_limiter.async_schedule_reload(entry.entry_id)
+        return
+
+    if entry.runtime_data.coordinator.address == host:
+        return
+
+    async def async_switch_host() -> None:
+        if not await entry.runtime_data.coordinator.async_set_host(host):
+            reload_limiter.async_schedule_reload(entry.entry_id)
+
+    entry.async_create_background_task(
+        hass, async_switch_host(), f"{DOMAIN} switch host {host}"
+    )
+
+
+DATA_RELOAD_LIMITER: HassKey["ReloadLimiter"] = HassKey(f"{DOMAIN}_reload_limiter")
+
+
+def async_get_reload_limiter(hass: HomeAssistant) -> "ReloadLimiter":
+    if (limiter := hass.data.get(DATA_RELOAD_LIMITER)) is None:
+        limiter = hass.data[DATA_RELOAD_LIMITER] = ReloadLimiter(hass)
+    return limiter
+
+
+class ReloadLimiter:
+    """Reloads an entry at most once per cooldown, requests in between are combined."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._last_reload: dict[str, float] = {}
+        self._pending: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_schedule_reload(self, entry_id: str) -> None:
+        if entry_id in self._pending:
+            return
+
+        delay = (
+            self._last_reload.get(entry_id, -RELOAD_COOLDOWN)
+            + RELOAD_COOLDOWN
+            - time.monotonic()
+        )
+        if delay <= 0:
+            self._async_reload(entry_id)
+            return
+
+        @callback
+        def async_reload_later(_now: datetime) -> None:
+            self._async_reload(entry_id)
+
+        LOGGER.debug("Delaying reload of %s for %.0f seconds", entry_id, delay)
+        self._pending[entry_id] = async_call_later(
+            self._hass, delay, async_reload_later
+        )
+
+    @callback
+    def _async_reload(self, entry_id: str) -> None:
+        self._pending.pop(entry_id, None)
+        self._last_reload[entry_id] = time.monotonic()
+        self._hass.config_entries.async_schedule_reload(entry_id)
+
+
 def update_config_entry_title(
     hass: HomeAssistant, config_entry: ConfigEntry, new_title: str
 ) -> None:
@@ -94,19 +197,17 @@ class BrightnessRangeConverter:
         return round(cls._converter.range_2_to_range_1(api_value))
 
 
+def get_sync_mode(api: aiohuesyncbox.HueSyncBox) -> str:
+    """Get mode."""
+    mode = api.execution.mode
+    if api.execution.mode not in SYNC_MODES:
+        mode = api.execution.last_sync_mode
+    return mode
+
+
 def get_hue_target_from_id(id_: str) -> str:
     """Determine API target from id."""
     try:
         return f"groups/{int(id_)}"
     except ValueError:
         return id_
-
-
-def get_group_from_area_name(
-    api: aiohuesyncbox.HueSyncBox, area_name: str
-) -> aiohuesyncbox.Group | None:
-    """Get the group object by entertainment area name."""
-    for group in api.hue.groups:
-        if group.name == area_name:
-            return group
-    return None
@@ -0,0 +1,33 @@
+"""Config entry migrations for the Philips Hue Play HDMI Sync Box integration."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, issue_registry as ir
+
+from .const import DOMAIN
+
+
+def migrate_v1_to_v2(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    # Mediaplayer entities are obsolete
+    # cleanup so the user does not have to
+    registry = er.async_get(hass)
+    entities = er.async_entries_for_config_entry(registry, config_entry.entry_id)
+
+    for entity in entities:
+        if entity.domain == Platform.MEDIA_PLAYER:
+            registry.async_remove(entity.entity_id)
+
+            # There used to be a repair created here
+            # Removed due to adding dependency on automation
+
+    hass.config_entries.async_update_entry(config_entry, version=2, minor_version=1)
+
+
+def migrate_v2_1_to_v2_2(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    # Remove any pending repairs
+    ir.async_delete_issue(
+        hass, DOMAIN, f"automations_using_deleted_mediaplayer_{config_entry.entry_id}"
+    )
+
+    hass.config_entries.async_update_entry(config_entry, version=2, minor_version=2)
@@ -13,11 +13,12 @@ import aiohuesyncbox
 from .const import DOMAIN
 from .coordinator import HueSyncBoxCoordinator
 from .helpers import BrightnessRangeConverter, stop_sync_and_retry_on_invalid_state
+from .snapshot import Snapshot
 
 
 @dataclass(frozen=True, kw_only=True)
 class HueSyncBoxNumberEntityDescription(NumberEntityDescription):
-    get_value: Callable[[aiohuesyncbox.HueSyncBox], float] = None  # type: ignore[assignment]
+    get_value: Callable[[Snapshot], float | None] = None  # type: ignore[assignment]
     set_value_fn: Callable[[aiohuesyncbox.HueSyncBox, float], Coroutine] = None  # type: ignore[assignment]
 
 
@@ -34,9 +35,7 @@ ENTITY_DESCRIPTIONS = [
         native_min_value=1,
         native_step=1,
         native_unit_of_measurement="%",
-        get_value=lambda api: BrightnessRangeConverter.api_to_ha(
-            api.execution.brightness
-        ),
+        get_value=lambda snapshot: snapshot.brightness,
         set_value_fn=set_brightness,
     ),
 ]
@@ -52,7 +51,7 @@ async def async_setup_entry(
     entities: list[NumberEntity] = [
         HueSyncBoxNumber(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
-        if entity_description.get_value(coordinator.api) is not None
+        if entity_description.get_value(coordinator.data) is not None
     ]
 
     async_add_entities(entities)
@@ -81,7 +80,7 @@ class HueSyncBoxNumber(CoordinatorEntity[HueSyncBoxCoordinator], NumberEntity):
 
     @property
     def native_value(self) -> float | None:
-        return self.entity_description.get_value(self.coordinator.api)
+        return self.entity_description.get_value(self.coordinator.data)
 
     async def async_set_native_value(self, value: float) -> None:
         await stop_sync_and_retry_on_invalid_state(
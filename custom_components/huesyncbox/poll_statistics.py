@@ -0,0 +1,73 @@
+"""Statistics on polling a Philips Hue Play HDMI Sync Box."""
+
+from collections import deque
+import math
+import time
+
+# Amount of polls the rolling statistics are based on, about 5 minutes at the default interval
+POLL_HISTORY_SIZE = 100
+
+REQUESTS_PER_MINUTE_WINDOW = 60  # seconds
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class PollStatistics:
+    """Keeps rolling statistics of polls, recording a poll is cheap.
+
+    Percentiles are only calculated when asked for.
+    """
+
+    def __init__(self) -> None:
+        self._durations: deque[float] = deque(maxlen=POLL_HISTORY_SIZE)
+        self._successes: deque[bool] = deque(maxlen=POLL_HISTORY_SIZE)
+        self._request_times: deque[float] = deque()
+
+        self.last_duration: float | None = None
+        self.total_polls = 0
+        self.total_failures = 0
+
+    def record_poll(self, duration: float, *, success: bool) -> None:
+        self.last_duration = duration
+        self.total_polls += 1
+        if not success:
+            self.total_failures += 1
+
+        self._durations.append(duration)
+        self._successes.append(success)
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        self._request_times.append(now)
+        self._prune_request_times(now)
+
+    def _prune_request_times(self, now: float) -> None:
+        cutoff = now - REQUESTS_PER_MINUTE_WINDOW
+        while self._request_times and self._request_times[0] < cutoff:
+            self._request_times.popleft()
+
+    def latency_percentile(self, percent: float) -> float | None:
+        """Latency percentile in seconds over the recent polls."""
+        if not self._durations:
+            return None
+        return percentile(sorted(self._durations), percent)
+
+    @property
+    def durations(self) -> list[float]:
+        return list(self._durations)
+
+    @property
+    def success_rate(self) -> float | None:
+        """Percentage of the recent polls that succeeded."""
+        if not self._successes:
+            return None
+        return 100 * sum(self._successes) / len(self._successes)
+
+    @property
+    def requests_per_minute(self) -> int:
+        self._prune_request_times(time.monotonic())
+        return len(self._request_times)
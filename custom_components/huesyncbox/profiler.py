@@ -0,0 +1,208 @@
+"""On demand profiling of the hot paths of the integration.
+
+Timing wrappers are only installed while profiling and removed afterwards,
+so there is no cost when not profiling.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+import functools
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .coordinator import HueSyncBoxCoordinator
+from .poll_statistics import percentile
+
+CATEGORY_COORDINATOR_UPDATE = "coordinator_update"
+CATEGORY_REQUEST = "request"
+CATEGORY_RESPONSE_PARSING = "response_parsing"
+CATEGORY_LISTENER_FANOUT = "listener_fanout"
+
+DATA_PROFILER: HassKey["Profiler"] = HassKey(f"{DOMAIN}_profiler")
+
+# Amount of entities listed in the report, ordered by total time spent
+TOP_ENTITIES = 10
+
+
+def entity_properties() -> list[tuple[type, str]]:
+    """Entity properties that are evaluated on each state write."""
+    # Platforms are imported by Home Assistant when set up, no extra cost here
+    from .number import HueSyncBoxNumber  # noqa: PLC0415
+    from .select import HueSyncBoxSelect  # noqa: PLC0415
+    from .sensor import HueSyncBoxPollStatisticsSensor, HueSyncBoxSensor  # noqa: PLC0415
+    from .switch import HueSyncBoxSwitch  # noqa: PLC0415
+
+    return [
+        (HueSyncBoxNumber, "native_value"),
+        (HueSyncBoxSelect, "current_option"),
+        (HueSyncBoxSelect, "options"),
+        (HueSyncBoxSensor, "native_value"),
+        (HueSyncBoxPollStatisticsSensor, "native_value"),
+        (HueSyncBoxSwitch, "is_on"),
+    ]
+
+
+def summarize(durations: list[float]) -> dict[str, Any]:
+    durations = sorted(durations)
+    total = sum(durations)
+    return {
+        "count": len(durations),
+        "total_ms": round(total * 1000, 3),
+        "mean_ms": round(total * 1000 / len(durations), 3),
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 95) * 1000, 3),
+        "max_ms": round(durations[-1] * 1000, 3),
+    }
+
+
+class Profiler:
+    """Collects timings of the hot paths while running."""
+
+    def __init__(self) -> None:
+        self._samples: defaultdict[str, list[float]] = defaultdict(list)
+        self._entity_totals: defaultdict[str, float] = defaultdict(float)
+        self._restore: list[Callable[[], None]] = []
+        self._request_time: dict[int, float] = {}
+        self.started: datetime | None = None
+        self.stopped: datetime | None = None
+
+    def _record(self, category: str, duration: float) -> None:
+        self._samples[category].append(duration)
+
+    def _replace_attribute(self, obj: Any, name: str, replacement: Any) -> None:
+        # On a class this gets the property object itself, on an instance the bound method
+        original = getattr(obj, name)
+        setattr(obj, name, replacement)
+        self._restore.append(lambda: setattr(obj, name, original))
+
+    def _wrap_coroutine_function(
+        self,
+        obj: Any,
+        name: str,
+        record: Callable[[float], None],
+    ) -> None:
+        func: Callable[..., Coroutine[Any, Any, Any]] = getattr(obj, name)
+
+        @functools.wraps(func)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(time.perf_counter() - start)
+
+        self._replace_attribute(obj, name, timed)
+
+    def _wrap_coordinator(self, coordinator: HueSyncBoxCoordinator) -> None:
+        self._wrap_coroutine_function(
+            coordinator,
+            "_async_update_data",
+            lambda duration: self._record(CATEGORY_COORDINATOR_UPDATE, duration),
+        )
+
+        async_update_listeners = coordinator.async_update_listeners
+
+        @functools.wraps(async_update_listeners)
+        def timed_update_listeners() -> None:
+            start = time.perf_counter()
+            try:
+                async_update_listeners()
+            finally:
+                self._record(CATEGORY_LISTENER_FANOUT, time.perf_counter() - start)
+
+        self._replace_attribute(
+            coordinator, "async_update_listeners", timed_update_listeners
+        )
+
+        # Parsing time is the time spent in update() besides the request itself
+        api = coordinator.api
+        key = id(api)
+
+        def record_request(duration: float) -> None:
+            self._record(CATEGORY_REQUEST, duration)
+            self._request_time[key] = self._request_time.get(key, 0.0) + duration
+
+        self._wrap_coroutine_function(api, "request", record_request)
+
+        update = api.update
+
+        @functools.wraps(update)
+        async def timed_update() -> None:
+            self._request_time[key] = 0.0
+            start = time.perf_counter()
+            try:
+                await update()
+            finally:
+                duration = time.perf_counter() - start
+                self._record(
+                    CATEGORY_RESPONSE_PARSING,
+                    max(0.0, duration - self._request_time.pop(key, 0.0)),
+                )
+
+        self._replace_attribute(api, "update", timed_update)
+
+    def _wrap_property(self, cls: type, name: str) -> None:
+        original: property = getattr(cls, name)
+        getter = original.fget
+        assert getter is not None  # noqa: S101
+        category = f"{cls.__name__}.{name}"
+
+        def timed_getter(entity: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return getter(entity)
+            finally:
+                duration = time.perf_counter() - start
+                self._record(category, duration)
+                self._entity_totals[f"{entity.entity_id} {name}"] += duration
+
+        self._replace_attribute(cls, name, property(timed_getter))
+
+    def start(self, coordinators: list[HueSyncBoxCoordinator]) -> None:
+        self.started = dt_util.utcnow()
+        for coordinator in coordinators:
+            self._wrap_coordinator(coordinator)
+        for cls, name in entity_properties():
+            self._wrap_property(cls, name)
+
+    def stop(self) -> None:
+        # Undo in reverse order so stacked replacements unwind correctly
+        while self._restore:
+            self._restore.pop()()
+        self.stopped = dt_util.utcnow()
+
+    def report(self) -> dict[str, Any]:
+        assert self.started is not None  # noqa: S101
+        assert self.stopped is not None  # noqa: S101
+        top_entities = sorted(
+            self._entity_totals.items(), key=lambda item: item[1], reverse=True
+        )[:TOP_ENTITIES]
+        return {
+            "started": self.started.isoformat(),
+            "duration_s": round((self.stopped - self.started).total_seconds(), 1),
+            "summary": {
+                category: summarize(durations)
+                for category, durations in sorted(self._samples.items())
+            },
+            "top_entities_ms": {
+                entity: round(total * 1000, 3) for entity, total in top_entities
+            },
+        }
+
+
+async def async_write_report(hass: HomeAssistant, report: dict[str, Any]) -> str:
+    """Write the report to the config directory and return the path."""
+    timestamp = dt_util.as_local(dt_util.utcnow()).strftime("%Y%m%d_%H%M%S")
+    path = Path(hass.config.path(f"{DOMAIN}_profile_{timestamp}.json"))
+    await hass.async_add_executor_job(
+        path.write_text, json.dumps(report, indent=2), "utf-8"
+    )
+    return str(path)
@@ -0,0 +1,156 @@
+"""Recording of the traffic between the integration and Philips Hue Play HDMI Sync Boxes.
+
+Recordings are redacted and written as gzipped NDJSON to the configuration
+directory, so they can be attached to issues and replayed in tests. The first
+line is a header, followed by one line per request. Responses of polls are only
+stored when they differ from the previous one.
+"""
+
+from datetime import datetime
+import gzip
+from pathlib import Path
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+import aiohuesyncbox
+
+from .const import DOMAIN, KEYS_TO_REDACT_API
+
+RECORDING_FORMAT_VERSION = 1
+RECORDING_FLUSH_DELAY = 10  # seconds
+
+# Credentials show up in registration and bridge requests, never record those
+KEYS_TO_REDACT_RECORDING = [
+    *KEYS_TO_REDACT_API,
+    "accessToken",
+    "username",
+    "clientKey",
+]
+
+DATA_RECORDING: HassKey["Recording"] = HassKey(f"{DOMAIN}_recording")
+
+
+class Recording:
+    """Collects the exchanges, writes are batched and done in the executor."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        self._hass = hass
+        self.path = path
+        self.exchanges = 0
+        self._start = time.monotonic()
+        self._last_responses: dict[tuple[str | None, str], Any] = {}
+        self._pending: list[bytes] = [
+            json_bytes(
+                {
+                    "version": RECORDING_FORMAT_VERSION,
+                    "start": dt_util.utcnow().isoformat(),
+                }
+            )
+        ]
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_record(  # noqa: PLR0913
+        self,
+        entry_id: str | None,
+        start: float,
+        method: str,
+        path: str,
+        data: dict | None,
+        response: Any,
+        error: BaseException | None,
+    ) -> None:
+        exchange: dict[str, Any] = {
+            "t": round(start - self._start, 3),
+            "entry_id": entry_id,
+            "method": method.lower(),
+            "path": path,
+        }
+        if data is not None:
+            exchange["data"] = async_redact_data(data, KEYS_TO_REDACT_RECORDING)
+        if error is not None:
+            exchange["error"] = type(error).__name__
+            exchange["message"] = str(error)
+        elif (
+            exchange["method"] != "get"
+            or self._last_responses.get((entry_id, path)) != response
+        ):
+            if exchange["method"] == "get":
+                self._last_responses[(entry_id, path)] = response
+            exchange["response"] = async_redact_data(response, KEYS_TO_REDACT_RECORDING)
+
+        self.exchanges += 1
+        self._pending.append(json_bytes(exchange))
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, RECORDING_FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def _async_scheduled_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        lines, self._pending = self._pending, []
+        if lines:
+            await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[bytes]) -> None:
+        # Each flush appends a gzip member, readers handle those transparently
+        with gzip.open(self.path, "ab") as file:
+            file.writelines(line + b"\n" for line in lines)
+
+
+def record_api(
+    hass: HomeAssistant, api: aiohuesyncbox.HueSyncBox, entry_id: str | None
+) -> None:
+    """Record the requests made through the api while a recording is running."""
+    request = api.request
+
+    async def recorded_request(
+        method: str, path: str, data: dict | None = None, auth: bool = True  # noqa: FBT001, FBT002
+    ) -> Any:
+        if (recording := hass.data.get(DATA_RECORDING)) is None:
+            return await request(method, path, data, auth)
+
+        start = time.monotonic()
+        try:
+            response = await request(method, path, data, auth)
+        except BaseException as err:
+            recording.async_record(entry_id, start, method, path, data, None, err)
+            raise
+        recording.async_record(entry_id, start, method, path, data, response, None)
+        return response
+
+    api.request = recorded_request  # type: ignore[method-assign]
+
+
+@callback
+def async_start_recording(hass: HomeAssistant) -> Recording:
+    """Start a recording, returns the running one when already recording."""
+    if (recording := hass.data.get(DATA_RECORDING)) is not None:
+        return recording
+
+    timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    path = Path(hass.config.path(f"{DOMAIN}_recording_{timestamp}.ndjson.gz"))
+    recording = hass.data[DATA_RECORDING] = Recording(hass, path)
+    return recording
+
+
+async def async_stop_recording(hass: HomeAssistant) -> Recording | None:
+    """Stop recording and write what is pending, returns the stopped recording."""
+    if (recording := hass.data.pop(DATA_RECORDING, None)) is None:
+        return None
+    await recording.async_flush()
+    return recording
+
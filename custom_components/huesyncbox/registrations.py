@@ -0,0 +1,134 @@
+"""Cleanup of registrations on removed Philips Hue Play HDMI Sync Boxes."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_HOST,
+    CONF_PATH,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+import aiohuesyncbox
+
+from .const import DOMAIN, LOGGER, REGISTRATION_ID
+from .tracing import trace_api
+
+STORAGE_KEY = f"{DOMAIN}.pending_unregistrations"
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+
+UNREGISTER_TIMEOUT = 10
+RETRY_INTERVAL = timedelta(minutes=30)
+
+DATA_UNREGISTER_QUEUE: HassKey["UnregisterQueue"] = HassKey(
+    f"{DOMAIN}_unregister_queue"
+)
+
+
+async def async_get_unregister_queue(hass: HomeAssistant) -> "UnregisterQueue":
+    if (queue := hass.data.get(DATA_UNREGISTER_QUEUE)) is None:
+        queue = hass.data[DATA_UNREGISTER_QUEUE] = UnregisterQueue(hass)
+        await queue.async_load()
+    return queue
+
+
+async def async_try_unregister(hass: HomeAssistant, data: dict[str, Any]) -> bool:
+    """Unregister from the box, returns False when it should be retried later."""
+    try:
+        async with asyncio.timeout(UNREGISTER_TIMEOUT):
+            async with aiohuesyncbox.HueSyncBox(
+                data[CONF_HOST],
+                data[CONF_UNIQUE_ID],
+                access_token=data.get(CONF_ACCESS_TOKEN),
+                port=data[CONF_PORT],
+                path=data[CONF_PATH],
+            ) as api:
+                trace_api(hass, api, None)
+                await api.unregister(data[REGISTRATION_ID])
+    except (aiohuesyncbox.RequestError, TimeoutError) as e:
+        LOGGER.info(
+            "Removing registration from Philips Hue Play HDMI Sync Box at %s failed, will retry later: %s",
+            data[CONF_HOST],
+            e,
+        )
+        return False
+    except Exception as e:  # noqa: BLE001
+        # Best effort cleanup. User might not even have the device anymore or had it factory reset.
+        LOGGER.info(
+            "Removing registration from Philips Hue Play HDMI Sync Box failed: %s ", e
+        )
+    return True
+
+
+class UnregisterQueue:
+    """Unregisters in the background and keeps track of boxes that were offline."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store = Store[list[dict[str, Any]]](hass, STORAGE_VERSION, STORAGE_KEY)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._unsub_retry: CALLBACK_TYPE | None = None
+
+    @property
+    def pending(self) -> list[dict[str, Any]]:
+        return list(self._pending.values())
+
+    async def async_load(self) -> None:
+        stored = {
+            data[REGISTRATION_ID]: data
+            for data in await self._store.async_load() or []
+        }
+        # Merge so nothing queued while loading gets lost
+        self._pending = stored | self._pending
+        self._async_update_retry_timer()
+
+    @callback
+    def async_unregister(self, data: dict[str, Any]) -> None:
+        """Unregister without waiting for the result."""
+        # Persist first so a shutdown during the attempt does not lose it
+        self._pending[data[REGISTRATION_ID]] = data
+        self._async_schedule_save()
+
+        self._hass.async_create_background_task(
+            self._async_unregister(data),
+            f"{DOMAIN} unregister {data[CONF_HOST]}",
+        )
+
+    @callback
+    def async_retry_pending(self, _now: datetime | None = None) -> None:
+        for data in self.pending:
+            self._hass.async_create_background_task(
+                self._async_unregister(data),
+                f"{DOMAIN} unregister retry {data[CONF_HOST]}",
+            )
+
+    async def _async_unregister(self, data: dict[str, Any]) -> None:
+        if await async_try_unregister(self._hass, data):
+            self._pending.pop(data[REGISTRATION_ID], None)
+            self._async_schedule_save()
+        self._async_update_retry_timer()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: self.pending, SAVE_DELAY)
+
+    @callback
+    def _async_update_retry_timer(self) -> None:
+        if self._pending and self._unsub_retry is None:
+            self._unsub_retry = async_track_time_interval(
+                self._hass,
+                self.async_retry_pending,
+                RETRY_INTERVAL,
+                cancel_on_shutdown=True,
+            )
+        elif not self._pending and self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
@@ -0,0 +1,179 @@
+"""Bounded history of the requests made to a Philips Hue Play HDMI Sync Box."""
+
+from array import array
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+import time
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+
+import aiohuesyncbox
+
+REQUEST_HISTORY_SIZE = 256
+
+OUTCOME_OK = 0
+OUTCOME_UNAUTHORIZED = 1
+OUTCOME_INVALID_STATE = 2
+OUTCOME_REQUEST_ERROR = 3
+OUTCOME_TIMEOUT = 4
+OUTCOME_CANCELLED = 5
+OUTCOME_ERROR = 6
+OUTCOMES = [
+    "ok",
+    "unauthorized",
+    "invalid_state",
+    "request_error",
+    "timeout",
+    "cancelled",
+    "error",
+]
+
+# Endpoints are stored as index in a table, there are only a handful
+MAX_ENDPOINTS = 255
+OTHER_ENDPOINT = "other"
+
+
+def outcome_for_exception(exception: BaseException) -> int:
+    if isinstance(exception, aiohuesyncbox.Unauthorized):
+        return OUTCOME_UNAUTHORIZED
+    if isinstance(exception, aiohuesyncbox.InvalidState):
+        return OUTCOME_INVALID_STATE
+    if isinstance(exception, aiohuesyncbox.RequestError):
+        return OUTCOME_REQUEST_ERROR
+    if isinstance(exception, TimeoutError):
+        return OUTCOME_TIMEOUT
+    if isinstance(exception, asyncio.CancelledError):
+        return OUTCOME_CANCELLED
+    return OUTCOME_ERROR
+
+
+class RequestHistory:
+    """Ring buffer of recent requests.
+
+    Stored column wise in typed arrays so a full history is only a few kilobytes
+    instead of hundreds of small objects.
+    """
+
+    def __init__(self, size: int = REQUEST_HISTORY_SIZE) -> None:
+        self._size = size
+        self._next = 0
+        self._count = 0
+
+        self._starts = array("d", bytes(8 * size))  # Unix timestamps
+        self._durations = array("f", bytes(4 * size))  # Seconds
+        self._sizes = array("L", bytes(array("L").itemsize * size))  # Bytes
+        self._endpoints = array("B", bytes(size))
+        self._outcomes = array("B", bytes(size))
+        self._changed = array("B", bytes(size))
+
+        self._endpoint_names: list[str] = []
+        self._endpoint_indexes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _endpoint_index(self, endpoint: str) -> int:
+        if (index := self._endpoint_indexes.get(endpoint)) is not None:
+            return index
+        if len(self._endpoint_names) >= MAX_ENDPOINTS:
+            endpoint = OTHER_ENDPOINT
+            if (index := self._endpoint_indexes.get(endpoint)) is not None:
+                return index
+        index = len(self._endpoint_names)
+        self._endpoint_names.append(endpoint)
+        self._endpoint_indexes[endpoint] = index
+        return index
+
+    def record(  # noqa: PLR0913
+        self,
+        endpoint: str,
+        start: float,
+        duration: float,
+        outcome: int,
+        size: int,
+        *,
+        changed: bool,
+    ) -> None:
+        i = self._next
+        self._starts[i] = start
+        self._durations[i] = duration
+        self._sizes[i] = size
+        self._endpoints[i] = self._endpoint_index(endpoint)
+        self._outcomes[i] = outcome
+        self._changed[i] = changed
+
+        self._next = (i + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Recorded requests, oldest first."""
+        first = (self._next - self._count) % self._size
+        return [
+            {
+                "endpoint": self._endpoint_names[self._endpoints[i]],
+                "start": datetime.fromtimestamp(self._starts[i], UTC).isoformat(),
+                "duration_ms": round(self._durations[i] * 1000, 1),
+                "outcome": OUTCOMES[self._outcomes[i]],
+                "bytes": self._sizes[i],
+                "changed": bool(self._changed[i]),
+            }
+            for i in ((first + n) % self._size for n in range(self._count))
+        ]
+
+
+def response_size(response: Any) -> int:
+    """Size of the response as JSON, the library does not expose the raw size."""
+    if not isinstance(response, (dict, list)):
+        return 0
+    return len(json_bytes(response))
+
+
+def instrument_api(
+    api: aiohuesyncbox.HueSyncBox,
+    history: RequestHistory,
+    on_request: Callable[[], None] | None = None,
+) -> None:
+    """Record all requests made through the api in the history.
+
+    The library passes `api.request` to all its endpoint objects, so replacing it
+    on the instance covers polling as well as commands.
+    """
+    request = api.request
+    last_responses: dict[str, Any] = {}
+
+    async def instrumented_request(
+        method: str, path: str, data: dict | None = None, auth: bool = True  # noqa: FBT001, FBT002
+    ) -> Any:
+        endpoint = f"{method.upper()} {path or '/'}"
+        start = time.time()
+        start_monotonic = time.monotonic()
+        outcome = OUTCOME_OK
+        response = None
+        try:
+            response = await request(method, path, data, auth)
+        except BaseException as err:
+            outcome = outcome_for_exception(err)
+            raise
+        finally:
+            if method.lower() == "get":
+                changed = outcome == OUTCOME_OK and last_responses.get(path) != response
+                if changed:
+                    last_responses[path] = response
+            else:
+                changed = outcome == OUTCOME_OK
+
+            history.record(
+                endpoint,
+                start,
+                time.monotonic() - start_monotonic,
+                outcome,
+                response_size(response),
+                changed=changed,
+            )
+            if on_request is not None:
+                on_request()
+        return response
+
+    api.request = instrumented_request  # type: ignore[method-assign]
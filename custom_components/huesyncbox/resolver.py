@@ -0,0 +1,99 @@
+"""Host name resolution for boxes configured by host name."""
+
+import asyncio
+from dataclasses import asdict, dataclass
+import socket
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.network import is_ip_address
+
+from .const import DOMAIN, LOGGER
+
+RESOLVE_TTL = 300  # seconds
+RESOLVE_TIMEOUT = 5  # seconds
+
+DATA_HOST_RESOLVER: HassKey["HostResolver"] = HassKey(f"{DOMAIN}_host_resolver")
+
+
+def async_get_host_resolver(hass: HomeAssistant) -> "HostResolver":
+    if (resolver := hass.data.get(DATA_HOST_RESOLVER)) is None:
+        resolver = hass.data[DATA_HOST_RESOLVER] = HostResolver()
+    return resolver
+
+
+def is_host_name(host: str) -> bool:
+    return not is_ip_address(host)
+
+
+async def async_lookup(host: str) -> str:
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return str(infos[0][4][0])
+
+
+@dataclass
+class ResolvedHost:
+    address: str | None = None
+    expires: float = 0.0
+    hits: int = 0
+    lookups: int = 0
+    failures: int = 0
+    last_lookup_duration: float | None = None
+    last_error: str | None = None
+
+
+class HostResolver:
+    """Resolves host names with a TTL cache so polls do not wait for (m)DNS."""
+
+    def __init__(self) -> None:
+        self._hosts: dict[str, ResolvedHost] = {}
+
+    async def async_resolve(self, host: str) -> str:
+        """Return the address for the host.
+
+        When resolving fails the previous address is used, or the host itself
+        when there is none so the HTTP layer can still give it a try.
+        """
+        if not is_host_name(host):
+            return host
+
+        resolved = self._hosts.setdefault(host, ResolvedHost())
+        if resolved.address is not None and resolved.expires > time.monotonic():
+            resolved.hits += 1
+            return resolved.address
+
+        start = time.monotonic()
+        resolved.lookups += 1
+        try:
+            async with asyncio.timeout(RESOLVE_TIMEOUT):
+                address = await async_lookup(host)
+        except (OSError, TimeoutError) as err:
+            resolved.failures += 1
+            resolved.last_error = str(err) or type(err).__name__
+            LOGGER.debug("Resolving %s failed: %s", host, resolved.last_error)
+            return resolved.address or host
+        finally:
+            resolved.last_lookup_duration = time.monotonic() - start
+
+        resolved.address = address
+        resolved.expires = time.monotonic() + RESOLVE_TTL
+        return address
+
+    @callback
+    def async_update(self, host: str, address: str) -> None:
+        """Refresh the cached address, e.g. from discovery information."""
+        if not is_host_name(host):
+            return
+        resolved = self._hosts.setdefault(host, ResolvedHost())
+        resolved.address = address
+        resolved.expires = time.monotonic() + RESOLVE_TTL
+
+    def as_dict(self, host: str) -> dict[str, Any] | None:
+        if (resolved := self._hosts.get(host)) is None:
+            return None
+        data = asdict(resolved)
+        data["expires_in"] = max(0.0, round(data.pop("expires") - time.monotonic(), 1))
+        return data
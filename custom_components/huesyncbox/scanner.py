@@ -0,0 +1,132 @@
+"""Active discovery of Philips Hue Play HDMI Sync Boxes on networks without mDNS."""
+
+import asyncio
+from dataclasses import dataclass
+from ipaddress import IPv4Network, IPv6Network, ip_network
+import time
+
+import aiohttp
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PATH,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DEFAULT_PORT, DOMAIN, LOGGER
+
+DEFAULT_PATH = "/api"
+
+SCAN_CONCURRENCY = 32
+SCAN_TIMEOUT = 2  # seconds, boxes on the local network respond way faster
+
+# Scanned addresses are not probed again within this time, found or not
+SCAN_CACHE_TTL = 3600  # seconds
+
+# Prevent accidentally scanning huge networks, a /22 is already plenty
+MAX_SCAN_ADDRESSES = 1024
+
+
+@dataclass(frozen=True)
+class ScannedBox:
+    host: str
+    unique_id: str
+    name: str
+    port: int = DEFAULT_PORT
+    path: str = DEFAULT_PATH
+
+
+@dataclass
+class CachedProbe:
+    expires: float
+    box: ScannedBox | None
+
+
+DATA_SCAN_CACHE: HassKey[dict[str, CachedProbe]] = HassKey(f"{DOMAIN}_scan_cache")
+
+
+def parse_networks(subnets: list[str]) -> list[IPv4Network | IPv6Network]:
+    """Parse CIDR notations, raises ValueError when invalid or too large."""
+    networks = [ip_network(subnet, strict=False) for subnet in subnets]
+    if sum(network.num_addresses for network in networks) > MAX_SCAN_ADDRESSES:
+        msg = f"Scanning is limited to {MAX_SCAN_ADDRESSES} addresses"
+        raise ValueError(msg)
+    return networks
+
+
+def hosts_in_networks(networks: list[IPv4Network | IPv6Network]) -> list[str]:
+    hosts = {str(host) for network in networks for host in network.hosts()}
+    return sorted(hosts)
+
+
+async def async_probe(session: aiohttp.ClientSession, host: str) -> ScannedBox | None:
+    """Check if there is a sync box on the host with the unauthenticated device endpoint."""
+    try:
+        async with session.get(
+            f"https://{host}:{DEFAULT_PORT}{DEFAULT_PATH}/v1/device",
+            ssl=False,  # Certificate is issued to the unique_id, which is unknown here
+            timeout=aiohttp.ClientTimeout(total=SCAN_TIMEOUT),
+        ) as response:
+            if response.status != 200:  # noqa: PLR2004
+                return None
+            device = await response.json(content_type=None)
+    except (aiohttp.ClientError, TimeoutError, ValueError):
+        return None
+
+    if (
+        not isinstance(device, dict)
+        or not str(device.get("deviceType", "")).startswith("HSB")
+        or not device.get("uniqueId")
+    ):
+        return None
+
+    return ScannedBox(host, device["uniqueId"], device.get("name", device["uniqueId"]))
+
+
+async def async_scan(hass: HomeAssistant, subnets: list[str]) -> list[ScannedBox]:
+    """Scan the subnets for boxes and start discovery flows for the found boxes."""
+    networks = parse_networks(subnets)
+    cache = hass.data.setdefault(DATA_SCAN_CACHE, {})
+    session = async_get_clientsession(hass, verify_ssl=False)
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+    async def async_probe_cached(host: str) -> ScannedBox | None:
+        if (cached := cache.get(host)) and cached.expires > time.monotonic():
+            return cached.box
+        async with semaphore:
+            box = await async_probe(session, host)
+        cache[host] = CachedProbe(time.monotonic() + SCAN_CACHE_TTL, box)
+        return box
+
+    hosts = hosts_in_networks(networks)
+    start = time.monotonic()
+    results = await asyncio.gather(*(async_probe_cached(host) for host in hosts))
+    boxes = [box for box in results if box is not None]
+    LOGGER.debug(
+        "Scanned %s addresses in %.1f seconds, found %s boxes",
+        len(hosts),
+        time.monotonic() - start,
+        len(boxes),
+    )
+
+    for box in boxes:
+        discovery_flow.async_create_flow(
+            hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={
+                CONF_HOST: box.host,
+                CONF_UNIQUE_ID: box.unique_id,
+                CONF_PORT: box.port,
+                CONF_PATH: box.path,
+                CONF_NAME: box.name,
+            },
+        )
+
+    return boxes
@@ -11,85 +11,42 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 import aiohuesyncbox
 
-from .const import DOMAIN, INTENSITIES, SYNC_MODES
+from .const import DOMAIN, INTENSITIES, LED_INDICATOR_MODES, SYNC_MODES
 from .coordinator import HueSyncBoxCoordinator
-from .helpers import get_hue_target_from_id, stop_sync_and_retry_on_invalid_state
-
-LED_INDICATOR_MODES = ["off", "normal", "dimmed"]
-INPUTS = ["input1", "input2", "input3", "input4"]
+from .helpers import (
+    get_hue_target_from_id,
+    get_sync_mode,
+    stop_sync_and_retry_on_invalid_state,
+)
+from .snapshot import Snapshot
 
 
 @dataclass(frozen=True, kw_only=True)
 class HueSyncBoxSelectEntityDescription(SelectEntityDescription):
-    options_fn: Callable[[aiohuesyncbox.HueSyncBox], list[str]] | None = None
-    current_option_fn: Callable[[aiohuesyncbox.HueSyncBox], str] = None  # type: ignore[assignment]
-    select_option_fn: Callable[[aiohuesyncbox.HueSyncBox, str], Coroutine] = None  # type: ignore[assignment]
-
-
-def get_sync_mode(api: aiohuesyncbox.HueSyncBox) -> str:
-    """Get mode."""
-    mode = api.execution.mode
-    if api.execution.mode not in SYNC_MODES:
-        mode = api.execution.last_sync_mode
-    return mode
-
-
-def available_inputs(api: aiohuesyncbox.HueSyncBox) -> list[str]:
-    inputs = []
-    for input_id in INPUTS:
-        input_ = getattr(api.hdmi, input_id)
-        inputs.append(input_.name)
-    return inputs
-
-
-def current_input(api: aiohuesyncbox.HueSyncBox) -> str:
-    for input_id in INPUTS:
-        if input_id == api.execution.hdmi_source:
-            return getattr(api.hdmi, input_id).name
-    return "no_input"
+    options_fn: Callable[[Snapshot], list[str]] | None = None
+    current_option_fn: Callable[[Snapshot], str | None] = None  # type: ignore[assignment]
+    select_option_fn: Callable[[aiohuesyncbox.HueSyncBox, Snapshot, str], Coroutine] = None  # type: ignore[assignment]
 
 
-async def select_input(api: aiohuesyncbox.HueSyncBox, input_name: str) -> None:
+async def select_input(
+    api: aiohuesyncbox.HueSyncBox, snapshot: Snapshot, input_name: str
+) -> None:
     # Inputname is the user given name, so needs to be mapped back to a valid API value."""
-    for input_id in INPUTS:
-        input_ = getattr(api.hdmi, input_id)
-        if input_name == input_.name:
-            await api.execution.set_state(hdmi_source=input_id)
-
-
-def available_entertainment_areas(api: aiohuesyncbox.HueSyncBox) -> list[str]:
-    return sorted(group.name for group in api.hue.groups)
-
-
-def current_entertainment_area(api: aiohuesyncbox.HueSyncBox) -> str:
-    hue_target = (
-        api.execution.hue_target
-    )  # this is a string like "groups/123" or a UUID
-    id_ = hue_target.replace("groups/", "")
-
-    selected_area = "no_area"
+    if (input_id := snapshot.inputs.id_for(input_name)) is not None:
+        await api.execution.set_state(hdmi_source=input_id)
 
-    for group in api.hue.groups:
-        if group.id == id_:
-            selected_area = group.name
-            break
 
-    return selected_area
-
-
-async def select_entertainment_area(api: aiohuesyncbox.HueSyncBox, name: str) -> None:
+async def select_entertainment_area(
+    api: aiohuesyncbox.HueSyncBox, snapshot: Snapshot, name: str
+) -> None:
     # Source is the user given name, so needs to be mapped back to a valid API value."""
-    group = next(filter(lambda g: g.name == name, api.hue.groups), None)
-    if group:
-        await api.execution.set_state(hue_target=get_hue_target_from_id(group.id))
+    if (area_id := snapshot.areas.id_for(name)) is not None:
+        await api.execution.set_state(hue_target=get_hue_target_from_id(area_id))
 
 
-def current_intensity(api: aiohuesyncbox.HueSyncBox) -> str:
-    sync_mode = get_sync_mode(api)
-    return getattr(api.execution, sync_mode).intensity
-
-
-async def select_intensity(api: aiohuesyncbox.HueSyncBox, intensity: str) -> None:
+async def select_intensity(
+    api: aiohuesyncbox.HueSyncBox, _snapshot: Snapshot, intensity: str
+) -> None:
     """Set intensity for sync mode."""
     sync_mode = get_sync_mode(api)
 
@@ -98,20 +55,16 @@ async def select_intensity(api: aiohuesyncbox.HueSyncBox, intensity: str) -> Non
     await api.execution.set_state(**state)  # type: ignore  # noqa: PGH003
 
 
-def current_sync_mode(api: aiohuesyncbox.HueSyncBox) -> str:
-    return get_sync_mode(api)
-
-
-async def select_sync_mode(api: aiohuesyncbox.HueSyncBox, sync_mode: str) -> None:
+async def select_sync_mode(
+    api: aiohuesyncbox.HueSyncBox, _snapshot: Snapshot, sync_mode: str
+) -> None:
     """Set sync mode."""
     await api.execution.set_state(mode=sync_mode)
 
 
-def current_led_indicator_mode(api: aiohuesyncbox.HueSyncBox) -> str:
-    return LED_INDICATOR_MODES[api.device.led_mode]
-
-
-async def select_led_indicator_mode(api: aiohuesyncbox.HueSyncBox, mode: str) -> None:
+async def select_led_indicator_mode(
+    api: aiohuesyncbox.HueSyncBox, _snapshot: Snapshot, mode: str
+) -> None:
     """Set led indicator mode."""
     await api.device.set_led_mode(LED_INDICATOR_MODES.index(mode))
 
@@ -119,33 +72,33 @@ async def select_led_indicator_mode(api: aiohuesyncbox.HueSyncBox, mode: str) ->
 ENTITY_DESCRIPTIONS = [
     HueSyncBoxSelectEntityDescription(
         key="hdmi_input",
-        options_fn=available_inputs,
-        current_option_fn=current_input,
+        options_fn=lambda snapshot: snapshot.inputs.options,
+        current_option_fn=lambda snapshot: snapshot.current_input,
         select_option_fn=select_input,
     ),
     HueSyncBoxSelectEntityDescription(
         key="entertainment_area",
-        options_fn=available_entertainment_areas,
-        current_option_fn=current_entertainment_area,
+        options_fn=lambda snapshot: snapshot.areas.options,
+        current_option_fn=lambda snapshot: snapshot.current_entertainment_area,
         select_option_fn=select_entertainment_area,
     ),
     HueSyncBoxSelectEntityDescription(
         key="intensity",
         options=INTENSITIES,
-        current_option_fn=current_intensity,
+        current_option_fn=lambda snapshot: snapshot.intensity,
         select_option_fn=select_intensity,
     ),
     HueSyncBoxSelectEntityDescription(
         key="sync_mode",
         options=SYNC_MODES,
-        current_option_fn=current_sync_mode,
+        current_option_fn=lambda snapshot: snapshot.sync_mode,
         select_option_fn=select_sync_mode,
     ),
     HueSyncBoxSelectEntityDescription(
         key="led_indicator_mode",
         entity_category=EntityCategory.CONFIG,
         options=sorted(LED_INDICATOR_MODES),
-        current_option_fn=current_led_indicator_mode,
+        current_option_fn=lambda snapshot: snapshot.led_indicator_mode,
         select_option_fn=select_led_indicator_mode,
     ),
 ]
@@ -192,17 +145,20 @@ class HueSyncBoxSelect(CoordinatorEntity[HueSyncBoxCoordinator], SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
-        return self.entity_description.current_option_fn(self.coordinator.api)
+        return self.entity_description.current_option_fn(self.coordinator.data)
 
     @property
     def options(self) -> list[str]:
         if self.entity_description.options_fn is not None:
-            return self.entity_description.options_fn(self.coordinator.api)
+            return self.entity_description.options_fn(self.coordinator.data)
         return super().options
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         await stop_sync_and_retry_on_invalid_state(
-            self.entity_description.select_option_fn, self.coordinator.api, option
+            self.entity_description.select_option_fn,
+            self.coordinator.api,
+            self.coordinator.data,
+            option,
         )
         await self.coordinator.async_request_refresh()
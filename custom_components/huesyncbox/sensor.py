@@ -6,23 +6,32 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-import aiohuesyncbox
-
 from . import HueSyncBoxCoordinator
 from .const import DOMAIN
+from .snapshot import Snapshot
 
 
 @dataclass(frozen=True, kw_only=True)
 class HueSyncBoxSensorEntityDescription(SensorEntityDescription):
-    get_value: Callable[[aiohuesyncbox.HueSyncBox], str] = None  # type: ignore[assignment]
+    get_value: Callable[[Snapshot], str | None] = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, kw_only=True)
+class HueSyncBoxPollStatisticsSensorEntityDescription(SensorEntityDescription):
+    get_value: Callable[[HueSyncBoxCoordinator], float | int | None] = None  # type: ignore[assignment]
+
+
+def seconds_to_ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
 
 
 WIFI_STRENGTH_STATES = {
@@ -49,53 +58,53 @@ ENTITY_DESCRIPTIONS = [
             "streaming",
             "busy",
         ],
-        get_value=lambda api: api.hue.connection_state,
+        get_value=lambda snapshot: snapshot.bridge_connection_state,
     ),
     HueSyncBoxSensorEntityDescription(
         key="bridge_unique_id",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        get_value=lambda api: api.hue.bridge_unique_id,
+        get_value=lambda snapshot: snapshot.bridge_unique_id,
     ),
     HueSyncBoxSensorEntityDescription(
         key="hdmi1_status",
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.ENUM,
         options=["unplugged", "plugged", "linked", "unknown"],
-        get_value=lambda api: api.hdmi.input1.status,
+        get_value=lambda snapshot: snapshot.input_statuses[0],
     ),
     HueSyncBoxSensorEntityDescription(
         key="hdmi2_status",
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.ENUM,
         options=["unplugged", "plugged", "linked", "unknown"],
-        get_value=lambda api: api.hdmi.input2.status,
+        get_value=lambda snapshot: snapshot.input_statuses[1],
     ),
     HueSyncBoxSensorEntityDescription(
         key="hdmi3_status",
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.ENUM,
         options=["unplugged", "plugged", "linked", "unknown"],
-        get_value=lambda api: api.hdmi.input3.status,
+        get_value=lambda snapshot: snapshot.input_statuses[2],
     ),
     HueSyncBoxSensorEntityDescription(
         key="hdmi4_status",
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.ENUM,
         options=["unplugged", "plugged", "linked", "unknown"],
-        get_value=lambda api: api.hdmi.input4.status,
+        get_value=lambda snapshot: snapshot.input_statuses[3],
     ),
     HueSyncBoxSensorEntityDescription(
         key="ip_address",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        get_value=lambda api: api.device.ip_address,
+        get_value=lambda snapshot: snapshot.ip_address,
     ),
     HueSyncBoxSensorEntityDescription(
         key="wifi_strength",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        get_value=lambda api: WIFI_STRENGTH_STATES[api.device.wifi.strength],  # type: ignore[union-attr]
+        get_value=lambda snapshot: WIFI_STRENGTH_STATES.get(snapshot.wifi_strength),  # type: ignore[arg-type]
         device_class=SensorDeviceClass.ENUM,
         options=["not_connected", "weak", "fair", "good", "excellent"],
     ),
@@ -103,7 +112,67 @@ ENTITY_DESCRIPTIONS = [
         key="content_info",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        get_value=lambda api: api.hdmi.content_specs,
+        get_value=lambda snapshot: snapshot.content_specs,
+    ),
+]
+
+POLL_STATISTICS_ENTITY_DESCRIPTIONS = [
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="last_poll_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        get_value=lambda coordinator: seconds_to_ms(
+            coordinator.poll_statistics.last_duration
+        ),
+    ),
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="poll_latency_p50",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        get_value=lambda coordinator: seconds_to_ms(
+            coordinator.poll_statistics.latency_percentile(50)
+        ),
+    ),
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="poll_latency_p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        get_value=lambda coordinator: seconds_to_ms(
+            coordinator.poll_statistics.latency_percentile(95)
+        ),
+    ),
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="poll_success_rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        get_value=lambda coordinator: coordinator.poll_statistics.success_rate,
+    ),
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="consecutive_errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        get_value=lambda coordinator: coordinator.consecutive_errors,
+    ),
+    HueSyncBoxPollStatisticsSensorEntityDescription(
+        key="requests_per_minute",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="requests/min",
+        get_value=lambda coordinator: coordinator.poll_statistics.requests_per_minute,
     ),
 ]
 
@@ -120,9 +189,14 @@ async def async_setup_entry(
     for entity_description in ENTITY_DESCRIPTIONS:
         # When not able to read value, entity is not supported
         with contextlib.suppress(Exception):
-            if entity_description.get_value(coordinator.api) is not None:
+            if entity_description.get_value(coordinator.data) is not None:
                 entities.append(HueSyncBoxSensor(coordinator, entity_description))
 
+    entities.extend(
+        HueSyncBoxPollStatisticsSensor(coordinator, entity_description)
+        for entity_description in POLL_STATISTICS_ENTITY_DESCRIPTIONS
+    )
+
     async_add_entities(entities)
 
 
@@ -151,4 +225,56 @@ class HueSyncBoxSensor(CoordinatorEntity[HueSyncBoxCoordinator], SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        return self.entity_description.get_value(self.coordinator.api)
+        return self.entity_description.get_value(self.coordinator.data)
+
+
+class HueSyncBoxPollStatisticsSensor(
+    CoordinatorEntity[HueSyncBoxCoordinator], SensorEntity
+):
+    """Statistics on polling the box, updated after each poll.
+
+    The statistics change on every poll, also when the snapshot did not,
+    so these follow the polls instead of the snapshot.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: HueSyncBoxCoordinator,
+        entity_description: HueSyncBoxPollStatisticsSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+
+        self.entity_description: HueSyncBoxPollStatisticsSensorEntityDescription = (
+            entity_description
+        )
+        self._attr_translation_key = self.entity_description.key
+
+        self._attr_unique_id = (
+            f"{self.entity_description.key}_{self.coordinator.api.device.unique_id}"
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.api.device.unique_id)}
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self.async_write_ha_state)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Already written by the poll listener
+        pass
+
+    @property
+    def available(self) -> bool:
+        # Statistics are most interesting when the box is not reachable
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        return self.entity_description.get_value(self.coordinator)
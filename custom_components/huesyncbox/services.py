@@ -1,11 +1,21 @@
 """The Philips Hue Play HDMI Sync Box integration services."""
 
+import asyncio
 from typing import Any
 
 from homeassistant.components.light import ATTR_BRIGHTNESS
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import (
+    ServiceValidationError,
+    Unauthorized,
+    UnknownUser,
+)
 from homeassistant.helpers import config_validation as cv, device_registry as dr
 import voluptuous as vol
 
@@ -16,26 +26,43 @@ from .const import (
     ATTR_BRIDGE_ID,
     ATTR_BRIDGE_USERNAME,
     ATTR_DEVICE_ID,
+    ATTR_DURATION,
     ATTR_ENTERTAINMENT_AREA,
     ATTR_INPUT,
     ATTR_INTENSITY,
     ATTR_MODE,
     ATTR_POWER,
+    ATTR_SAMPLE_RATE,
+    ATTR_SUBNETS,
     ATTR_SYNC,
+    ATTR_THRESHOLD,
+    ATTR_WRITE_FILE,
     DOMAIN,
     INPUTS,
     INTENSITIES,
     LOGGER,
+    SERVICE_PROFILE,
+    SERVICE_SCAN,
     SERVICE_SET_BRIDGE,
     SERVICE_SET_SYNC_STATE,
+    SERVICE_START_RECORDING,
+    SERVICE_START_TRACING,
+    SERVICE_START_WATCHDOG,
+    SERVICE_STOP_RECORDING,
+    SERVICE_STOP_TRACING,
+    SERVICE_STOP_WATCHDOG,
     SYNC_MODES,
 )
 from .helpers import (
     BrightnessRangeConverter,
-    get_group_from_area_name,
     get_hue_target_from_id,
     stop_sync_and_retry_on_invalid_state,
 )
+from .profiler import DATA_PROFILER, Profiler, async_write_report
+from .recording import async_start_recording, async_stop_recording
+from .scanner import async_scan, parse_networks
+from .tracing import async_start_tracing, async_stop_tracing
+from .watchdog import async_start_watchdog, async_stop_watchdog
 
 HUESYNCBOX_SET_BRIDGE_SCHEMA = vol.Schema(
     {
@@ -62,6 +89,47 @@ HUESYNCBOX_SET_SYNC_STATE_SCHEMA = vol.Schema(
 )
 
 
+def valid_subnets(value: Any) -> list[str]:
+    subnets = cv.ensure_list_csv(value)
+    try:
+        parse_networks(subnets)
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+    return subnets
+
+
+HUESYNCBOX_SCAN_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SUBNETS): valid_subnets,
+    }
+)
+
+HUESYNCBOX_START_TRACING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SAMPLE_RATE, default=0.1): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(ATTR_WRITE_FILE, default=False): cv.boolean,
+    }
+)
+
+HUESYNCBOX_START_WATCHDOG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_THRESHOLD, default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+
+HUESYNCBOX_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=300)
+        ),
+    }
+)
+
+
 def syncbox_config_entry_for_device_id(
     hass: HomeAssistant, device_id: str
 ) -> ConfigEntry:
@@ -82,6 +150,21 @@ def syncbox_config_entry_for_device_id(
     )
 
 
+async def async_verify_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise when the call was not made by an administrator."""
+    if not call.context.user_id:
+        return
+    user = await hass.auth.async_get_user(call.context.user_id)
+    if user is None:
+        raise UnknownUser(
+            context=call.context,
+            permission="admin",
+            user_id=call.context.user_id,
+        )
+    if not user.is_admin:
+        raise Unauthorized(context=call.context, permission="admin")
+
+
 async def async_register_set_bridge_service(hass: HomeAssistant) -> None:
     async def async_set_bridge(call: ServiceCall) -> None:
         """Set bridge for the syncbox, note that this change is not instant.
@@ -120,10 +203,10 @@ async def async_register_set_sync_state_service(hass: HomeAssistant) -> None:
         target_sync_state = call.data
 
         # Resolve entertainment area
-        group = get_group_from_area_name(
-            coordinator.api, target_sync_state.get(ATTR_ENTERTAINMENT_AREA, None)
+        area_id = coordinator.data.areas.id_for(
+            target_sync_state.get(ATTR_ENTERTAINMENT_AREA, None)
         )
-        hue_target = get_hue_target_from_id(group.id) if group else None
+        hue_target = get_hue_target_from_id(area_id) if area_id is not None else None
 
         state = {
             "hdmi_active": target_sync_state.get(ATTR_POWER, None),
@@ -163,7 +246,157 @@ async def async_register_set_sync_state_service(hass: HomeAssistant) -> None:
     )
 
 
+async def async_register_scan_service(hass: HomeAssistant) -> None:
+    async def async_scan_subnets(call: ServiceCall) -> ServiceResponse:
+        """Scan subnets for boxes, found boxes show up as discovered devices."""
+        boxes = await async_scan(hass, call.data[ATTR_SUBNETS])
+        return {
+            "boxes": [
+                {"host": box.host, "unique_id": box.unique_id, "name": box.name}
+                for box in boxes
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCAN,
+        async_scan_subnets,
+        schema=HUESYNCBOX_SCAN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_register_profile_service(hass: HomeAssistant) -> None:
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the hot paths for a while, the report is written to the config directory."""
+        await async_verify_admin(hass, call)
+
+        if DATA_PROFILER in hass.data:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profile_running",
+            )
+
+        profiler = hass.data[DATA_PROFILER] = Profiler()
+        try:
+            profiler.start(
+                [
+                    entry.runtime_data.coordinator
+                    for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+                ]
+            )
+            await asyncio.sleep(call.data[ATTR_DURATION])
+        finally:
+            profiler.stop()
+            hass.data.pop(DATA_PROFILER)
+
+        report = profiler.report()
+        path = await async_write_report(hass, report)
+        LOGGER.info("Profile report written to %s", path)
+        return {"report_path": path, **report}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=HUESYNCBOX_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_register_tracing_services(hass: HomeAssistant) -> None:
+    async def async_start(call: ServiceCall) -> None:
+        """Start tracing, calling it again while tracing changes the settings."""
+        await async_verify_admin(hass, call)
+        await async_start_tracing(
+            hass, call.data[ATTR_SAMPLE_RATE], to_file=call.data[ATTR_WRITE_FILE]
+        )
+
+    async def async_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop tracing and return the recorded spans."""
+        await async_verify_admin(hass, call)
+        if (tracer := await async_stop_tracing(hass)) is None:
+            return {"spans": [], "file": None}
+        return {
+            "spans": list(tracer.spans),
+            "file": str(tracer.trace_file.path) if tracer.trace_file else None,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_TRACING,
+        async_start,
+        schema=HUESYNCBOX_START_TRACING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_TRACING,
+        async_stop,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_register_watchdog_services(hass: HomeAssistant) -> None:
+    async def async_start(call: ServiceCall) -> None:
+        """Start the watchdog, calling it again while running changes the threshold."""
+        await async_verify_admin(hass, call)
+        async_start_watchdog(hass, call.data[ATTR_THRESHOLD] / 1000)
+
+    async def async_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop the watchdog and return what it found."""
+        await async_verify_admin(hass, call)
+        if (watchdog := async_stop_watchdog(hass)) is None:
+            return {}
+        return watchdog.report()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_WATCHDOG,
+        async_start,
+        schema=HUESYNCBOX_START_WATCHDOG_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_WATCHDOG,
+        async_stop,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_register_recording_services(hass: HomeAssistant) -> None:
+    async def async_start(call: ServiceCall) -> ServiceResponse:
+        """Start recording the traffic with the boxes to a file."""
+        await async_verify_admin(hass, call)
+        recording = async_start_recording(hass)
+        return {"file": str(recording.path)}
+
+    async def async_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop recording, returns the file and the number of recorded requests."""
+        await async_verify_admin(hass, call)
+        if (recording := await async_stop_recording(hass)) is None:
+            return {"file": None, "exchanges": 0}
+        return {"file": str(recording.path), "exchanges": recording.exchanges}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        async_start,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        async_stop,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
 async def async_register_services(hass: HomeAssistant) -> None:
     """Register services for the Hue Sync Box integration."""
     await async_register_set_bridge_service(hass)
     await async_register_set_sync_state_service(hass)
+    await async_register_scan_service(hass)
+    await async_register_profile_service(hass)
+    await async_register_tracing_services(hass)
+    await async_register_watchdog_services(hass)
+    await async_register_recording_services(hass)
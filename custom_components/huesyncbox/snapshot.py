@@ -0,0 +1,149 @@
+"""Immutable snapshot of the state of a Philips Hue Play HDMI Sync Box.
+
+The api objects are a tree that the library updates in place, the entities
+need values derived from several places in it. A snapshot is taken after each
+poll with those values computed once, so entities just read a field and
+comparing two snapshots tells if anything changed.
+"""
+
+from dataclasses import dataclass, field
+
+import aiohuesyncbox
+
+from .const import INPUTS, LED_INDICATOR_MODES
+from .helpers import BrightnessRangeConverter, get_sync_mode
+
+NO_INPUT = "no_input"
+NO_AREA = "no_area"
+
+
+def normalize_area_id(id_or_hue_target: str) -> str:
+    """Area id from a group id or hue target, these are like "groups/123" or a UUID."""
+    return id_or_hue_target.removeprefix("groups/")
+
+
+@dataclass(frozen=True, slots=True)
+class NameIndex:
+    """Ids and the names users gave them, looked up both ways.
+
+    Only the (id, name) pairs are compared, the rest is derived from them.
+    When names are used more than once the first id wins.
+    """
+
+    pairs: tuple[tuple[str, str], ...]
+    # Names in the order of the pairs, shared so do not modify
+    options: list[str] = field(init=False, compare=False, repr=False)
+    _ids: dict[str, str] = field(init=False, compare=False, repr=False)
+    _names: dict[str, str] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "options", [name for _, name in self.pairs])
+        object.__setattr__(
+            self, "_ids", {name: id_ for id_, name in reversed(self.pairs)}
+        )
+        object.__setattr__(self, "_names", dict(self.pairs))
+
+    def id_for(self, name: str | None) -> str | None:
+        return self._ids.get(name)  # type: ignore[arg-type]
+
+    def name_for(self, id_: str | None) -> str | None:
+        return self._names.get(id_)  # type: ignore[arg-type]
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    # Device
+    ip_address: str
+    wifi_strength: int | None
+    led_indicator_mode: str | None
+
+    # Execution
+    power: bool
+    light_sync: bool
+    sync_mode: str
+    intensity: str
+    brightness: float | None
+    current_input: str
+    current_entertainment_area: str
+
+    # Hdmi, statuses are in the order of INPUTS
+    inputs: NameIndex
+    input_statuses: tuple[str, ...]
+    content_specs: str
+
+    # Hue, areas are sorted by name
+    bridge_unique_id: str
+    bridge_connection_state: str
+    areas: NameIndex
+
+    # Behavior
+    force_dovi_native: int | None
+
+
+def _name_index(
+    pairs: tuple[tuple[str, str], ...], previous: NameIndex | None
+) -> NameIndex:
+    # Names rarely change, so keep the index of the previous snapshot if possible
+    if previous is not None and previous.pairs == pairs:
+        return previous
+    return NameIndex(pairs)
+
+
+def _led_indicator_mode(api: aiohuesyncbox.HueSyncBox) -> str | None:
+    if 0 <= api.device.led_mode < len(LED_INDICATOR_MODES):
+        return LED_INDICATOR_MODES[api.device.led_mode]
+    return None
+
+
+def create_snapshot(
+    api: aiohuesyncbox.HueSyncBox, previous: Snapshot | None = None
+) -> Snapshot:
+    mode = api.execution.mode
+    sync_mode = get_sync_mode(api)
+    inputs = [getattr(api.hdmi, input_id) for input_id in INPUTS]
+
+    input_index = _name_index(
+        tuple(
+            (input_id, input_.name)
+            for input_id, input_ in zip(INPUTS, inputs, strict=True)
+        ),
+        previous.inputs if previous is not None else None,
+    )
+    area_index = _name_index(
+        tuple(
+            sorted(
+                ((normalize_area_id(group.id), group.name) for group in api.hue.groups),
+                key=lambda pair: pair[1],
+            )
+        ),
+        previous.areas if previous is not None else None,
+    )
+
+    return Snapshot(
+        ip_address=api.device.ip_address,
+        wifi_strength=(
+            api.device.wifi.strength if api.device.wifi is not None else None
+        ),
+        led_indicator_mode=_led_indicator_mode(api),
+        power=mode != "powersave",
+        light_sync=mode not in ["powersave", "passthrough"],
+        sync_mode=sync_mode,
+        intensity=getattr(api.execution, sync_mode).intensity,
+        brightness=(
+            BrightnessRangeConverter.api_to_ha(api.execution.brightness)
+            if api.execution.brightness is not None
+            else None
+        ),
+        current_input=input_index.name_for(api.execution.hdmi_source) or NO_INPUT,
+        current_entertainment_area=area_index.name_for(
+            normalize_area_id(api.execution.hue_target)
+        )
+        or NO_AREA,
+        inputs=input_index,
+        input_statuses=tuple(input_.status for input_ in inputs),
+        content_specs=api.hdmi.content_specs,
+        bridge_unique_id=api.hue.bridge_unique_id,
+        bridge_connection_state=api.hue.connection_state,
+        areas=area_index,
+        force_dovi_native=api.behavior.force_dovi_native,
+    )
@@ -15,36 +15,37 @@ import aiohuesyncbox
 from .const import DOMAIN
 from .coordinator import HueSyncBoxCoordinator
 from .helpers import stop_sync_and_retry_on_invalid_state
+from .snapshot import Snapshot
 
 
 @dataclass(frozen=True, kw_only=True)
 class HueSyncBoxSwitchEntityDescription(SwitchEntityDescription):
-    is_on: Callable[[aiohuesyncbox.HueSyncBox], bool] = None  # type: ignore[assignment]
+    is_on: Callable[[Snapshot], bool] = None  # type: ignore[assignment]
     turn_on: Callable[[aiohuesyncbox.HueSyncBox], Coroutine] = None  # type: ignore[assignment]
     turn_off: Callable[[aiohuesyncbox.HueSyncBox], Coroutine] = None  # type: ignore[assignment]
-    is_supported: Callable[[aiohuesyncbox.HueSyncBox], bool] = lambda _: True
+    is_supported: Callable[[Snapshot], bool] = lambda _: True
 
 
 ENTITY_DESCRIPTIONS = [
     HueSyncBoxSwitchEntityDescription(
         key="power",
-        is_on=lambda api: api.execution.mode != "powersave",
+        is_on=lambda snapshot: snapshot.power,
         turn_on=lambda api: api.execution.set_state(mode="passthrough"),
         turn_off=lambda api: api.execution.set_state(mode="powersave"),
     ),
     HueSyncBoxSwitchEntityDescription(
         key="light_sync",
-        is_on=lambda api: api.execution.mode not in ["powersave", "passthrough"],
+        is_on=lambda snapshot: snapshot.light_sync,
         turn_on=lambda api: api.execution.set_state(sync_active=True),
         turn_off=lambda api: api.execution.set_state(sync_active=False),
     ),
     HueSyncBoxSwitchEntityDescription(
         key="dolby_vision_compatibility",
         entity_category=EntityCategory.CONFIG,
-        is_on=lambda api: api.behavior.force_dovi_native == 1,
+        is_on=lambda snapshot: snapshot.force_dovi_native == 1,
         turn_on=lambda api: api.behavior.set_force_dovi_native(1),
         turn_off=lambda api: api.behavior.set_force_dovi_native(0),
-        is_supported=lambda api: api.behavior.force_dovi_native is not None,
+        is_supported=lambda snapshot: snapshot.force_dovi_native is not None,
     ),
 ]
 
@@ -59,7 +60,7 @@ async def async_setup_entry(
     entities: list[SwitchEntity] = [
         HueSyncBoxSwitch(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
-        if entity_description.is_supported(coordinator.api)
+        if entity_description.is_supported(coordinator.data)
     ]
 
     async_add_entities(entities)
@@ -89,7 +90,7 @@ class HueSyncBoxSwitch(CoordinatorEntity[HueSyncBoxCoordinator], SwitchEntity):
     @property
     def is_on(self) -> bool | None:
         """Return True if entity is on."""
-        return self.entity_description.is_on(self.coordinator.api)
+        return self.entity_description.is_on(self.coordinator.data)
 
     async def async_turn_on(self, **_kwargs: Any) -> None:
         """Turn the entity on."""
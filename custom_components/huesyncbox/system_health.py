@@ -0,0 +1,61 @@
+"""Provide info to system health."""
+
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from . import HueSyncBoxConfigEntry
+from .const import DOMAIN
+from .poll_statistics import percentile
+
+
+@callback
+def async_register(
+    _hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+def format_ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page, only based on statistics kept anyway."""
+    entries: list[HueSyncBoxConfigEntry] = hass.config_entries.async_loaded_entries(
+        DOMAIN
+    )
+    coordinators = {entry.title: entry.runtime_data.coordinator for entry in entries}
+
+    durations = sorted(
+        duration
+        for coordinator in coordinators.values()
+        for duration in coordinator.poll_statistics.durations
+    )
+    requests_per_minute = sum(
+        coordinator.poll_statistics.requests_per_minute
+        for coordinator in coordinators.values()
+    )
+
+    slowest_box = "-"
+    p95_by_box = {
+        title: p95
+        for title, coordinator in coordinators.items()
+        if (p95 := coordinator.poll_statistics.latency_percentile(95)) is not None
+    }
+    if p95_by_box:
+        title = max(p95_by_box, key=lambda title: p95_by_box[title])
+        slowest_box = f"{title} ({format_ms(p95_by_box[title])})"
+
+    return {
+        "boxes": len(hass.config_entries.async_entries(DOMAIN)),
+        "online": sum(
+            coordinator.last_update_success and coordinator.consecutive_errors == 0
+            for coordinator in coordinators.values()
+        ),
+        "poll_latency_p95": format_ms(percentile(durations, 95) if durations else None),
+        "requests_per_second": round(requests_per_minute / 60, 2),
+        "slowest_box": slowest_box,
+    }
@@ -0,0 +1,317 @@
+"""Timing spans of the interactions with Philips Hue Play HDMI Sync Boxes.
+
+Spans are only recorded while tracing is started and then only for a sample of
+the interactions. The phases of the HTTP requests come from an aiohttp trace
+config on the session of the api. Note that aiohttp reports the TCP connect and
+the TLS handshake as one step, so the TLS time is part of the connect time.
+"""
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+import random
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+import aiohuesyncbox
+
+from .const import DOMAIN
+from .request_history import OUTCOMES, OUTCOME_OK, outcome_for_exception
+
+TRACE_BUFFER_SIZE = 1000
+TRACE_FILE_NAME = f"{DOMAIN}_traces.ndjson"
+TRACE_FILE_MAX_SIZE = 1024 * 1024  # bytes, one rotated file is kept
+TRACE_FILE_FLUSH_DELAY = 10  # seconds
+
+OPERATION_POLL = "poll"
+OPERATION_SET_STATE = "set_state"
+OPERATION_SET_BRIDGE = "set_bridge"
+OPERATION_REGISTER = "register"
+OPERATION_UNREGISTER = "unregister"
+OPERATION_OTHER = "other"
+
+DATA_TRACER: HassKey["Tracer"] = HassKey(f"{DOMAIN}_tracer")
+
+_current_span: ContextVar["Span | None"] = ContextVar(
+    f"{DOMAIN}_current_span", default=None
+)
+
+
+def operation_for_request(method: str, path: str) -> str:
+    method = method.lower()
+    if method == "get" and path == "":
+        return OPERATION_POLL
+    if method == "put" and path == "/execution":
+        return OPERATION_SET_STATE
+    if method == "put" and path == "/hue":
+        return OPERATION_SET_BRIDGE
+    if method == "post" and path == "/registrations":
+        return OPERATION_REGISTER
+    if method == "delete" and path.startswith("/registrations/"):
+        return OPERATION_UNREGISTER
+    return OPERATION_OTHER
+
+
+@dataclass(slots=True)
+class Span:
+    operation: str
+    entry_id: str | None
+    start: float = field(default_factory=time.time)  # Unix timestamp
+    duration: float = 0.0
+    queue_wait: float = 0.0
+    connect: float = 0.0
+    request: float = 0.0
+    requests: int = 0
+    outcome: int = OUTCOME_OK
+
+    def as_dict(self) -> dict[str, Any]:
+        parse = max(0.0, self.duration - self.queue_wait - self.connect - self.request)
+        return {
+            "operation": self.operation,
+            "entry_id": self.entry_id,
+            "start": datetime.fromtimestamp(self.start, UTC).isoformat(),
+            "duration_ms": round(self.duration * 1000, 1),
+            "queue_wait_ms": round(self.queue_wait * 1000, 1),
+            "connect_ms": round(self.connect * 1000, 1),
+            "request_ms": round(self.request * 1000, 1),
+            "parse_ms": round(parse * 1000, 1),
+            "requests": self.requests,
+            "outcome": OUTCOMES[self.outcome],
+        }
+
+
+class TraceFile:
+    """Appends spans as NDJSON, writes are batched and done in the executor."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        self._hass = hass
+        self.path = path
+        self._pending: list[str] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_append(self, span: dict[str, Any]) -> None:
+        self._pending.append(json.dumps(span))
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, TRACE_FILE_FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def _async_scheduled_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        lines, self._pending = self._pending, []
+        if lines:
+            await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        if self.path.exists() and self.path.stat().st_size >= TRACE_FILE_MAX_SIZE:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
+
+
+class Tracer:
+    """Keeps the recent spans in memory and optionally exports them to a file."""
+
+    def __init__(self, sample_rate: float, trace_file: TraceFile | None) -> None:
+        self.sample_rate = sample_rate
+        self.trace_file = trace_file
+        self.spans: deque[dict[str, Any]] = deque(maxlen=TRACE_BUFFER_SIZE)
+
+    def sampled(self) -> bool:
+        return random.random() < self.sample_rate  # noqa: S311
+
+    @callback
+    def async_export(self, span: Span) -> None:
+        data = span.as_dict()
+        self.spans.append(data)
+        if self.trace_file is not None:
+            self.trace_file.async_append(data)
+
+    @contextmanager
+    def span(self, operation: str, entry_id: str | None) -> Iterator[Span | None]:
+        """Record a span for the requests made in this context, when sampled."""
+        if not self.sampled():
+            yield None
+            return
+
+        span = Span(operation, entry_id)
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as err:
+            span.outcome = outcome_for_exception(err)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            _current_span.reset(token)
+            self.async_export(span)
+
+
+@contextmanager
+def trace_span(
+    hass: HomeAssistant, operation: str, entry_id: str | None
+) -> Iterator[Span | None]:
+    """Record a span when tracing, otherwise this does nothing."""
+    if (tracer := hass.data.get(DATA_TRACER)) is None:
+        yield None
+        return
+    with tracer.span(operation, entry_id) as span:
+        yield span
+
+
+async def _on_request_start(
+    _session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    _params: aiohttp.TraceRequestStartParams,
+) -> None:
+    context.span = _current_span.get()
+    context.start = time.perf_counter()
+    context.queue_wait = 0.0
+    context.connect = 0.0
+
+
+def _phase_recorder(
+    phase: str, *, end: bool
+) -> Callable[[aiohttp.ClientSession, SimpleNamespace, Any], Awaitable[None]]:
+    async def record(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if getattr(context, "span", None) is None:
+            return
+        if end:
+            started = getattr(context, f"{phase}_start")
+            setattr(
+                context,
+                phase,
+                getattr(context, phase) + time.perf_counter() - started,
+            )
+        else:
+            setattr(context, f"{phase}_start", time.perf_counter())
+
+    return record
+
+
+async def _on_request_end(
+    _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+) -> None:
+    span: Span | None = getattr(context, "span", None)
+    if span is None:
+        return
+    duration = time.perf_counter() - context.start
+    span.requests += 1
+    span.queue_wait += context.queue_wait
+    span.connect += context.connect
+    span.request += max(0.0, duration - context.queue_wait - context.connect)
+
+
+def _create_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_queued_start.append(
+        _phase_recorder("queue_wait", end=False)
+    )
+    trace_config.on_connection_queued_end.append(
+        _phase_recorder("queue_wait", end=True)
+    )
+    trace_config.on_connection_create_start.append(
+        _phase_recorder("connect", end=False)
+    )
+    trace_config.on_connection_create_end.append(_phase_recorder("connect", end=True))
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_end)
+    trace_config.freeze()
+    return trace_config
+
+
+TRACE_CONFIG = _create_trace_config()
+
+
+def _add_trace_config(session: aiohttp.ClientSession) -> None:
+    # The library creates the session itself, so add the trace config afterwards
+    trace_configs: list[aiohttp.TraceConfig] = session._trace_configs  # noqa: SLF001
+    if TRACE_CONFIG not in trace_configs:
+        trace_configs.append(TRACE_CONFIG)
+
+
+def trace_api(
+    hass: HomeAssistant, api: aiohuesyncbox.HueSyncBox, entry_id: str | None
+) -> None:
+    """Record spans for the requests made through the api while tracing.
+
+    Requests that are not part of a span yet get a span of their own, named after
+    the operation the request is for.
+    """
+    get_clientsession = api._get_clientsession  # noqa: SLF001
+
+    async def get_traced_clientsession() -> aiohttp.ClientSession:
+        session = await get_clientsession()
+        _add_trace_config(session)
+        return session
+
+    api._get_clientsession = get_traced_clientsession  # type: ignore[method-assign]  # noqa: SLF001
+    # Private to the library, so do not rely on it being there
+    if (session := getattr(api, "_clientsession", None)) is not None:
+        _add_trace_config(session)
+
+    request = api.request
+
+    async def traced_request(
+        method: str, path: str, data: dict | None = None, auth: bool = True  # noqa: FBT001, FBT002
+    ) -> Any:
+        if DATA_TRACER not in hass.data or _current_span.get() is not None:
+            return await request(method, path, data, auth)
+        with trace_span(hass, operation_for_request(method, path), entry_id):
+            return await request(method, path, data, auth)
+
+    api.request = traced_request  # type: ignore[method-assign]
+
+
+async def async_start_tracing(
+    hass: HomeAssistant, sample_rate: float, *, to_file: bool
+) -> Tracer:
+    """Start tracing, or change the settings when already tracing."""
+    trace_file = None
+    if (tracer := hass.data.get(DATA_TRACER)) is not None:
+        trace_file = tracer.trace_file
+        if trace_file is not None and not to_file:
+            await trace_file.async_flush()
+            trace_file = None
+
+    if to_file and trace_file is None:
+        trace_file = TraceFile(hass, Path(hass.config.path(TRACE_FILE_NAME)))
+
+    if tracer is None:
+        tracer = hass.data[DATA_TRACER] = Tracer(sample_rate, trace_file)
+    else:
+        tracer.sample_rate = sample_rate
+        tracer.trace_file = trace_file
+    return tracer
+
+
+async def async_stop_tracing(hass: HomeAssistant) -> Tracer | None:
+    """Stop tracing, returns the tracer with the recorded spans."""
+    if (tracer := hass.data.pop(DATA_TRACER, None)) is None:
+        return None
+    if tracer.trace_file is not None:
+        await tracer.trace_file.async_flush()
+    return tracer
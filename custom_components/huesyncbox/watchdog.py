@@ -0,0 +1,143 @@
+"""Watchdog for work of the integration that blocks the event loop.
+
+Only active when started, the coordinators then time each listener callback
+(which includes writing the entity state) and the event loop lag is measured.
+"""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+
+LAG_CHECK_INTERVAL = 0.5  # seconds
+
+DATA_WATCHDOG: HassKey["Watchdog"] = HassKey(f"{DOMAIN}_watchdog")
+
+
+def callback_name(update_callback: CALLBACK_TYPE) -> str:
+    """Entity id for entity callbacks, otherwise the name of the function."""
+    entity = getattr(update_callback, "__self__", None)
+    if entity_id := getattr(entity, "entity_id", None):
+        return str(entity_id)
+    return getattr(update_callback, "__qualname__", repr(update_callback))
+
+
+@dataclass(slots=True)
+class Occurrences:
+    count: int = 0
+    max_duration: float = 0.0
+
+    def record(self, duration: float) -> None:
+        self.count += 1
+        self.max_duration = max(self.max_duration, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"count": self.count, "max_ms": round(self.max_duration * 1000, 1)}
+
+
+class Watchdog:
+    """Flags callbacks that take longer than the threshold and measures loop lag."""
+
+    def __init__(self, hass: HomeAssistant, threshold: float) -> None:
+        self._hass = hass
+        self.threshold = threshold
+        self.slow_callbacks: defaultdict[str, Occurrences] = defaultdict(Occurrences)
+        self.loop_lag = Occurrences()
+        self._last_slow_callback: tuple[str, float] | None = None
+        self._expected = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._schedule_lag_check()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule_lag_check(self) -> None:
+        loop = self._hass.loop
+        self._expected = loop.time() + LAG_CHECK_INTERVAL
+        self._timer = loop.call_at(self._expected, self._check_lag)
+
+    def _check_lag(self) -> None:
+        now = self._hass.loop.time()
+        lag = now - self._expected
+        if lag > self.threshold:
+            self.loop_lag.record(lag)
+            # Only blame a callback that ran while the loop was lagging
+            if (
+                self._last_slow_callback is not None
+                and self._last_slow_callback[1] >= now - lag - LAG_CHECK_INTERVAL
+            ):
+                LOGGER.warning(
+                    "Event loop lagged %.0f ms, %s was slow in that period",
+                    lag * 1000,
+                    self._last_slow_callback[0],
+                )
+            else:
+                LOGGER.debug(
+                    "Event loop lagged %.0f ms, not caused by %s", lag * 1000, DOMAIN
+                )
+        self._schedule_lag_check()
+
+    @callback
+    def async_run_listeners(self, update_callbacks: Iterable[CALLBACK_TYPE]) -> None:
+        """Run coordinator listeners and time each of them."""
+        for update_callback in update_callbacks:
+            start = time.perf_counter()
+            update_callback()
+            if (duration := time.perf_counter() - start) > self.threshold:
+                self._record_slow_callback(callback_name(update_callback), duration)
+
+    def _record_slow_callback(self, name: str, duration: float) -> None:
+        self.slow_callbacks[name].record(duration)
+        self._last_slow_callback = (name, self._hass.loop.time())
+        LOGGER.warning(
+            "%s blocked the event loop for %.0f ms, %s times so far",
+            name,
+            duration * 1000,
+            self.slow_callbacks[name].count,
+        )
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "loop_lag": self.loop_lag.as_dict(),
+            "slow_callbacks": {
+                name: occurrences.as_dict()
+                for name, occurrences in sorted(
+                    self.slow_callbacks.items(),
+                    key=lambda item: item[1].count,
+                    reverse=True,
+                )
+            },
+        }
+
+
+@callback
+def async_start_watchdog(hass: HomeAssistant, threshold: float) -> Watchdog:
+    """Start the watchdog, or change the threshold when already running."""
+    if (watchdog := hass.data.get(DATA_WATCHDOG)) is not None:
+        watchdog.threshold = threshold
+        return watchdog
+
+    watchdog = hass.data[DATA_WATCHDOG] = Watchdog(hass, threshold)
+    watchdog.async_start()
+    return watchdog
+
+
+@callback
+def async_stop_watchdog(hass: HomeAssistant) -> Watchdog | None:
+    if (watchdog := hass.data.pop(DATA_WATCHDOG, None)) is not None:
+        watchdog.async_stop()
+    return watchdog
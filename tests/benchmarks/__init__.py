@@ -0,0 +1 @@
+"""Benchmarks for the Philips Hue Play HDMI Sync Box integration."""
@@ -0,0 +1,52 @@
+"""Common helpers for the benchmarks.
+
+Benchmarks are slow, so they only run when HUESYNCBOX_BENCHMARK=1 is set, e.g.
+
+    HUESYNCBOX_BENCHMARK=1 pytest tests/benchmarks --no-cov -s
+
+Results are written as JSON to HUESYNCBOX_BENCHMARK_OUTPUT (default
+`benchmark_results`) so they can be compared between versions.
+"""
+
+import json
+import os
+from pathlib import Path
+import platform
+import time
+from typing import Any
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+MANIFEST = ROOT_DIR / "custom_components" / "huesyncbox" / "manifest.json"
+
+BENCHMARKS_ENABLED = os.environ.get("HUESYNCBOX_BENCHMARK") == "1"
+
+benchmark = pytest.mark.skipif(
+    not BENCHMARKS_ENABLED, reason="Set HUESYNCBOX_BENCHMARK=1 to run benchmarks"
+)
+
+
+def output_dir() -> Path:
+    return Path(
+        os.environ.get("HUESYNCBOX_BENCHMARK_OUTPUT", ROOT_DIR / "benchmark_results")
+    )
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "version": json.loads(MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(name: str, results: dict[str, Any]) -> Path:
+    """Write results with some info on the environment, returns the path."""
+    path = output_dir() / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"environment": environment(), "results": results}, indent=2)
+    )
+    return path
@@ -0,0 +1,119 @@
+"""Fleet scale benchmark, one Home Assistant instance polling many simulated boxes.
+
+CPU time is that of the whole process, so it includes the simulator handling
+the requests. Memory only covers the setup of the config entries.
+"""
+
+import asyncio
+import contextlib
+import os
+import time
+import tracemalloc
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+import pytest
+
+from custom_components.huesyncbox.poll_statistics import percentile
+
+from ..conftest import setup_simulated_box
+from ..simulator import Simulator
+from .conftest import benchmark, write_results
+
+FLEET_SIZES = [10, 50, 200]
+WINDOW = float(os.environ.get("HUESYNCBOX_BENCHMARK_WINDOW", "30"))  # seconds
+LAG_SAMPLE_INTERVAL = 0.05  # seconds
+
+
+def percentiles_ms(values: list[float]) -> dict[str, float | None]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    values = sorted(values)
+    return {
+        "p50": round(percentile(values, 50) * 1000, 2),
+        "p95": round(percentile(values, 95) * 1000, 2),
+        "p99": round(percentile(values, 99) * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+async def sample_loop_lag(lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_SAMPLE_INTERVAL
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+@benchmark
+@pytest.mark.parametrize("boxes", FLEET_SIZES)
+async def test_fleet(hass: HomeAssistant, simulator: Simulator, boxes: int) -> None:
+    simulated_boxes = [
+        await simulator.async_add_box(f"{index:012X}", f"Box {index}")
+        for index in range(boxes)
+    ]
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    entries = [await setup_simulated_box(hass, box) for box in simulated_boxes]
+    memory = tracemalloc.get_traced_memory()[0] - memory_before
+    tracemalloc.stop()
+
+    assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+    coordinators = [entry.runtime_data.coordinator for entry in entries]
+
+    state_writes = 0
+
+    @callback
+    def count_state_write(_event: Event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    unsubs = [
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write),
+        hass.bus.async_listen(
+            EVENT_STATE_REPORTED, count_state_write, event_filter=lambda _data: True
+        ),
+    ]
+
+    polls_before = sum(c.poll_statistics.total_polls for c in coordinators)
+    failures_before = sum(c.poll_statistics.total_failures for c in coordinators)
+    lags: list[float] = []
+    lag_sampler = asyncio.create_task(sample_loop_lag(lags))
+    cpu_before = time.process_time()
+    start = time.monotonic()
+
+    await asyncio.sleep(WINDOW)
+
+    duration = time.monotonic() - start
+    cpu = time.process_time() - cpu_before
+    lag_sampler.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await lag_sampler
+    for unsub in unsubs:
+        unsub()
+
+    polls = sum(c.poll_statistics.total_polls for c in coordinators) - polls_before
+    failures = (
+        sum(c.poll_statistics.total_failures for c in coordinators) - failures_before
+    )
+    assert polls > 0
+
+    results = {
+        "boxes": boxes,
+        "window_s": round(duration, 1),
+        "polls": polls,
+        "failed_polls": failures,
+        "polls_per_second": round(polls / duration, 2),
+        "cpu_ms_per_poll": round(cpu * 1000 / polls, 3),
+        "cpu_utilization_percent": round(100 * cpu / duration, 1),
+        "loop_lag_ms": percentiles_ms(lags),
+        "memory_per_box_kb": round(memory / boxes / 1024, 1),
+        "state_writes_per_second": round(state_writes / duration, 1),
+        "poll_latency_ms": percentiles_ms(
+            [d for c in coordinators for d in c.poll_statistics.durations]
+        ),
+    }
+    path = write_results(f"fleet_{boxes}", results)
+    print(f"\n{path}: {results}")  # noqa: T201
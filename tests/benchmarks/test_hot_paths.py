@@ -0,0 +1,151 @@
+"""Microbenchmarks for the functions that run on every poll.
+
+Taking the snapshot runs once per poll, the entities read from the snapshot.
+
+Results are in operations per second. The first run stores them as baseline in
+the output directory, later runs fail when a hot path got slower than the
+baseline minus HUESYNCBOX_BENCHMARK_TOLERANCE (default 0.25). Baselines are
+machine specific, set HUESYNCBOX_BENCHMARK_UPDATE_BASELINE=1 to replace it.
+"""
+
+from collections.abc import Callable
+import json
+import os
+import timeit
+from typing import Any
+from unittest.mock import AsyncMock
+
+import aiohuesyncbox
+from custom_components.huesyncbox import number, select, sensor, switch
+from custom_components.huesyncbox.helpers import (
+    BrightnessRangeConverter,
+    get_sync_mode,
+)
+from custom_components.huesyncbox.snapshot import Snapshot, create_snapshot
+
+from ..simulator import default_state
+from .conftest import benchmark, output_dir, write_results
+
+TOLERANCE = float(os.environ.get("HUESYNCBOX_BENCHMARK_TOLERANCE", "0.25"))
+UPDATE_BASELINE = os.environ.get("HUESYNCBOX_BENCHMARK_UPDATE_BASELINE") == "1"
+REPEATS = 5
+
+ApiHotPath = Callable[[aiohuesyncbox.HueSyncBox], Any]
+EntityHotPath = Callable[[Snapshot], Any]
+
+
+def idle_state() -> dict[str, Any]:
+    return default_state("AABBCCDDEEFF", "Box")
+
+
+def syncing_state() -> dict[str, Any]:
+    state = default_state("AABBCCDDEEFF", "Box")
+    state["execution"].update(mode="video", syncActive=True, hueTarget="groups/2")
+    state["hue"]["groups"]["2"].update(active=True, owner="Box")
+    return state
+
+
+def many_areas_state() -> dict[str, Any]:
+    """Syncing to the last of many entertainment areas, the worst case for lookups."""
+    state = syncing_state()
+    state["hue"]["groups"] = {
+        str(index): {"name": f"Area {index:03}", "numLights": 4, "active": False}
+        for index in range(1, 201)
+    }
+    state["execution"]["hueTarget"] = "groups/200"
+    return state
+
+
+STATES = {
+    "idle": idle_state,
+    "syncing": syncing_state,
+    "many_areas": many_areas_state,
+}
+
+
+def api_hot_paths() -> dict[str, ApiHotPath]:
+    return {
+        "snapshot.create_snapshot": create_snapshot,
+        "helpers.get_sync_mode": get_sync_mode,
+        "helpers.brightness_api_to_ha": lambda api: BrightnessRangeConverter.api_to_ha(
+            api.execution.brightness
+        ),
+    }
+
+
+def entity_hot_paths() -> dict[str, EntityHotPath]:
+    """The hot paths, taken from the entity descriptions so new ones get included."""
+    paths: dict[str, EntityHotPath] = {
+        "snapshot.areas.id_for": lambda snapshot: snapshot.areas.id_for(
+            snapshot.areas.options[-1]
+        ),
+        "snapshot.inputs.id_for": lambda snapshot: snapshot.inputs.id_for(
+            snapshot.inputs.options[-1]
+        ),
+    }
+    for select_description in select.ENTITY_DESCRIPTIONS:
+        paths[f"select.{select_description.key}"] = (
+            select_description.current_option_fn
+        )
+        if select_description.options_fn is not None:
+            paths[f"select.{select_description.key}.options"] = (
+                select_description.options_fn
+            )
+    for sensor_description in sensor.ENTITY_DESCRIPTIONS:
+        paths[f"sensor.{sensor_description.key}"] = sensor_description.get_value
+    for switch_description in switch.ENTITY_DESCRIPTIONS:
+        paths[f"switch.{switch_description.key}"] = switch_description.is_on
+    for number_description in number.ENTITY_DESCRIPTIONS:
+        paths[f"number.{number_description.key}"] = number_description.get_value
+    return paths
+
+
+async def api_for_state(state: dict[str, Any]) -> aiohuesyncbox.HueSyncBox:
+    """Real api objects, filled like the library does it when polling."""
+    api = aiohuesyncbox.HueSyncBox("127.0.0.1", state["device"]["uniqueId"])
+    api.request = AsyncMock(return_value=state)  # type: ignore[method-assign]
+    await api.update()
+    return api
+
+
+def ops_per_second(hot_path: Callable[[Any], Any], argument: Any) -> float:
+    timer = timeit.Timer(lambda: hot_path(argument))
+    number_of_calls, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEATS, number=number_of_calls))
+    return number_of_calls / best
+
+
+@benchmark
+async def test_hot_paths() -> None:
+    results: dict[str, dict[str, float]] = {}
+    for state_name, state in STATES.items():
+        api = await api_for_state(state())
+        snapshot = create_snapshot(api)
+        results[state_name] = {
+            **{
+                name: round(ops_per_second(hot_path, api))
+                for name, hot_path in api_hot_paths().items()
+            },
+            **{
+                name: round(ops_per_second(hot_path, snapshot))
+                for name, hot_path in entity_hot_paths().items()
+            },
+        }
+
+    print(f"Results written to {write_results('hot_paths', results)}")  # noqa: T201
+
+    baseline_path = output_dir() / "hot_paths_baseline.json"
+    if UPDATE_BASELINE or not baseline_path.exists():
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Baseline written to {baseline_path}")  # noqa: T201
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    regressions = [
+        f"{state_name} {name}: {ops} ops/s, baseline {baseline_ops} ops/s"
+        for state_name, paths in results.items()
+        for name, ops in paths.items()
+        if (baseline_ops := baseline.get(state_name, {}).get(name)) is not None
+        and ops < baseline_ops * (1 - TOLERANCE)
+    ]
+    assert not regressions, "\n".join(regressions)
@@ -1,9 +1,12 @@
 """Common fixtures  for the Philips Hue Play HDMI Sync Box integration tests."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from dataclasses import dataclass
-from unittest.mock import Mock, patch
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.const import (
     CONF_ACCESS_TOKEN,
     CONF_HOST,
@@ -22,6 +25,9 @@ from pytest_homeassistant_custom_component.common import (  # type: ignore[impor
 import aiohuesyncbox
 from custom_components import huesyncbox
 
+from .simulator import API_PATH, SimulatedBox, Simulator
+from .virtual_clock import VirtualClock
+
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations) -> Generator[None]:  # noqa: ANN001, ARG001
@@ -29,6 +35,16 @@ def auto_enable_custom_integrations(enable_custom_integrations) -> Generator[Non
     yield  # noqa: PT022
 
 
+@pytest.fixture(autouse=True)
+def mock_host_lookup() -> Generator[AsyncMock]:
+    """Avoid real DNS lookups for the host names used in the tests."""
+    with patch(
+        "custom_components.huesyncbox.resolver.async_lookup",
+        return_value="192.0.2.1",
+    ) as mock_lookup:
+        yield mock_lookup
+
+
 # Copied from HA tests/components/conftest.py
 @pytest.fixture
 def entity_registry_enabled_by_default() -> Generator[None]:
@@ -151,3 +167,62 @@ async def force_coordinator_update(hass: HomeAssistant) -> None:
         hass, dt_util.utcnow() + huesyncbox.const.COORDINATOR_UPDATE_INTERVAL
     )
     await hass.async_block_till_done()
+
+
+@pytest.fixture
+async def simulator(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+    tmp_path: Path,
+) -> AsyncGenerator[Simulator]:
+    """Simulated boxes on localhost, the real library talks to them over HTTPS."""
+    simulator = await hass.async_add_executor_job(Simulator, tmp_path)
+
+    async def get_clientsession(
+        _api: aiohuesyncbox.HueSyncBox,
+    ) -> aiohttp.ClientSession:
+        return simulator.client_session()
+
+    with patch.object(
+        aiohuesyncbox.HueSyncBox, "_get_clientsession", get_clientsession
+    ):
+        yield simulator
+
+    await simulator.async_close()
+
+
+async def setup_simulated_box(
+    hass: HomeAssistant, box: SimulatedBox
+) -> MockConfigEntry:
+    """Set up a config entry for the box using its first registration."""
+    registration_id, registration = next(iter(box.registrations.items()))
+    entry = MockConfigEntry(
+        version=2,
+        minor_version=2,
+        domain=huesyncbox.DOMAIN,
+        unique_id=box.unique_id,
+        title=box.name,
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_UNIQUE_ID: box.unique_id,
+            CONF_PORT: box.port,
+            CONF_PATH: API_PATH,
+            CONF_ACCESS_TOKEN: registration["accessToken"],
+            huesyncbox.const.REGISTRATION_ID: registration_id,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture
+def virtual_clock(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> Generator[VirtualClock]:
+    """Let time only pass when advancing the clock."""
+    clock = VirtualClock(hass, freezer)
+    yield clock
+    clock.close()
@@ -0,0 +1,177 @@
+"""Fault injection in front of the simulator or a replay.
+
+Faults are picked per request, from a repeating pattern and/or at random with
+the configured rates. In front of the simulator they happen at the HTTP level
+so the library handles them like real ones, in front of a replay they are
+raised as the exceptions the library would raise.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+import aiohuesyncbox
+
+from .simulator import (
+    ERROR_INVALID_STATE,
+    ERROR_INVALID_TOKEN,
+    SimulatedBox,
+    api_error,
+)
+
+DROP = "drop"
+TIMEOUT = "timeout"
+SERVER_ERROR = "server_error"
+INVALID_STATE = "invalid_state"
+UNAUTHORIZED = "unauthorized"
+UNREACHABLE = "unreachable"
+
+# Requests that time out are held until the injector is cleared, or this long
+TIMEOUT_DELAY = 30  # seconds
+
+Latency = Callable[[random.Random], float]
+Request = Callable[..., Awaitable[Any]]
+
+
+def constant(seconds: float) -> Latency:
+    return lambda _random: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """Mostly close to the median with a long tail, like real networks."""
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+@dataclass
+class Faults:
+    latency: Latency | None = None
+    drop_rate: float = 0.0
+    timeout_rate: float = 0.0
+    server_error_rate: float = 0.0
+    invalid_state_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+    # Faults for consecutive requests, repeated, None lets a request through
+    pattern: list[str | None] = field(default_factory=list)
+    # Seconds reachable followed by seconds unreachable, repeated
+    flapping: tuple[float, float] | None = None
+
+
+class FaultInjector:
+    def __init__(
+        self,
+        faults: Faults | None = None,
+        *,
+        seed: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.faults = faults or Faults()
+        self.injected: Counter[str] = Counter()
+        self.requests = 0
+        self._random = random.Random(seed)  # noqa: S311
+        self._clock = clock
+        self._start = clock()
+        self._released = asyncio.Event()
+
+    def clear(self) -> None:
+        """Stop injecting faults and let requests that are held time out now."""
+        self.faults = Faults()
+        self._released.set()
+        self._released = asyncio.Event()
+
+    def is_reachable(self) -> bool:
+        if self.faults.flapping is None:
+            return True
+        reachable, unreachable = self.faults.flapping
+        return (self._clock() - self._start) % (reachable + unreachable) < reachable
+
+    def choose(self) -> str | None:
+        """Fault for the next request, if any."""
+        index = self.requests
+        self.requests += 1
+
+        fault = None
+        if not self.is_reachable():
+            fault = UNREACHABLE
+        elif self.faults.pattern:
+            fault = self.faults.pattern[index % len(self.faults.pattern)]
+        if fault is None:
+            for candidate, rate in (
+                (DROP, self.faults.drop_rate),
+                (TIMEOUT, self.faults.timeout_rate),
+                (SERVER_ERROR, self.faults.server_error_rate),
+                (INVALID_STATE, self.faults.invalid_state_rate),
+                (UNAUTHORIZED, self.faults.unauthorized_rate),
+            ):
+                if rate and self._random.random() < rate:
+                    fault = candidate
+                    break
+
+        if fault is not None:
+            self.injected[fault] += 1
+        return fault
+
+    async def _async_delay(self) -> None:
+        if self.faults.latency is not None:
+            await asyncio.sleep(self.faults.latency(self._random))
+
+    async def _async_hold(self) -> None:
+        try:
+            async with asyncio.timeout(TIMEOUT_DELAY):
+                await self._released.wait()
+        except TimeoutError:
+            pass
+
+    def install(self, box: SimulatedBox) -> "FaultInjector":
+        """Inject faults in the HTTP responses of a simulated box."""
+        box.before_request = self.async_before_request
+        return self
+
+    async def async_before_request(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        await self._async_delay()
+        fault = self.choose()
+        if fault in (DROP, UNREACHABLE):
+            # Close the connection without a response
+            assert request.transport is not None
+            request.transport.close()
+            return web.Response()
+        if fault == TIMEOUT:
+            await self._async_hold()
+        elif fault == SERVER_ERROR:
+            return web.Response(status=503, text="Service Unavailable")
+        elif fault == INVALID_STATE:
+            return api_error(400, ERROR_INVALID_STATE, "Invalid State")
+        elif fault == UNAUTHORIZED:
+            return api_error(401, ERROR_INVALID_TOKEN, "Invalid Token")
+        return None
+
+    def wrap(self, request: Request) -> Request:
+        """Inject faults in a request function, e.g. that of a replay."""
+
+        async def request_with_faults(
+            method: str, path: str, data: dict | None = None, auth: bool = True  # noqa: FBT001, FBT002
+        ) -> Any:
+            await self._async_delay()
+            fault = self.choose()
+            if fault in (DROP, UNREACHABLE, SERVER_ERROR):
+                raise aiohuesyncbox.RequestError(fault)
+            if fault == TIMEOUT:
+                await self._async_hold()
+            elif fault == INVALID_STATE:
+                raise aiohuesyncbox.InvalidState("16: Invalid State")
+            elif fault == UNAUTHORIZED:
+                raise aiohuesyncbox.Unauthorized("2: Invalid Token")
+            return await request(method, path, data, auth)
+
+        return request_with_faults
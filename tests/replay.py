@@ -0,0 +1,176 @@
+"""Replays recordings of the traffic with a box, made with the start_recording action.
+
+The replay replaces the requests of the library, so the coordinator and the
+platforms run on the recorded responses. Sequential replay answers each request
+with the next recorded exchange for that request, repeating the last one. Timed
+replay answers with what the box responded at that point of the recording, at
+the original speed or faster.
+"""
+
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import copy
+from dataclasses import dataclass
+import gzip
+import json
+from pathlib import Path
+import time
+from typing import Any
+from unittest.mock import patch
+
+import aiohuesyncbox
+from custom_components.huesyncbox.recording import RECORDING_FORMAT_VERSION
+
+REDACTED = "**REDACTED**"
+
+
+@dataclass(frozen=True, slots=True)
+class Exchange:
+    t: float  # Seconds since the start of the recording
+    method: str
+    path: str
+    response: Any = None
+    error: str | None = None
+    message: str = ""
+
+
+def load_recording(
+    path: Path, entry_id: str | None = None, unique_id: str | None = None
+) -> list[Exchange]:
+    """Load the exchanges of one entry, which is optional for single box recordings.
+
+    A redacted unique id of the box can be replaced so it matches the config entry.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header, *lines = [json.loads(line) for line in file]
+    assert header["version"] == RECORDING_FORMAT_VERSION
+
+    entry_ids = {line["entry_id"] for line in lines}
+    if entry_id is None:
+        assert len(entry_ids) <= 1, f"Pick one of the entries {entry_ids}"
+    else:
+        lines = [line for line in lines if line["entry_id"] == entry_id]
+
+    exchanges = []
+    last_responses: dict[str, Any] = {}
+    for line in lines:
+        response = line.get("response")
+        if line["method"] == "get" and "error" not in line:
+            # Unchanged responses are not stored again
+            if "response" in line:
+                last_responses[line["path"]] = response
+            response = last_responses.get(line["path"])
+        if unique_id is not None:
+            response = with_unique_id(response, unique_id)
+        exchanges.append(
+            Exchange(
+                line["t"],
+                line["method"],
+                line["path"],
+                response,
+                line.get("error"),
+                line.get("message", ""),
+            )
+        )
+    return exchanges
+
+
+def with_unique_id(response: Any, unique_id: str) -> Any:
+    if not isinstance(response, dict):
+        return response
+    device = response.get("device", response)
+    if device.get("uniqueId") != REDACTED:
+        return response
+    response = copy.deepcopy(response)
+    response.get("device", response)["uniqueId"] = unique_id
+    return response
+
+
+def exception_for(exchange: Exchange) -> BaseException:
+    # Timeouts cancel the request, so these show up as cancelled in recordings
+    if exchange.error in ("TimeoutError", "CancelledError"):
+        return TimeoutError()
+    error_type = getattr(aiohuesyncbox, exchange.error or "", None)
+    if isinstance(error_type, type) and issubclass(
+        error_type, aiohuesyncbox.AiohuesyncboxException
+    ):
+        return error_type(exchange.message)
+    return aiohuesyncbox.RequestError(exchange.message)
+
+
+class Replay:
+    """Answers requests from the recorded exchanges.
+
+    Without speed the replay is sequential, otherwise it is timed and a speed of 10
+    plays the recording 10 times faster than it was recorded.
+    """
+
+    def __init__(
+        self,
+        exchanges: list[Exchange],
+        *,
+        speed: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.speed = speed
+        self.requests = 0
+        self._clock = clock
+        self._start: float | None = None
+        self._offset = exchanges[0].t if exchanges else 0.0
+        self._exchanges: dict[tuple[str, str], list[Exchange]] = {}
+        for exchange in exchanges:
+            self._exchanges.setdefault((exchange.method, exchange.path), []).append(
+                exchange
+            )
+        self._positions: dict[tuple[str, str], int] = {}
+
+    def _recording_time(self) -> float:
+        assert self.speed is not None
+        now = self._clock()
+        if self._start is None:
+            self._start = now
+        return self._offset + (now - self._start) * self.speed
+
+    def exchange_for(self, method: str, path: str) -> Exchange | None:
+        key = (method.lower(), path)
+        if not (exchanges := self._exchanges.get(key)):
+            return None
+
+        if self.speed is None:
+            index = self._positions.get(key, 0)
+            self._positions[key] = index + 1
+            return exchanges[min(index, len(exchanges) - 1)]
+
+        # What the box answered at this point of the recording
+        times = [exchange.t for exchange in exchanges]
+        index = bisect_right(times, self._recording_time())
+        return exchanges[max(index - 1, 0)]
+
+    async def request(
+        self, method: str, path: str, data: dict | None = None, auth: bool = True  # noqa: ARG002, FBT001, FBT002
+    ) -> Any:
+        self.requests += 1
+        if (exchange := self.exchange_for(method, path)) is None:
+            assert method.lower() != "get", f"Nothing recorded for GET {path}"
+            # Accept commands that were not recorded, like the box does
+            return {}
+        if exchange.error is not None:
+            raise exception_for(exchange)
+        return copy.deepcopy(exchange.response)
+
+    @contextmanager
+    def patch(self) -> Iterator["Replay"]:
+        """Let all apis created in this context use the replay."""
+
+        async def request(
+            _api: aiohuesyncbox.HueSyncBox,
+            method: str,
+            path: str,
+            data: dict | None = None,
+            auth: bool = True,  # noqa: FBT001, FBT002
+        ) -> Any:
+            return await self.request(method, path, data, auth)
+
+        with patch.object(aiohuesyncbox.HueSyncBox, "request", request):
+            yield self
@@ -0,0 +1,430 @@
+"""Local simulator of Philips Hue Play HDMI Sync Boxes.
+
+Serves the parts of the sync box API used by the integration over HTTPS, so the
+real library and integration can be tested offline. Each box listens on its own
+port with a certificate for its unique id, signed by a CA of the simulator.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import copy
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import secrets
+import socket
+import ssl
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+API_PATH = "/api"
+
+# Error codes as used by the box, see aiohuesyncbox.errors
+ERROR_INVALID_TOKEN = 2
+ERROR_INVALID_KEY = 13
+ERROR_INVALID_VALUE = 14
+ERROR_INVALID_STATE = 16
+
+SYNC_MODES = ["video", "music", "game"]
+MODES = ["powersave", "passthrough", *SYNC_MODES]
+INTENSITIES = ["subtle", "moderate", "high", "intense"]
+INPUTS = ["input1", "input2", "input3", "input4"]
+
+CERTIFICATE_VALIDITY = timedelta(days=1)
+
+
+def create_certificate(
+    subject: str,
+    key: ec.EllipticCurvePrivateKey,
+    issuer: x509.Certificate | None = None,
+    issuer_key: ec.EllipticCurvePrivateKey | None = None,
+) -> x509.Certificate:
+    """Create a CA certificate, or a server certificate when an issuer is given."""
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)])
+    now = datetime.now(UTC)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(issuer.subject if issuer else name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + CERTIFICATE_VALIDITY)
+    )
+    if issuer is None:
+        builder = builder.add_extension(
+            x509.BasicConstraints(ca=True, path_length=None), critical=True
+        )
+    else:
+        builder = builder.add_extension(
+            x509.SubjectAlternativeName([x509.DNSName(subject)]), critical=False
+        )
+    return builder.sign(issuer_key or key, hashes.SHA256())
+
+
+def pem(certificate: x509.Certificate) -> str:
+    return certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def api_error(status: int, code: int, message: str) -> web.Response:
+    return web.json_response({"code": code, "message": message}, status=status)
+
+
+class InvalidRequestError(Exception):
+    """Request that the box would reject."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def default_state(unique_id: str, name: str) -> dict[str, Any]:
+    return {
+        "device": {
+            "name": name,
+            "deviceType": "HSB2",
+            "uniqueId": unique_id,
+            "ipAddress": "127.0.0.1",
+            "apiLevel": 7,
+            "firmwareVersion": "2.4.0",
+            "buildNumber": 1111111,
+            "ledMode": 1,
+            "wifiState": "wifi",
+            "wifi": {"ssid": "Simulated", "strength": 4},
+        },
+        "execution": {
+            "mode": "passthrough",
+            "syncActive": False,
+            "hdmiActive": True,
+            "hdmiSource": "input1",
+            "hueTarget": "groups/1",
+            "brightness": 100,
+            "lastSyncMode": "video",
+            "video": {"intensity": "high", "backgroundLighting": False},
+            "game": {"intensity": "high", "backgroundLighting": False},
+            "music": {"intensity": "high", "palette": "neutral"},
+        },
+        "hdmi": {
+            **{
+                input_id: {
+                    "name": f"HDMI {number}",
+                    "type": "generic",
+                    "status": "plugged" if number == 1 else "unplugged",
+                    "lastSyncMode": "video",
+                }
+                for number, input_id in enumerate(INPUTS, start=1)
+            },
+            "output": {
+                "name": "TV",
+                "type": "tv",
+                "status": "plugged",
+                "lastSyncMode": "video",
+            },
+            "contentSpecs": "1920 x 1080 @ 60 - SDR",
+            "videoSyncSupported": True,
+            "audioSyncSupported": True,
+        },
+        "hue": {
+            "bridgeUniqueId": "001788FFFE000000",
+            "bridgeIpAddress": "192.0.2.100",
+            "connectionState": "connected",
+            "groups": {
+                "1": {"name": "TV Area", "numLights": 3, "active": False},
+                "2": {"name": "Living Room", "numLights": 5, "active": False},
+            },
+        },
+        "behavior": {"forceDoviNative": 0},
+    }
+
+
+@dataclass
+class SimulatedBox:
+    """State of a simulated box, tests can change it directly."""
+
+    unique_id: str
+    name: str
+    state: dict[str, Any] = field(default_factory=dict)
+    registrations: dict[str, dict[str, str]] = field(default_factory=dict)
+    # Set to allow registering, like pressing the button on the box
+    button_pressed: bool = False
+    port: int = 0
+    requests: int = 0
+    # Called before handling each request, a response replaces the normal one
+    before_request: (
+        Callable[[web.Request], Awaitable[web.StreamResponse | None]] | None
+    ) = None
+
+    def __post_init__(self) -> None:
+        if not self.state:
+            self.state = default_state(self.unique_id, self.name)
+
+    def register(
+        self, app_name: str = "Home Assistant", instance_name: str = "Test"
+    ) -> tuple[str, str]:
+        """Register an application, returns registration id and access token."""
+        registration_id = str(max(map(int, self.registrations), default=0) + 1)
+        access_token = secrets.token_hex(16)
+        self.registrations[registration_id] = {
+            "appName": app_name,
+            "instanceName": instance_name,
+            "accessToken": access_token,
+        }
+        return registration_id, access_token
+
+    def is_authorized(self, request: web.Request) -> bool:
+        authorization = request.headers.get("Authorization", "")
+        token = authorization.removeprefix("Bearer ")
+        return any(
+            registration["accessToken"] == token
+            for registration in self.registrations.values()
+        )
+
+    @property
+    def execution(self) -> dict[str, Any]:
+        return self.state["execution"]
+
+    @property
+    def groups(self) -> dict[str, dict[str, Any]]:
+        return self.state["hue"]["groups"]
+
+    def set_execution(self, data: dict[str, Any]) -> None:  # noqa: C901, PLR0912
+        """Apply a change of the execution state like the box does."""
+        if not data:
+            raise InvalidRequestError(ERROR_INVALID_KEY, "Invalid Key")
+
+        execution = copy.deepcopy(self.execution)
+        for key, value in data.items():
+            if key == "mode":
+                if value not in MODES:
+                    raise InvalidRequestError(ERROR_INVALID_VALUE, "Invalid Value")
+                execution["mode"] = value
+            elif key == "syncActive":
+                if value:
+                    execution["mode"] = execution["lastSyncMode"]
+                elif execution["mode"] in SYNC_MODES:
+                    execution["mode"] = "passthrough"
+            elif key == "hdmiActive":
+                if value and execution["mode"] == "powersave":
+                    execution["mode"] = "passthrough"
+                elif not value:
+                    execution["mode"] = "powersave"
+            elif key == "hdmiSource":
+                if value not in INPUTS:
+                    raise InvalidRequestError(ERROR_INVALID_VALUE, "Invalid Value")
+                execution["hdmiSource"] = value
+            elif key == "brightness":
+                execution["brightness"] = max(0, min(200, int(value)))
+            elif key == "intensity":
+                if value not in INTENSITIES:
+                    raise InvalidRequestError(ERROR_INVALID_VALUE, "Invalid Value")
+                mode = (
+                    execution["mode"]
+                    if execution["mode"] in SYNC_MODES
+                    else execution["lastSyncMode"]
+                )
+                execution[mode]["intensity"] = value
+            elif key == "hueTarget":
+                if value.removeprefix("groups/") not in self.groups:
+                    raise InvalidRequestError(ERROR_INVALID_VALUE, "Invalid Value")
+                execution["hueTarget"] = value
+            else:
+                raise InvalidRequestError(ERROR_INVALID_KEY, "Invalid Key")
+
+        syncing = execution["mode"] in SYNC_MODES
+        group = self.groups[execution["hueTarget"].removeprefix("groups/")]
+        if syncing and group["active"] and group.get("owner") != self.name:
+            # Entertainment area is in use by another application
+            raise InvalidRequestError(ERROR_INVALID_STATE, "Invalid State")
+
+        execution["syncActive"] = syncing
+        execution["hdmiActive"] = execution["mode"] != "powersave"
+        if syncing:
+            execution["lastSyncMode"] = execution["mode"]
+
+        # Only the target group is used by the box
+        for group_id, group in self.groups.items():
+            if group.get("owner") == self.name:
+                group["active"] = False
+                del group["owner"]
+            if syncing and f"groups/{group_id}" == execution["hueTarget"]:
+                group["active"] = True
+                group["owner"] = self.name
+
+        self.state["execution"] = execution
+
+    def set_group_active(self, group_id: str, active: bool) -> None:  # noqa: FBT001
+        if (group := self.groups.get(group_id)) is None:
+            raise InvalidRequestError(ERROR_INVALID_VALUE, "Invalid Value")
+        if active:
+            group["active"] = True
+            return
+        if group.pop("owner", None) == self.name:
+            self.execution["mode"] = "passthrough"
+            self.execution["syncActive"] = False
+        group["active"] = False
+
+    def set_bridge(self, data: dict[str, Any]) -> None:
+        if set(data) != {"bridgeUniqueId", "username", "clientKey"}:
+            raise InvalidRequestError(ERROR_INVALID_KEY, "Invalid Key")
+        hue = self.state["hue"]
+        hue["bridgeUniqueId"] = data["bridgeUniqueId"]
+        hue["connectionState"] = "connected"
+
+
+class Simulator:
+    """HTTPS server for any amount of simulated boxes."""
+
+    def __init__(self, directory: Path) -> None:
+        """Set up the CA, does blocking I/O so create it in the executor."""
+        self._directory = directory
+        self._ca_key = ec.generate_private_key(ec.SECP256R1())
+        self._ca = create_certificate("Simulated Hue Sync Box CA", self._ca_key)
+        # One key for all boxes, creating keys is the expensive part
+        self._box_key = ec.generate_private_key(ec.SECP256R1())
+        self._key_file = directory / "box_key.pem"
+        self._key_file.write_bytes(
+            self._box_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        self.client_ssl_context = ssl.create_default_context(cadata=pem(self._ca))
+
+        self.boxes: dict[int, SimulatedBox] = {}
+        self._app = web.Application()
+        self._app.router.add_route("*", API_PATH + "/v1{path:.*}", self._handle)
+        self._runner = web.AppRunner(self._app, access_log=None)
+        self._started = False
+
+    def _create_server_ssl_context(self, unique_id: str) -> ssl.SSLContext:
+        certificate_file = self._directory / f"{unique_id}.pem"
+        certificate_file.write_text(
+            pem(create_certificate(unique_id, self._box_key, self._ca, self._ca_key))
+        )
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(certificate_file, self._key_file)
+        return ssl_context
+
+    async def async_add_box(
+        self, unique_id: str, name: str, *, registered: bool = True
+    ) -> SimulatedBox:
+        """Start serving a new box, by default with a registration for the integration."""
+        if not self._started:
+            await self._runner.setup()
+            self._started = True
+
+        ssl_context = await asyncio.get_running_loop().run_in_executor(
+            None, self._create_server_ssl_context, unique_id
+        )
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        box = SimulatedBox(unique_id, name, port=sock.getsockname()[1])
+        if registered:
+            box.register()
+
+        site = web.SockSite(self._runner, sock, ssl_context=ssl_context)
+        await site.start()
+        self.boxes[box.port] = box
+        return box
+
+    async def async_close(self) -> None:
+        await self._runner.cleanup()
+
+    def client_session(self) -> aiohttp.ClientSession:
+        """Session like the library creates, but trusting the simulator CA."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=self.client_ssl_context, limit_per_host=1
+            ),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        box = self.boxes[request.transport.get_extra_info("sockname")[1]]  # type: ignore[union-attr]
+        box.requests += 1
+        if (
+            box.before_request is not None
+            and (response := await box.before_request(request)) is not None
+        ):
+            return response
+
+        path = request.match_info["path"]
+        data = await request.json() if request.can_read_body else None
+
+        if request.method == "POST" and path == "/registrations":
+            return self._register(box, data or {})
+
+        if not box.is_authorized(request):
+            return api_error(401, ERROR_INVALID_TOKEN, "Invalid Token")
+
+        try:
+            return self._route(box, request.method, path, data)
+        except InvalidRequestError as err:
+            return api_error(400, err.code, err.message)
+
+    def _register(self, box: SimulatedBox, data: dict[str, Any]) -> web.Response:
+        if not box.button_pressed:
+            # Until the button on the box is pressed
+            return api_error(400, ERROR_INVALID_STATE, "Invalid State")
+        registration_id, access_token = box.register(
+            data.get("appName", ""), data.get("instanceName", "")
+        )
+        return web.json_response(
+            {"registrationId": registration_id, "accessToken": access_token}
+        )
+
+    def _route(  # noqa: PLR0911
+        self, box: SimulatedBox, method: str, path: str, data: Any
+    ) -> web.Response:
+        parts = [part for part in path.split("/") if part]
+
+        if method == "GET":
+            if not parts:
+                return web.json_response(box.state)
+            if parts == ["registrations"]:
+                return web.json_response(
+                    {
+                        registration_id: {
+                            key: value
+                            for key, value in registration.items()
+                            if key != "accessToken"
+                        }
+                        for registration_id, registration in box.registrations.items()
+                    }
+                )
+            if len(parts) == 1 and parts[0] in box.state:
+                return web.json_response(box.state[parts[0]])
+
+        if method == "PUT" and isinstance(data, dict):
+            if parts == ["execution"]:
+                box.set_execution(data)
+                return web.json_response({})
+            if parts == ["hue"]:
+                box.set_bridge(data)
+                return web.json_response({})
+            if len(parts) == 3 and parts[:2] == ["hue", "groups"]:  # noqa: PLR2004
+                box.set_group_active(parts[2], bool(data.get("active")))
+                return web.json_response({})
+            if parts == ["behavior"]:
+                box.state["behavior"].update(data)
+                return web.json_response({})
+            if parts == ["device"] and set(data) == {"ledMode"}:
+                box.state["device"]["ledMode"] = data["ledMode"]
+                return web.json_response({})
+
+        if method == "DELETE" and len(parts) == 2 and parts[0] == "registrations":  # noqa: PLR2004
+            if box.registrations.pop(parts[1], None) is None:
+                return api_error(404, ERROR_INVALID_VALUE, "Invalid Value")
+            return web.json_response({})
+
+        return api_error(404, ERROR_INVALID_KEY, "Invalid Key")
@@ -1,26 +1,47 @@
 """Test the Philips Hue Play HDMI Sync Box config flow."""
 
 import asyncio
+from datetime import timedelta
 from ipaddress import IPv4Address
+from typing import Any
 from unittest import mock
 from unittest.mock import Mock, patch
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType, UnknownFlow
+from homeassistant.util import dt as dt_util
+from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 import pytest
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
+    async_fire_time_changed,
+)
 
 import aiohuesyncbox
 from custom_components import huesyncbox
 
+from custom_components.huesyncbox.config_flow import LINK_POLL_INTERVAL_MIN
+from custom_components.huesyncbox.helpers import RELOAD_COOLDOWN
+from custom_components.huesyncbox.resolver import async_get_host_resolver
+
 from .conftest import setup_integration
 
 
-async def test_user_new_box(hass: HomeAssistant, mock_api: Mock) -> None:
+async def start_user_flow(hass: HomeAssistant, menu_option: str) -> dict[str, Any]:
     result = await hass.config_entries.flow.async_init(
         huesyncbox.DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["type"] == FlowResultType.MENU
+    assert result["step_id"] == "user"
+
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": menu_option}
+    )
+
+
+async def test_user_new_box(hass: HomeAssistant, mock_api: Mock) -> None:
+    result = await start_user_flow(hass, "configure")
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "configure"
 
@@ -67,6 +88,7 @@ async def test_user_new_box(hass: HomeAssistant, mock_api: Mock) -> None:
 
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["title"] == "Name"
+        assert result["description_placeholders"]["attempts"] == "2"
         assert result["data"] == {
             "host": "1.1.1.1",
             "unique_id": "test_unique_id",
@@ -122,9 +144,7 @@ async def test_reconfigure_host(hass: HomeAssistant, mock_api: Mock) -> None:
 async def test_connection_errors_during_connection_check(
     hass: HomeAssistant, side_effect: type[Exception], error_message: str
 ) -> None:
-    result = await hass.config_entries.flow.async_init(
-        huesyncbox.DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await start_user_flow(hass, "configure")
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "configure"
 
@@ -158,9 +178,7 @@ async def test_connection_errors_during_connection_check(
 async def test_user_box_connection_errors_during_link(
     hass: HomeAssistant, mock_api: Mock, side_effect: type[Exception]
 ) -> None:
-    result = await hass.config_entries.flow.async_init(
-        huesyncbox.DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await start_user_flow(hass, "configure")
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "configure"
 
@@ -187,9 +205,7 @@ async def test_user_box_connection_errors_during_link(
 async def test_user_box_abort_flow_during_link(
     hass: HomeAssistant, mock_api: Mock
 ) -> None:
-    result = await hass.config_entries.flow.async_init(
-        huesyncbox.DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await start_user_flow(hass, "configure")
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "configure"
 
@@ -215,6 +231,112 @@ async def test_user_box_abort_flow_during_link(
         with pytest.raises(UnknownFlow):
             hass.config_entries.flow.async_get(result["flow_id"])
 
+        # Link task got cancelled, otherwise this would keep waiting forever
+        await hass.async_block_till_done()
+        register_call_count = mock_api.register.call_count
+        await asyncio.sleep(LINK_POLL_INTERVAL_MIN)
+        assert mock_api.register.call_count == register_call_count
+
+
+async def test_user_box_link_timeout(hass: HomeAssistant, mock_api: Mock) -> None:
+    result = await start_user_flow(hass, "configure")
+
+    with (
+        patch("aiohuesyncbox.HueSyncBox.__aenter__", return_value=mock_api),
+        patch("custom_components.huesyncbox.config_flow.LINK_TIMEOUT", 0),
+    ):
+        mock_api.is_registered.return_value = False
+        mock_api.register.side_effect = aiohuesyncbox.InvalidState
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "host": "1.1.1.1",
+                "unique_id": "test-unique_id",
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert result["type"] == FlowResultType.SHOW_PROGRESS
+        result = await hass.config_entries.flow.async_configure(result["flow_id"])
+
+        assert result["type"] == FlowResultType.ABORT
+        assert result["reason"] == "link_timeout"
+        assert result["description_placeholders"] == {
+            "attempts": "1",
+            "duration": "0",
+        }
+
+
+async def test_bulk_add_boxes(hass: HomeAssistant, mock_api: Mock) -> None:
+    await setup_integration(hass, mock_api)
+
+    result = await start_user_flow(hass, "bulk")
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "bulk"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"hosts": "1.1.1.1"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"hosts": "invalid_host_list"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"hosts": ""}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "no_boxes"}
+
+    with (
+        patch("aiohuesyncbox.HueSyncBox") as huesyncbox_instance,
+        patch(
+            "custom_components.huesyncbox.async_setup_entry",
+            return_value=True,
+        ) as mock_setup_entry,
+    ):
+        huesyncbox_instance.return_value.__aenter__.return_value = mock_api
+        mock_api.is_registered.return_value = False
+        mock_api.register.return_value = {
+            "registration_id": "registrationId",
+            "access_token": "accessToken",
+        }
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "hosts": "1.1.1.1,unique_id_1\n\n1.1.1.2, unique_id_2\nhost_value,123456ABCDEF"
+            },
+        )
+        assert result["type"] == FlowResultType.SHOW_PROGRESS
+        assert result["step_id"] == "bulk_link"
+        assert result["progress_action"] == "wait_for_buttons"
+        assert result["description_placeholders"] == {"count": "3"}
+        await hass.async_block_till_done()
+
+        result = await hass.config_entries.flow.async_configure(result["flow_id"])
+        await hass.async_block_till_done()
+
+        assert result["type"] == FlowResultType.ABORT
+        assert result["reason"] == "bulk_finished"
+        assert result["description_placeholders"]["linked"] == "2"
+        assert result["description_placeholders"]["total"] == "3"
+        assert len(mock_setup_entry.mock_calls) == 2
+
+    entries = {
+        entry.unique_id: entry
+        for entry in hass.config_entries.async_entries(huesyncbox.DOMAIN)
+    }
+    assert len(entries) == 3
+    assert entries["unique_id_2"].title == "Name"
+    assert entries["unique_id_2"].data == {
+        "host": "1.1.1.2",
+        "unique_id": "unique_id_2",
+        "access_token": "accessToken",
+        "registration_id": "registrationId",
+        "port": 443,
+        "path": "/api",
+    }
+
 
 async def test_zeroconf_new_box(hass: HomeAssistant, mock_api: Mock) -> None:
     # Triggered by discovery
@@ -294,6 +416,9 @@ async def test_zeroconf_new_box(hass: HomeAssistant, mock_api: Mock) -> None:
 
 async def test_zeroconf_already_configured(hass: HomeAssistant, mock_api: Mock) -> None:
     integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.1.1.1"}
+    )
 
     # Make sure there is different data before
     assert integration.entry.data["host"] != "1.2.3.4"
@@ -334,6 +459,219 @@ async def test_zeroconf_already_configured(hass: HomeAssistant, mock_api: Mock)
     assert integration.entry.data["path"] == "/different"
 
 
+async def test_zeroconf_configured_by_host_name(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    assert integration.entry.data["host"] == "host_value"
+
+    result = await hass.config_entries.flow.async_init(
+        huesyncbox.DOMAIN,
+        context={"source": config_entries.SOURCE_ZEROCONF},
+        data=ZeroconfServiceInfo(
+            ip_address=IPv4Address("1.2.3.4"),
+            ip_addresses=[IPv4Address("1.2.3.4")],
+            port=1234,
+            hostname="unique_id.local",
+            type="_huesync._tcp.local.",
+            name="HueSyncBox-UniqueId._huesync._tcp.local.",
+            properties={
+                "path": "/path_value",
+                "uniqueid": "123456ABCDEF",
+                "devicetype": "HSB001",
+                "name": "Hue Syncbox Name",
+            },
+        ),
+    )
+
+    assert result["type"] == "abort"
+    assert result["reason"] == "already_configured"
+
+    # Host name is kept, only the resolved address is refreshed
+    assert integration.entry.data["host"] == "host_value"
+    resolution = async_get_host_resolver(hass).as_dict("host_value")
+    assert resolution is not None
+    assert resolution["address"] == "1.2.3.4"
+
+
+def zeroconf_service_info(host: str, port: int, path: str) -> ZeroconfServiceInfo:
+    return ZeroconfServiceInfo(
+        ip_address=IPv4Address(host),
+        ip_addresses=[IPv4Address(host)],
+        port=port,
+        hostname="unique_id.local",
+        type="_huesync._tcp.local.",
+        name="HueSyncBox-UniqueId._huesync._tcp.local.",
+        properties={
+            "path": path,
+            "uniqueid": "123456ABCDEF",
+            "devicetype": "HSB001",
+            "name": "Hue Syncbox Name",
+        },
+    )
+
+
+async def test_zeroconf_repeated_announcements_are_ignored(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.1.1.1"}
+    )
+    integration.entry.runtime_data.coordinator.address = "1.1.1.1"
+
+    with (
+        patch("aiohuesyncbox.HueSyncBox", return_value=mock_api) as huesyncbox_cls,
+        patch.object(hass.config_entries, "async_schedule_reload") as mock_reload,
+        patch.object(hass.config_entries, "async_update_entry") as mock_update_entry,
+    ):
+        for _ in range(10):
+            result = await hass.config_entries.flow.async_init(
+                huesyncbox.DOMAIN,
+                context={"source": config_entries.SOURCE_ZEROCONF},
+                data=zeroconf_service_info("1.1.1.1", 1234, "/path_value"),
+            )
+            assert result["type"] == FlowResultType.ABORT
+            assert result["reason"] == "already_configured"
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert huesyncbox_cls.call_count == 0
+        assert mock_update_entry.call_count == 0
+        assert mock_reload.call_count == 0
+
+
+async def test_zeroconf_host_change_does_not_reload(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.1.1.1"}
+    )
+
+    with (
+        patch("aiohuesyncbox.HueSyncBox", return_value=mock_api),
+        patch.object(hass.config_entries, "async_schedule_reload") as mock_reload,
+    ):
+        for _ in range(10):
+            await hass.config_entries.flow.async_init(
+                huesyncbox.DOMAIN,
+                context={"source": config_entries.SOURCE_ZEROCONF},
+                data=zeroconf_service_info("1.2.3.4", 1234, "/path_value"),
+            )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert integration.entry.data["host"] == "1.2.3.4"
+        assert integration.entry.runtime_data.coordinator.address == "1.2.3.4"
+        assert mock_reload.call_count == 0
+
+
+async def test_zeroconf_reloads_are_rate_limited(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        for port in (1, 2, 3):
+            await hass.config_entries.flow.async_init(
+                huesyncbox.DOMAIN,
+                context={"source": config_entries.SOURCE_ZEROCONF},
+                data=zeroconf_service_info("1.2.3.4", port, "/path_value"),
+            )
+        await hass.async_block_till_done()
+
+        # First change reloads immediately, the others are combined
+        assert mock_reload.call_count == 1
+        assert integration.entry.data["port"] == 3
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=RELOAD_COOLDOWN + 1)
+        )
+        await hass.async_block_till_done()
+        assert mock_reload.call_count == 2
+
+
+async def test_integration_discovery_already_configured(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.1.1.1"}
+    )
+
+    # Found by scanning subnets
+    result = await hass.config_entries.flow.async_init(
+        huesyncbox.DOMAIN,
+        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+        data={
+            "host": "1.2.3.4",
+            "unique_id": "123456ABCDEF",
+            "port": 443,
+            "path": "/api",
+            "name": "Hue Syncbox Name",
+        },
+    )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert integration.entry.data["host"] == "1.2.3.4"
+
+
+async def test_dhcp_new_address_switches_host_without_reload(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.2.3.4"}
+    )
+
+    with (
+        patch("aiohuesyncbox.HueSyncBox", return_value=mock_api) as huesyncbox_cls,
+        patch.object(hass.config_entries, "async_schedule_reload") as mock_reload,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            huesyncbox.DOMAIN,
+            context={"source": config_entries.SOURCE_DHCP},
+            data=DhcpServiceInfo(
+                ip="1.2.3.5", hostname="hsb", macaddress="123456abcdef"
+            ),
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert result["type"] == FlowResultType.ABORT
+        assert result["reason"] == "already_configured"
+
+        assert integration.entry.data["host"] == "1.2.3.5"
+        assert huesyncbox_cls.call_args.args == ("1.2.3.5", "123456ABCDEF")
+        assert integration.entry.state is config_entries.ConfigEntryState.LOADED
+        assert mock_reload.call_count == 0
+
+
+async def test_dhcp_new_address_unreachable_reloads(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    hass.config_entries.async_update_entry(
+        integration.entry, data={**integration.entry.data, "host": "1.2.3.4"}
+    )
+
+    mock_api.update.side_effect = aiohuesyncbox.RequestError
+    with (
+        patch("aiohuesyncbox.HueSyncBox", return_value=mock_api),
+        patch.object(hass.config_entries, "async_schedule_reload") as mock_reload,
+    ):
+        await hass.config_entries.flow.async_init(
+            huesyncbox.DOMAIN,
+            context={"source": config_entries.SOURCE_DHCP},
+            data=DhcpServiceInfo(
+                ip="1.2.3.5", hostname="hsb", macaddress="123456abcdef"
+            ),
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert integration.entry.data["host"] == "1.2.3.5"
+        mock_reload.assert_called_once_with(integration.entry.entry_id)
+
+
 async def test_reauth_flow(hass: HomeAssistant, mock_api: Mock) -> None:
     integration = await setup_integration(hass, mock_api)
 
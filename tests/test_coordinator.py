@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from homeassistant.config_entries import SOURCE_REAUTH
 from homeassistant.core import HomeAssistant
@@ -8,6 +8,7 @@ import pytest
 
 import aiohuesyncbox
 from custom_components import huesyncbox
+from custom_components.huesyncbox.resolver import async_get_host_resolver
 
 from .conftest import force_coordinator_update, setup_integration
 
@@ -98,3 +99,19 @@ async def test_continued_communication_errors_mark_entities_unavailable(
     await force_coordinator_update(hass)
     entity = hass.states.get(entity_under_test)
     assert entity.state == "unavailable"
+
+
+async def test_follow_resolved_address_change(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+    coordinator = integration.entry.runtime_data.coordinator
+    assert coordinator.address == "192.0.2.1"
+
+    async_get_host_resolver(hass).async_update("host_value", "192.0.2.2")
+
+    with patch("aiohuesyncbox.HueSyncBox", return_value=mock_api) as huesyncbox_cls:
+        await force_coordinator_update(hass)
+
+    assert huesyncbox_cls.call_args.args == ("192.0.2.2", "123456ABCDEF")
+    assert coordinator.address == "192.0.2.2"
@@ -54,3 +54,27 @@ async def test_diagnostics_not_setup(hass: HomeAssistant, mock_api: Mock) -> Non
     assert diagnostics["config_entry_data"]["access_token"] == REDACTED
 
     assert "api" not in diagnostics
+
+
+async def test_diagnostics_request_history(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    mock_api.request.return_value = {"device": {"uniqueId": "abc"}}
+    integration = await setup_integration(hass, mock_api)
+
+    # Requests made through the api end up in the history
+    await integration.mock_api.request("get", "")
+    await integration.mock_api.request("get", "")
+    await integration.mock_api.request("put", "/execution", {"mode": "video"})
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, integration.entry)
+
+    history = diagnostics["request_history"]
+    assert [entry["endpoint"] for entry in history] == [
+        "GET /",
+        "GET /",
+        "PUT /execution",
+    ]
+    assert [entry["changed"] for entry in history] == [True, False, True]
+    assert all(entry["outcome"] == "ok" for entry in history)
+    assert history[0]["bytes"] > 0
@@ -5,10 +5,7 @@ from homeassistant.core import HomeAssistant
 import pytest
 
 import aiohuesyncbox
-from custom_components.huesyncbox.helpers import (
-    LinearRangeConverter,
-    get_group_from_area_name,
-)
+from custom_components.huesyncbox.helpers import LinearRangeConverter
 
 from .conftest import setup_integration
 
@@ -25,14 +22,6 @@ def test_linear_range_converter() -> None:
     assert lrc.range_2_to_range_1(0) == 0
 
 
-def test_group_from_area_name(mock_api: Mock) -> None:
-    assert get_group_from_area_name(mock_api, "does not exist") is None
-
-    group = get_group_from_area_name(mock_api, "Name 1")
-    assert group is not None
-    assert group.id == "id1"
-
-
 async def test_retry_on_invalid_state_nothing_streaming_so_no_retry(
     hass: HomeAssistant, mock_api: Mock
 ) -> None:
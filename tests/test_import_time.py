@@ -0,0 +1,73 @@
+"""Import cost checks for the Philips Hue Play HDMI Sync Box integration."""
+
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT_DIR = Path(__file__).parent.parent
+PACKAGE = "custom_components.huesyncbox"
+
+# Only count modules owned by the integration (and its library),
+# Home Assistant core and aiohttp are loaded by HA anyway.
+OWN_MODULE_PREFIXES = (PACKAGE, "aiohuesyncbox")
+
+# Sum of the self import time of the own modules in microseconds.
+# This is generous on purpose to avoid flaky CI runs, the typical value is far lower.
+IMPORT_TIME_BUDGET_US = 50_000
+MEASUREMENTS = 3
+
+# Modules that should only be loaded when they are actually needed
+LAZY_MODULES = [
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.diagnostics",
+    f"{PACKAGE}.migration",
+    f"{PACKAGE}.profiler",
+    f"{PACKAGE}.services",
+    f"{PACKAGE}.system_health",
+]
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=ROOT_DIR,
+        text=True,
+    )
+
+
+def measure_own_import_time_us() -> int:
+    """Import the integration in a fresh interpreter and sum self times of own modules."""
+    result = run_python(f"import {PACKAGE}", "-X", "importtime")
+
+    total = 0
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        if fields[2].strip().startswith(OWN_MODULE_PREFIXES):
+            total += int(fields[0])
+    return total
+
+
+def test_lazy_modules_not_imported() -> None:
+    result = run_python(
+        f"import sys, {PACKAGE}; print(','.join(m for m in sys.modules if m.startswith('{PACKAGE}.')))"
+    )
+    imported = result.stdout.strip().split(",")
+
+    for module in LAZY_MODULES:
+        assert module not in imported
+
+
+def test_import_time_budget() -> None:
+    # Take the best out of a few runs to filter out noise from the machine
+    import_time = min(measure_own_import_time_us() for _ in range(MEASUREMENTS))
+    assert import_time > 0
+    assert import_time < IMPORT_TIME_BUDGET_US, (
+        f"Importing {PACKAGE} took {import_time}us, budget is {IMPORT_TIME_BUDGET_US}us"
+    )
@@ -1,3 +1,5 @@
+from datetime import timedelta
+from typing import Any
 from unittest.mock import Mock, call, patch
 
 from homeassistant.config_entries import ConfigEntryState
@@ -7,6 +9,8 @@ from homeassistant.const import (
     CONF_PATH,
     CONF_PORT,
     CONF_UNIQUE_ID,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import (
@@ -14,15 +18,28 @@ from homeassistant.helpers import (
     entity_registry as er,
     issue_registry as ir,
 )
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 import pytest
 from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
     MockConfigEntry,
+    async_fire_time_changed,
 )
 
 import aiohuesyncbox
 from custom_components import huesyncbox
+from custom_components.huesyncbox.migration import (
+    migrate_v1_to_v2,
+    migrate_v2_1_to_v2_2,
+)
+from custom_components.huesyncbox.registrations import (
+    RETRY_INTERVAL,
+    SAVE_DELAY,
+    STORAGE_KEY,
+    async_get_unregister_queue,
+)
 
-from .conftest import setup_integration
+from .conftest import force_coordinator_update, setup_integration
 
 
 async def test_device_info(hass: HomeAssistant, mock_api: Mock) -> None:
@@ -69,6 +86,29 @@ async def test_handle_communication_error_during_setup(
     assert mock_api.close.call_count == 1
 
 
+async def test_only_supported_platforms_are_set_up(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    mock_api.execution.brightness = None
+    integration = await setup_integration(hass, mock_api)
+
+    assert Platform.NUMBER not in integration.entry.runtime_data.platforms
+    assert hass.states.async_entity_ids_count("number") == 0
+    assert hass.states.async_entity_ids_count("switch") == 3
+
+    # Capability shows up later
+    mock_api.execution.brightness = 120
+    await force_coordinator_update(hass)
+
+    assert Platform.NUMBER in integration.entry.runtime_data.platforms
+    assert hass.states.async_entity_ids_count("number") == 1
+
+    # Unloading only unloads the platforms that were set up
+    await hass.config_entries.async_unload(integration.entry.entry_id)
+    await hass.async_block_till_done()
+    assert integration.entry.state == ConfigEntryState.NOT_LOADED
+
+
 async def test_unload_entry(hass: HomeAssistant, mock_api: Mock) -> None:
     integration = await setup_integration(hass, mock_api)
 
@@ -110,7 +150,7 @@ async def test_remove_entry(
         mock_api_in_with_block.unregister.side_effect = side_effect
 
         await hass.config_entries.async_remove(integration.entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert mock_api_in_with_block.unregister.call_count == 1
         assert mock_api_in_with_block.unregister.call_args == call(
@@ -120,6 +160,86 @@ async def test_remove_entry(
     config_entry = hass.config_entries.async_get_entry(integration.entry.entry_id)
     assert config_entry is None
 
+    # Nothing to retry
+    queue = await async_get_unregister_queue(hass)
+    assert queue.pending == []
+
+
+async def test_remove_entry_offline_box_is_retried(
+    hass: HomeAssistant, mock_api: Mock, hass_storage: dict[str, Any]
+) -> None:
+    integration = await setup_integration(hass, mock_api)
+
+    await hass.config_entries.async_unload(integration.entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch("aiohuesyncbox.HueSyncBox") as huesyncbox_api:
+        mock_api_in_with_block = huesyncbox_api.return_value.__aenter__.return_value
+        mock_api_in_with_block.unregister.side_effect = aiohuesyncbox.RequestError
+
+        await hass.config_entries.async_remove(integration.entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        # Entry is gone, but cleanup is still pending and persisted
+        assert hass.config_entries.async_get_entry(integration.entry.entry_id) is None
+        queue = await async_get_unregister_queue(hass)
+        assert len(queue.pending) == 1
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+        await hass.async_block_till_done()
+        assert hass_storage[STORAGE_KEY]["data"][0]["registration_id"] == (
+            "registration_id_value"
+        )
+
+        # Box is back online
+        mock_api_in_with_block.unregister.side_effect = None
+        async_fire_time_changed(hass, dt_util.utcnow() + RETRY_INTERVAL)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert mock_api_in_with_block.unregister.call_count == 2
+        assert queue.pending == []
+
+
+async def test_pending_unregistrations_retried_on_startup(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            {
+                CONF_HOST: "host",
+                CONF_UNIQUE_ID: "unique_id",
+                CONF_PORT: 1234,
+                CONF_PATH: "/api_path",
+                CONF_ACCESS_TOKEN: "token",
+                huesyncbox.const.REGISTRATION_ID: "stored_registration_id",
+            }
+        ],
+    }
+
+    with patch("aiohuesyncbox.HueSyncBox") as huesyncbox_api:
+        mock_api_in_with_block = huesyncbox_api.return_value.__aenter__.return_value
+
+        assert await async_setup_component(hass, huesyncbox.DOMAIN, {})
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert mock_api_in_with_block.unregister.call_args == call(
+            "stored_registration_id"
+        )
+
+    queue = await async_get_unregister_queue(hass)
+    assert queue.pending == []
+
+
+async def test_sessions_closed_on_stop(hass: HomeAssistant, mock_api: Mock) -> None:
+    await setup_integration(hass, mock_api)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert mock_api.close.call_count == 1
+
 
 async def test_migrate(hass: HomeAssistant, mock_api: Mock) -> None:
     # Create v1 entry
@@ -191,7 +311,7 @@ async def test_migrate_v1_to_v2(hass: HomeAssistant) -> None:
         "homeassistant.components.automation.automations_with_entity",
         return_value=[automation_entity.entity_id],
     ):
-        huesyncbox.migrate_v1_to_v2(hass, mock_config_entry)
+        migrate_v1_to_v2(hass, mock_config_entry)
 
     # Check results
     assert entity_registry.async_get(mp_entity.entity_id) is None
@@ -235,7 +355,7 @@ async def test_migrate_v2_1_to_v2_2(hass: HomeAssistant) -> None:
     )
 
     # Manually trigger upgrade
-    huesyncbox.migrate_v2_1_to_v2_2(hass, mock_config_entry)
+    migrate_v2_1_to_v2_2(hass, mock_config_entry)
 
     # Check results
     assert (
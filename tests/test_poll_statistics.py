@@ -0,0 +1,53 @@
+from custom_components.huesyncbox.poll_statistics import (
+    POLL_HISTORY_SIZE,
+    PollStatistics,
+    percentile,
+)
+
+
+def test_percentile() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([1.0], 95) == 1
+
+
+def test_empty_statistics() -> None:
+    statistics = PollStatistics()
+
+    assert statistics.last_duration is None
+    assert statistics.latency_percentile(50) is None
+    assert statistics.success_rate is None
+    assert statistics.requests_per_minute == 0
+
+
+def test_record_polls() -> None:
+    statistics = PollStatistics()
+
+    statistics.record_poll(0.1, success=True)
+    statistics.record_poll(0.3, success=False)
+    statistics.record_poll(0.2, success=True)
+    for _ in range(3):
+        statistics.record_request()
+
+    assert statistics.last_duration == 0.2
+    assert statistics.latency_percentile(50) == 0.2
+    assert statistics.latency_percentile(95) == 0.3
+    assert statistics.success_rate == 200 / 3
+    assert statistics.requests_per_minute == 3
+    assert statistics.total_polls == 3
+    assert statistics.total_failures == 1
+
+
+def test_history_is_bounded() -> None:
+    statistics = PollStatistics()
+
+    for _ in range(POLL_HISTORY_SIZE):
+        statistics.record_poll(1.0, success=False)
+    for _ in range(POLL_HISTORY_SIZE):
+        statistics.record_poll(0.1, success=True)
+
+    assert len(statistics.durations) == POLL_HISTORY_SIZE
+    assert statistics.latency_percentile(95) == 0.1
+    assert statistics.success_rate == 100
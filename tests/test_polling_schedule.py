@@ -0,0 +1,91 @@
+"""Polling schedule over long periods, on simulated time."""
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from custom_components.huesyncbox.const import COORDINATOR_UPDATE_INTERVAL
+from custom_components.huesyncbox.coordinator import HueSyncBoxCoordinator
+
+from .conftest import setup_simulated_box
+from .faults import FaultInjector, Faults
+from .simulator import SimulatedBox, Simulator
+from .virtual_clock import VirtualClock
+
+POLL_INTERVAL = COORDINATOR_UPDATE_INTERVAL.total_seconds()
+HOUR = 3600
+
+
+async def setup_box(
+    hass: HomeAssistant, simulator: Simulator
+) -> tuple[SimulatedBox, HueSyncBoxCoordinator]:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    entry = await setup_simulated_box(hass, box)
+    return box, entry.runtime_data.coordinator
+
+
+async def test_poll_interval(
+    hass: HomeAssistant, simulator: Simulator, virtual_clock: VirtualClock
+) -> None:
+    box, coordinator = await setup_box(hass, simulator)
+    requests = box.requests
+
+    await virtual_clock.async_advance(HOUR)
+
+    # One request per poll
+    expected = HOUR / POLL_INTERVAL
+    assert abs(coordinator.poll_statistics.total_polls - expected) <= 1
+    assert box.requests - requests == coordinator.poll_statistics.total_polls
+
+
+async def test_no_backoff_when_box_is_down(
+    hass: HomeAssistant, simulator: Simulator, virtual_clock: VirtualClock
+) -> None:
+    box, coordinator = await setup_box(hass, simulator)
+    FaultInjector(Faults(server_error_rate=1)).install(box)
+    polls = coordinator.poll_statistics.total_polls
+
+    await virtual_clock.async_advance(HOUR)
+
+    # Polling continues at the normal interval
+    expected = HOUR / POLL_INTERVAL
+    assert abs(coordinator.poll_statistics.total_polls - polls - expected) <= 1
+    assert not coordinator.last_update_success
+
+
+async def test_polling_stops_on_invalid_token(
+    hass: HomeAssistant, simulator: Simulator, virtual_clock: VirtualClock
+) -> None:
+    box, _ = await setup_box(hass, simulator)
+    box.registrations.clear()
+
+    await virtual_clock.async_advance(POLL_INTERVAL + 1)
+    requests = box.requests
+
+    await virtual_clock.async_advance(HOUR)
+    assert box.requests == requests
+
+
+async def test_refresh_requests_are_debounced(
+    hass: HomeAssistant, simulator: Simulator, virtual_clock: VirtualClock
+) -> None:
+    box, _ = await setup_box(hass, simulator)
+    requests = box.requests
+
+    for brightness in (10, 20, 30):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {ATTR_ENTITY_ID: "number.box_brightness", "value": brightness},
+            blocking=True,
+        )
+    # The first refresh is immediate, the others are combined into one
+    assert box.requests - requests == 3 + 1
+
+    await virtual_clock.async_advance(1)
+    assert box.requests - requests == 3 + 2
+
+    # The next poll is scheduled an interval after the last refresh
+    await virtual_clock.async_advance(POLL_INTERVAL - 2)
+    assert box.requests - requests == 3 + 2
+    await virtual_clock.async_advance(2)
+    assert box.requests - requests == 3 + 3
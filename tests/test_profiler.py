@@ -0,0 +1,110 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.exceptions import ServiceValidationError, Unauthorized
+import pytest
+from pytest_homeassistant_custom_component.common import MockUser  # type: ignore[import]
+
+from custom_components import huesyncbox
+from custom_components.huesyncbox.profiler import DATA_PROFILER, Profiler
+from custom_components.huesyncbox.switch import HueSyncBoxSwitch
+
+from .conftest import force_coordinator_update, setup_integration
+
+
+async def test_profiler_records_hot_paths(hass: HomeAssistant, mock_api: Mock) -> None:
+    integration = await setup_integration(hass, mock_api)
+    coordinator = integration.entry.runtime_data.coordinator
+    is_on = HueSyncBoxSwitch.__dict__["is_on"]
+    update_data = coordinator._async_update_data  # noqa: SLF001
+
+    profiler = Profiler()
+    profiler.start([coordinator])
+    assert HueSyncBoxSwitch.__dict__["is_on"] is not is_on
+    # Listeners only run when the state of the box changed
+    mock_api.execution.mode = "video"
+    await force_coordinator_update(hass)
+    profiler.stop()
+
+    # Everything is back to how it was
+    assert HueSyncBoxSwitch.__dict__["is_on"] is is_on
+    assert coordinator._async_update_data == update_data  # noqa: SLF001
+
+    report = profiler.report()
+    summary = report["summary"]
+    assert summary["coordinator_update"]["count"] == 1
+    assert summary["response_parsing"]["count"] == 1
+    assert summary["listener_fanout"]["count"] == 1
+    assert summary["HueSyncBoxSwitch.is_on"]["count"] > 0
+    assert any(
+        entity.startswith("switch.name_") for entity in report["top_entities_ms"]
+    )
+
+    # Not recorded anymore
+    await force_coordinator_update(hass)
+    assert profiler.report()["summary"]["coordinator_update"]["count"] == 1
+
+
+async def test_profile_service(
+    hass: HomeAssistant, mock_api: Mock, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    await setup_integration(hass, mock_api)
+
+    call = asyncio.create_task(
+        hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "profile",
+            {"duration": 1},
+            blocking=True,
+            return_response=True,
+        )
+    )
+    while DATA_PROFILER not in hass.data:
+        await asyncio.sleep(0)
+    await force_coordinator_update(hass)
+    response = await call
+
+    assert DATA_PROFILER not in hass.data
+    assert response["summary"]["coordinator_update"]["count"] == 1
+
+    report_path = Path(response["report_path"])
+    assert report_path.parent == tmp_path
+    report = json.loads(report_path.read_text())
+    assert report["summary"] == response["summary"]
+
+
+async def test_profile_service_already_running(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    await setup_integration(hass, mock_api)
+    hass.data[DATA_PROFILER] = Profiler()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "profile",
+            {"duration": 1},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_profile_service_admin_only(
+    hass: HomeAssistant, mock_api: Mock, hass_read_only_user: MockUser
+) -> None:
+    await setup_integration(hass, mock_api)
+
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "profile",
+            {"duration": 1},
+            blocking=True,
+            return_response=True,
+            context=Context(user_id=hass_read_only_user.id),
+        )
+    assert DATA_PROFILER not in hass.data
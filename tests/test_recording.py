@@ -0,0 +1,96 @@
+import gzip
+import json
+from pathlib import Path
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_ON, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+import pytest
+
+import aiohuesyncbox
+from custom_components import huesyncbox
+from custom_components.huesyncbox.recording import DATA_RECORDING
+
+from .conftest import force_coordinator_update, setup_simulated_box
+from .replay import Exchange, Replay, load_recording
+from .simulator import Simulator
+
+
+async def test_record_and_replay(
+    hass: HomeAssistant, simulator: Simulator, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    entry = await setup_simulated_box(hass, box)
+
+    response = await hass.services.async_call(
+        huesyncbox.DOMAIN, "start_recording", {}, blocking=True, return_response=True
+    )
+    await force_coordinator_update(hass)
+    await force_coordinator_update(hass)
+    await hass.services.async_call(
+        "switch",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "switch.box_light_sync"},
+        blocking=True,
+    )
+    await force_coordinator_update(hass)
+    stopped = await hass.services.async_call(
+        huesyncbox.DOMAIN, "stop_recording", {}, blocking=True, return_response=True
+    )
+    assert DATA_RECORDING not in hass.data
+    assert stopped["file"] == response["file"]
+
+    with gzip.open(stopped["file"], "rt") as file:
+        header, *exchanges = [json.loads(line) for line in file]
+    assert header["version"] == 1
+    assert len(exchanges) == stopped["exchanges"]
+    assert exchanges[0]["method"] == "get"
+    assert exchanges[0]["entry_id"] == entry.entry_id
+    assert exchanges[0]["response"]["device"]["uniqueId"] == "**REDACTED**"
+    assert exchanges[0]["response"]["hue"]["bridgeUniqueId"] == "**REDACTED**"
+    # Unchanged, so not stored again
+    assert "response" not in exchanges[1]
+    assert exchanges[2]["method"] == "put"
+    assert exchanges[2]["path"] == "/execution"
+    assert exchanges[2]["data"] == {"syncActive": True}
+
+    # Replay on the same entry, the box is not used anymore
+    await hass.config_entries.async_unload(entry.entry_id)
+    requests = box.requests
+    replay = Replay(load_recording(Path(stopped["file"]), unique_id=box.unique_id))
+    with replay.patch():
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.states.get("switch.box_light_sync").state == STATE_OFF
+
+        for _ in exchanges:
+            await force_coordinator_update(hass)
+        assert hass.states.get("switch.box_light_sync").state == STATE_ON
+
+    assert replay.requests > 0
+    assert box.requests == requests
+
+
+async def test_timed_replay() -> None:
+    now = 100.0
+    replay = Replay(
+        [
+            Exchange(1.0, "get", "", {"state": 1}),
+            Exchange(11.0, "get", "", {"state": 2}),
+            Exchange(21.0, "get", "", None, "Unauthorized", "Invalid token"),
+        ],
+        speed=10,
+        clock=lambda: now,
+    )
+
+    assert await replay.request("get", "") == {"state": 1}
+    now += 0.5
+    assert await replay.request("get", "") == {"state": 1}
+    now += 0.5
+    assert await replay.request("get", "") == {"state": 2}
+    now += 1
+    with pytest.raises(aiohuesyncbox.Unauthorized):
+        await replay.request("get", "")
+
+    # Commands that were not recorded are accepted
+    assert await replay.request("put", "/execution", {"mode": "video"}) == {}
@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import aiohuesyncbox
+from custom_components.huesyncbox.request_history import (
+    RequestHistory,
+    instrument_api,
+)
+
+
+def test_ring_buffer_keeps_latest() -> None:
+    history = RequestHistory(size=3)
+
+    for n in range(5):
+        history.record(f"GET /{n}", n, 0.5, 0, n * 10, changed=n % 2 == 0)
+
+    assert len(history) == 3
+    entries = history.as_list()
+    assert [entry["endpoint"] for entry in entries] == ["GET /2", "GET /3", "GET /4"]
+    assert [entry["bytes"] for entry in entries] == [20, 30, 40]
+    assert [entry["changed"] for entry in entries] == [True, False, True]
+    assert entries[0]["duration_ms"] == 500
+    assert entries[0]["start"] == "1970-01-01T00:00:02+00:00"
+
+
+async def test_instrument_api_records_errors() -> None:
+    api = Mock(spec=aiohuesyncbox.HueSyncBox)
+    api.request = AsyncMock(side_effect=aiohuesyncbox.Unauthorized)
+    history = RequestHistory()
+    on_request = Mock()
+
+    instrument_api(api, history, on_request)
+    with pytest.raises(aiohuesyncbox.Unauthorized):
+        await api.request("get", "/hue")
+
+    entries = history.as_list()
+    assert len(entries) == 1
+    assert entries[0]["endpoint"] == "GET /hue"
+    assert entries[0]["outcome"] == "unauthorized"
+    assert entries[0]["changed"] is False
+    assert on_request.call_count == 1
@@ -0,0 +1,190 @@
+"""Behavior of the error handling of the coordinator under injected faults.
+
+Measured in polls, so how long it takes to detect that a box is down and to
+recover, how many requests are made to a box known to be down and how often
+the entities flap between available and unavailable.
+"""
+
+from collections.abc import Callable
+from unittest.mock import patch
+
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE
+from homeassistant.core import Event, HomeAssistant, callback
+import pytest
+
+import aiohuesyncbox
+from custom_components import huesyncbox
+from custom_components.huesyncbox.coordinator import MAX_CONSECUTIVE_ERRORS
+
+from .conftest import force_coordinator_update, setup_simulated_box
+from .faults import SERVER_ERROR, UNAUTHORIZED, FaultInjector, Faults, constant
+from .replay import Exchange, Replay
+from .simulator import Simulator
+
+ENTITY_ID = "switch.box_power"
+POLL_INTERVAL = huesyncbox.const.COORDINATOR_UPDATE_INTERVAL.total_seconds()
+
+
+class Availability:
+    """Follows if the entity is available and how often that changed."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self.flaps = 0
+        hass.bus.async_listen(EVENT_STATE_CHANGED, self._state_changed)
+
+    @property
+    def available(self) -> bool:
+        state = self._hass.states.get(ENTITY_ID)
+        return state is not None and state.state != STATE_UNAVAILABLE
+
+    @callback
+    def _state_changed(self, event: Event) -> None:
+        if event.data["entity_id"] != ENTITY_ID:
+            return
+        old_state, new_state = event.data["old_state"], event.data["new_state"]
+        if (old_state.state == STATE_UNAVAILABLE) != (
+            new_state.state == STATE_UNAVAILABLE
+        ):
+            self.flaps += 1
+
+
+async def polls_until(
+    hass: HomeAssistant, condition: Callable[[], bool], max_polls: int
+) -> int:
+    for polls in range(1, max_polls + 1):
+        await force_coordinator_update(hass)
+        if condition():
+            return polls
+    pytest.fail(f"Not reached within {max_polls} polls")
+
+
+async def setup_box_with_faults(
+    hass: HomeAssistant, simulator: Simulator, injector: FaultInjector
+) -> Availability:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    await setup_simulated_box(hass, box)
+    injector.install(box)
+    availability = Availability(hass)
+    assert availability.available
+    return availability
+
+
+@pytest.mark.parametrize(
+    "faults",
+    [
+        pytest.param(Faults(drop_rate=1), id="dropped_connections"),
+        pytest.param(Faults(server_error_rate=1), id="server_errors"),
+        pytest.param(Faults(invalid_state_rate=1), id="invalid_state"),
+        pytest.param(
+            Faults(latency=constant(0.05), drop_rate=1), id="slow_dropped_connections"
+        ),
+    ],
+)
+async def test_box_down(
+    hass: HomeAssistant, simulator: Simulator, faults: Faults
+) -> None:
+    injector = FaultInjector()
+    availability = await setup_box_with_faults(hass, simulator, injector)
+
+    injector.faults = faults
+    await polls_until(hass, lambda: not availability.available, MAX_CONSECUTIVE_ERRORS)
+
+    # Polling continues at the normal interval while the box is down
+    requests = injector.requests
+    for _ in range(5):
+        await force_coordinator_update(hass)
+    wasted_requests = injector.requests - requests
+    # Requests on a dropped connection can be retried once by aiohttp
+    assert 5 <= wasted_requests <= 10
+
+    injector.clear()
+    assert await polls_until(hass, lambda: availability.available, 1) == 1
+    assert availability.flaps == 2
+
+
+async def test_timeouts(hass: HomeAssistant, simulator: Simulator) -> None:
+    injector = FaultInjector()
+    availability = await setup_box_with_faults(hass, simulator, injector)
+
+    with patch("custom_components.huesyncbox.coordinator.UPDATE_TIMEOUT", 0.1):
+        injector.faults = Faults(timeout_rate=1)
+        await polls_until(
+            hass, lambda: not availability.available, MAX_CONSECUTIVE_ERRORS
+        )
+
+        injector.clear()
+        assert await polls_until(hass, lambda: availability.available, 1) == 1
+
+    assert availability.flaps == 2
+
+
+async def test_sporadic_errors_do_not_flap(
+    hass: HomeAssistant, simulator: Simulator
+) -> None:
+    injector = FaultInjector()
+    availability = await setup_box_with_faults(hass, simulator, injector)
+
+    # Every other poll fails, never reaching the consecutive error limit
+    injector.faults = Faults(pattern=[SERVER_ERROR, None])
+    for _ in range(20):
+        await force_coordinator_update(hass)
+
+    assert injector.injected[SERVER_ERROR] == 10
+    assert availability.flaps == 0
+
+
+@pytest.mark.parametrize(
+    ("flapping", "flaps"),
+    [
+        # Down for 2 polls, shorter than the consecutive error limit
+        ((6, 6), 0),
+        # Down for 10 polls, twice
+        ((6, 30), 4),
+    ],
+)
+async def test_flapping_reachability(
+    hass: HomeAssistant,
+    simulator: Simulator,
+    flapping: tuple[float, float],
+    flaps: int,
+) -> None:
+    now = 0.0
+    injector = FaultInjector(clock=lambda: now)
+    availability = await setup_box_with_faults(hass, simulator, injector)
+
+    injector.faults = Faults(flapping=flapping)
+    for _ in range(24):
+        now += POLL_INTERVAL
+        await force_coordinator_update(hass)
+
+    assert availability.flaps == flaps
+
+
+async def test_unauthorized(hass: HomeAssistant, simulator: Simulator) -> None:
+    injector = FaultInjector()
+    availability = await setup_box_with_faults(hass, simulator, injector)
+
+    injector.faults = Faults(unauthorized_rate=1)
+    assert await polls_until(hass, lambda: not availability.available, 1) == 1
+
+    flows = hass.config_entries.flow.async_progress_by_handler(huesyncbox.DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == [SOURCE_REAUTH]
+
+    # Polling stops until the reauthentication is done
+    requests = injector.requests
+    for _ in range(5):
+        await force_coordinator_update(hass)
+    assert injector.requests == requests
+
+
+async def test_faults_in_front_of_replay() -> None:
+    replay = Replay([Exchange(0, "get", "", {"state": 1})])
+    injector = FaultInjector(Faults(pattern=[UNAUTHORIZED, None]))
+    request = injector.wrap(replay.request)
+
+    with pytest.raises(aiohuesyncbox.Unauthorized):
+        await request("get", "")
+    assert await request("get", "") == {"state": 1}
+    assert replay.requests == 1
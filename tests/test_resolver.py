@@ -0,0 +1,44 @@
+from unittest.mock import AsyncMock, patch
+
+from custom_components.huesyncbox.resolver import HostResolver
+
+
+async def test_ip_address_is_not_resolved(mock_host_lookup: AsyncMock) -> None:
+    resolver = HostResolver()
+
+    assert await resolver.async_resolve("1.2.3.4") == "1.2.3.4"
+    assert mock_host_lookup.call_count == 0
+    assert resolver.as_dict("1.2.3.4") is None
+
+
+async def test_resolved_address_is_cached(mock_host_lookup: AsyncMock) -> None:
+    resolver = HostResolver()
+
+    assert await resolver.async_resolve("box.local") == "192.0.2.1"
+    assert await resolver.async_resolve("box.local") == "192.0.2.1"
+    assert mock_host_lookup.call_count == 1
+
+    stats = resolver.as_dict("box.local")
+    assert stats is not None
+    assert stats["hits"] == 1
+    assert stats["lookups"] == 1
+    assert stats["failures"] == 0
+    assert stats["last_lookup_duration"] is not None
+
+
+async def test_failure_keeps_previous_address(mock_host_lookup: AsyncMock) -> None:
+    resolver = HostResolver()
+    mock_host_lookup.side_effect = OSError("Name or service not known")
+
+    # Nothing known yet, let the HTTP layer have a go
+    assert await resolver.async_resolve("box.local") == "box.local"
+
+    # Expired address is still better than nothing
+    with patch("custom_components.huesyncbox.resolver.RESOLVE_TTL", 0):
+        resolver.async_update("box.local", "192.0.2.5")
+    assert await resolver.async_resolve("box.local") == "192.0.2.5"
+
+    stats = resolver.as_dict("box.local")
+    assert stats is not None
+    assert stats["failures"] == 2
+    assert stats["last_error"] == "Name or service not known"
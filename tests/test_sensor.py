@@ -3,14 +3,16 @@ from unittest.mock import Mock
 from homeassistant.core import HomeAssistant
 import pytest
 
-from .conftest import setup_integration
+import aiohuesyncbox
+
+from .conftest import force_coordinator_update, setup_integration
 
 
 @pytest.mark.usefixtures("entity_registry_enabled_by_default")
 async def test_sensor(hass: HomeAssistant, mock_api: Mock) -> None:
     """Test the total count of sensor entities after integration setup."""
     await setup_integration(hass, mock_api)
-    assert hass.states.async_entity_ids_count("sensor") == 9
+    assert hass.states.async_entity_ids_count("sensor") == 15
 
 
 async def test_sensor_default_disabled(hass: HomeAssistant, mock_api: Mock) -> None:
@@ -89,3 +91,37 @@ async def test_content_info(hass: HomeAssistant, mock_api: Mock) -> None:
     entity = hass.states.get("sensor.name_content_info")
     assert entity is not None
     assert entity.state == "1920 x 1080 @ 60 - SDR"
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_poll_statistics(hass: HomeAssistant, mock_api: Mock) -> None:
+    mock_request = mock_api.request
+    await setup_integration(hass, mock_api)
+
+    # Polling makes a request like the real library does,
+    # the integration replaced `request` to keep track of requests
+    async def update() -> None:
+        await mock_api.request("get", "")
+
+    mock_api.update.side_effect = update
+    await force_coordinator_update(hass)
+
+    mock_request.side_effect = aiohuesyncbox.RequestError
+    await force_coordinator_update(hass)
+
+    entity = hass.states.get("sensor.name_poll_success_rate")
+    assert entity is not None
+    assert float(entity.state) == 50
+
+    entity = hass.states.get("sensor.name_consecutive_errors")
+    assert entity is not None
+    assert entity.state == "1"
+
+    entity = hass.states.get("sensor.name_requests_per_minute")
+    assert entity is not None
+    assert entity.state == "2"
+
+    for key in ("last_poll_duration", "poll_latency_p50", "poll_latency_p95"):
+        entity = hass.states.get(f"sensor.name_{key}")
+        assert entity is not None
+        assert float(entity.state) >= 0
@@ -1,12 +1,15 @@
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
 
+from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import device_registry as dr
 import pytest
+import voluptuous as vol
 
 import aiohuesyncbox
 from custom_components import huesyncbox
+from custom_components.huesyncbox.scanner import ScannedBox
 from custom_components.huesyncbox.services import async_register_services
 
 from .conftest import setup_integration
@@ -205,3 +208,57 @@ async def test_set_sync_state_device_id_unknown(
             },
             blocking=True,
         )
+
+
+async def test_scan(hass: HomeAssistant, mock_api: Mock) -> None:
+    await setup_integration(hass, mock_api)
+
+    async def probe(_session: object, host: str) -> ScannedBox | None:
+        return ScannedBox(host, "AABBCCDDEEFF", "Box") if host == "10.0.0.2" else None
+
+    with patch(
+        "custom_components.huesyncbox.scanner.async_probe", side_effect=probe
+    ) as mock_probe:
+        response = await hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "scan",
+            {"subnets": ["10.0.0.0/30"]},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+        assert response == {
+            "boxes": [{"host": "10.0.0.2", "unique_id": "AABBCCDDEEFF", "name": "Box"}]
+        }
+        assert mock_probe.call_count == 2
+
+        flows = hass.config_entries.flow.async_progress_by_handler(huesyncbox.DOMAIN)
+        assert len(flows) == 1
+        assert flows[0]["context"]["source"] == config_entries.SOURCE_INTEGRATION_DISCOVERY
+        assert flows[0]["context"]["unique_id"] == "AABBCCDDEEFF"
+        assert flows[0]["step_id"] == "zeroconf_confirm"
+
+        # Results are cached, so no new probes
+        await hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "scan",
+            {"subnets": ["10.0.0.0/30"]},
+            blocking=True,
+        )
+        assert mock_probe.call_count == 2
+
+
+@pytest.mark.parametrize("subnets", ["not_a_subnet", "10.0.0.0/8"])
+async def test_scan_invalid_subnets(
+    hass: HomeAssistant, mock_api: Mock, subnets: str
+) -> None:
+    await setup_integration(hass, mock_api)
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            huesyncbox.DOMAIN,
+            "scan",
+            {"subnets": subnets},
+            blocking=True,
+        )
@@ -0,0 +1,137 @@
+"""Tests running the real library and integration against simulated boxes."""
+
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_ON, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components import huesyncbox
+from custom_components.huesyncbox.config_flow import (
+    ConnectionInfo,
+    LinkStatistics,
+    link_box,
+)
+
+from .conftest import force_coordinator_update, setup_simulated_box
+from .simulator import Simulator
+
+
+async def test_setup(hass: HomeAssistant, simulator: Simulator) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    entry = await setup_simulated_box(hass, box)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("switch.box_power").state == STATE_ON
+    assert hass.states.get("select.box_hdmi_input").state == "HDMI 1"
+    assert hass.states.get("select.box_entertainment_area").state == "TV Area"
+
+    requests = box.requests
+    await force_coordinator_update(hass)
+    assert box.requests == requests + 1
+
+
+async def test_light_sync(hass: HomeAssistant, simulator: Simulator) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    await setup_simulated_box(hass, box)
+
+    await hass.services.async_call(
+        "switch",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "switch.box_light_sync"},
+        blocking=True,
+    )
+
+    assert box.execution["mode"] == "video"
+    assert box.groups["1"] == {
+        "name": "TV Area",
+        "numLights": 3,
+        "active": True,
+        "owner": "Box",
+    }
+    assert hass.states.get("switch.box_light_sync").state == STATE_ON
+    assert hass.states.get("select.box_sync_mode").state == "video"
+
+
+async def test_entertainment_area_in_use(
+    hass: HomeAssistant, simulator: Simulator
+) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    box.groups["1"].update(active=True, owner="Other app")
+    await setup_simulated_box(hass, box)
+
+    # The integration stops the other application and tries again
+    await hass.services.async_call(
+        "switch",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "switch.box_light_sync"},
+        blocking=True,
+    )
+
+    assert box.execution["syncActive"] is True
+    assert box.groups["1"]["owner"] == "Box"
+
+
+async def test_multiple_boxes(hass: HomeAssistant, simulator: Simulator) -> None:
+    boxes = [
+        await simulator.async_add_box(f"AABBCCDDEE0{index}", f"Box {index}")
+        for index in range(3)
+    ]
+    for box in boxes:
+        await setup_simulated_box(hass, box)
+
+    device_entry = dr.async_get(hass).async_get_device(
+        identifiers={(huesyncbox.DOMAIN, "AABBCCDDEE01")}
+    )
+    assert device_entry is not None
+
+    await hass.services.async_call(
+        huesyncbox.DOMAIN,
+        "set_sync_state",
+        {
+            "device_id": device_entry.id,
+            "mode": "music",
+            "brightness": 50,
+            "entertainment_area": "Living Room",
+        },
+        blocking=True,
+    )
+
+    assert [box.execution["mode"] for box in boxes] == [
+        "passthrough",
+        "music",
+        "passthrough",
+    ]
+    assert boxes[1].execution["hueTarget"] == "groups/2"
+    assert boxes[1].execution["brightness"] == 99
+
+
+async def test_access_token_revoked(hass: HomeAssistant, simulator: Simulator) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    entry = await setup_simulated_box(hass, box)
+
+    box.registrations.clear()
+    await force_coordinator_update(hass)
+
+    flows = hass.config_entries.flow.async_progress_by_handler(huesyncbox.DOMAIN)
+    assert len(flows) == 1
+    assert flows[0]["context"]["source"] == SOURCE_REAUTH
+    assert flows[0]["context"]["entry_id"] == entry.entry_id
+
+
+async def test_link_and_unregister(hass: HomeAssistant, simulator: Simulator) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box", registered=False)
+    box.button_pressed = True
+
+    connection_info = ConnectionInfo("127.0.0.1", box.unique_id, port=box.port)
+    assert await link_box(hass, connection_info, "Home", LinkStatistics()) == "Box"
+    assert box.registrations[connection_info.registration_id] == {
+        "appName": "Home Assistant",
+        "instanceName": "Home",
+        "accessToken": connection_info.access_token,
+    }
+
+    entry = await setup_simulated_box(hass, box)
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert box.registrations == {}
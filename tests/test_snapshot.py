@@ -0,0 +1,111 @@
+from unittest.mock import Mock
+
+import aiohuesyncbox
+from custom_components.huesyncbox.snapshot import (
+    NO_AREA,
+    NO_INPUT,
+    NameIndex,
+    create_snapshot,
+)
+
+
+def test_create_snapshot(mock_api: Mock) -> None:
+    snapshot = create_snapshot(mock_api)
+
+    assert snapshot.ip_address == "1.2.3.4"
+    assert snapshot.wifi_strength == 2
+    assert snapshot.led_indicator_mode == "normal"
+    assert snapshot.power
+    assert snapshot.light_sync
+    assert snapshot.sync_mode == "music"
+    assert snapshot.intensity == "moderate"
+    assert snapshot.brightness == 60
+    assert snapshot.current_input == "HDMI 2"
+    assert snapshot.current_entertainment_area == "Name 2"
+    assert snapshot.inputs.options == ["HDMI 1", "HDMI 2", "HDMI 3", "HDMI 4"]
+    assert snapshot.input_statuses == ("unplugged", "plugged", "linked", "unknown")
+    assert snapshot.content_specs == "1920 x 1080 @ 60 - SDR"
+    assert snapshot.bridge_unique_id == "bridge_id"
+    assert snapshot.bridge_connection_state == "connected"
+    assert snapshot.areas.options == ["Name 1", "Name 2"]
+    assert snapshot.force_dovi_native == 1
+
+
+def test_create_snapshot_not_syncing(mock_api: Mock) -> None:
+    mock_api.execution.mode = "passthrough"
+    mock_api.execution.hdmi_source = "invalid_input"
+    mock_api.execution.hue_target = "groups/123"
+    mock_api.execution.brightness = None
+    mock_api.device.wifi = None
+    mock_api.device.led_mode = 3
+
+    snapshot = create_snapshot(mock_api)
+
+    assert snapshot.power
+    assert not snapshot.light_sync
+    assert snapshot.sync_mode == "game"
+    assert snapshot.intensity == "intense"
+    assert snapshot.brightness is None
+    assert snapshot.current_input == NO_INPUT
+    assert snapshot.current_entertainment_area == NO_AREA
+    assert snapshot.wifi_strength is None
+    assert snapshot.led_indicator_mode is None
+
+
+def test_snapshots_compare_by_value(mock_api: Mock) -> None:
+    snapshot = create_snapshot(mock_api)
+    assert create_snapshot(mock_api) == snapshot
+
+    mock_api.hdmi.input2.status = "linked"
+    assert create_snapshot(mock_api) != snapshot
+
+
+def test_name_index() -> None:
+    index = NameIndex((("id1", "Name"), ("id2", "Other"), ("id3", "Name")))
+
+    assert index.options == ["Name", "Other", "Name"]
+    assert index.id_for("Other") == "id2"
+    assert index.id_for("Name") == "id1"
+    assert index.id_for("does not exist") is None
+    assert index.id_for(None) is None
+    assert index.name_for("id3") == "Name"
+    assert index.name_for("id4") is None
+
+
+def test_area_index(mock_api: Mock) -> None:
+    mock_api.hue.groups = [
+        aiohuesyncbox.hue.Group("2", {"name": "B", "numLights": 1, "active": False}),
+        aiohuesyncbox.hue.Group("1", {"name": "A", "numLights": 1, "active": False}),
+        aiohuesyncbox.hue.Group(
+            "aabbccdd-0000-1111-2222-333344445555",
+            {"name": "C", "numLights": 1, "active": False},
+        ),
+    ]
+    mock_api.execution.hue_target = "groups/2"
+
+    snapshot = create_snapshot(mock_api)
+
+    assert snapshot.areas.options == ["A", "B", "C"]
+    assert snapshot.areas.id_for("A") == "1"
+    assert snapshot.areas.id_for("C") == "aabbccdd-0000-1111-2222-333344445555"
+    assert snapshot.current_entertainment_area == "B"
+
+    mock_api.execution.hue_target = "aabbccdd-0000-1111-2222-333344445555"
+    assert create_snapshot(mock_api).current_entertainment_area == "C"
+
+
+def test_indexes_are_kept_while_names_do_not_change(mock_api: Mock) -> None:
+    snapshot = create_snapshot(mock_api)
+
+    mock_api.execution.hdmi_source = "input3"
+    next_snapshot = create_snapshot(mock_api, snapshot)
+    assert next_snapshot.current_input == "HDMI 3"
+    assert next_snapshot.inputs is snapshot.inputs
+    assert next_snapshot.areas is snapshot.areas
+
+    mock_api.hdmi.input3.name = "Console"
+    next_snapshot = create_snapshot(mock_api, next_snapshot)
+    assert next_snapshot.current_input == "Console"
+    assert next_snapshot.inputs is not snapshot.inputs
+    assert next_snapshot.inputs.id_for("Console") == "input3"
+    assert next_snapshot.areas is snapshot.areas
@@ -0,0 +1,138 @@
+"""Reloads entries over and over and checks that nothing leaks.
+
+The number of iterations is small by default, for a real soak run set e.g.
+HUESYNCBOX_SOAK_ITERATIONS=5000.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import gc
+import os
+from pathlib import Path
+import tracemalloc
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.huesyncbox.coordinator import HueSyncBoxCoordinator
+
+from .conftest import setup_simulated_box
+from .faults import FaultInjector, Faults
+from .simulator import Simulator
+
+ITERATIONS = int(os.environ.get("HUESYNCBOX_SOAK_ITERATIONS", "25"))
+WARMUP_ITERATIONS = 5
+
+# Some slack for things outside the integration, like sockets still closing
+FD_SLACK = 5
+TASK_SLACK = 2
+MEMORY_GROWTH_PER_ITERATION = 10_000  # bytes
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def open_sessions() -> int:
+    return sum(
+        1
+        for obj in gc.get_objects()
+        if isinstance(obj, aiohttp.ClientSession) and not obj.closed
+    )
+
+
+def coordinator_listeners() -> int:
+    return sum(
+        len(obj._listeners)  # noqa: SLF001
+        for obj in gc.get_objects()
+        if isinstance(obj, HueSyncBoxCoordinator)
+    )
+
+
+async def measure(hass: HomeAssistant) -> dict[str, int]:
+    await hass.async_block_till_done(wait_background_tasks=True)
+    # Let transports that are closing finish
+    for _ in range(3):
+        await asyncio.sleep(0)
+    gc.collect()
+    return {
+        "fds": open_fds(),
+        "sessions": open_sessions(),
+        "tasks": len(asyncio.all_tasks()),
+        "coordinator_listeners": coordinator_listeners(),
+        "bus_listeners": sum(hass.bus.async_listeners().values()),
+        "memory": tracemalloc.get_traced_memory()[0],
+    }
+
+
+async def reload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def switch_host(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    # Zeroconf host updates switch the api without a reload
+    assert await entry.runtime_data.coordinator.async_set_host("127.0.0.1")
+    await hass.async_block_till_done()
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/fd").exists(), reason="Counting fds needs /proc"
+)
+@pytest.mark.parametrize(
+    ("faults", "expected_state", "iteration"),
+    [
+        (None, ConfigEntryState.LOADED, reload),
+        (None, ConfigEntryState.LOADED, switch_host),
+        (Faults(server_error_rate=1), None, reload),
+        (Faults(drop_rate=1), None, reload),
+        (Faults(unauthorized_rate=1), ConfigEntryState.SETUP_ERROR, reload),
+    ],
+    ids=["reload", "switch_host", "server_errors", "dropped", "unauthorized"],
+)
+async def test_no_leaks(
+    hass: HomeAssistant,
+    simulator: Simulator,
+    faults: Faults | None,
+    expected_state: ConfigEntryState | None,
+    iteration: Callable[[HomeAssistant, MockConfigEntry], Awaitable[None]],
+) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    entry = await setup_simulated_box(hass, box)
+    injector = FaultInjector(faults).install(box)
+
+    for _ in range(WARMUP_ITERATIONS):
+        await iteration(hass, entry)
+
+    if expected_state is None:
+        # Not ready or failed, depending on how the library reports the error
+        assert entry.state is not ConfigEntryState.LOADED
+    else:
+        assert entry.state is expected_state
+
+    tracemalloc.start()
+    try:
+        before = await measure(hass)
+        for _ in range(ITERATIONS):
+            await iteration(hass, entry)
+        after = await measure(hass)
+    finally:
+        tracemalloc.stop()
+        injector.clear()
+        # Also cancels a pending retry of a failed setup
+        await hass.config_entries.async_unload(entry.entry_id)
+
+    assert after["fds"] <= before["fds"] + FD_SLACK, (before, after)
+    assert after["sessions"] <= before["sessions"], (before, after)
+    assert after["tasks"] <= before["tasks"] + TASK_SLACK, (before, after)
+    assert after["coordinator_listeners"] <= before["coordinator_listeners"], (
+        before,
+        after,
+    )
+    assert after["bus_listeners"] <= before["bus_listeners"], (before, after)
+    assert (
+        after["memory"] - before["memory"] <= MEMORY_GROWTH_PER_ITERATION * ITERATIONS
+    ), (before, after)
@@ -0,0 +1,92 @@
+"""Guards the number of state writes per poll against quietly growing.
+
+Every write costs CPU in the state machine, the state_changed ones are also
+stored by the recorder. When a change lowers the numbers, lower the budgets.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+import pytest
+
+from .conftest import force_coordinator_update, setup_simulated_box
+from .simulator import SimulatedBox, Simulator
+
+POLLS = 5
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Allowed writes per poll."""
+
+    state_changed: int
+    state_reported: int
+
+
+def idle(_box: SimulatedBox, _poll: int) -> None:
+    pass
+
+
+def brightness_change(box: SimulatedBox, poll: int) -> None:
+    box.execution["brightness"] = 20 + 20 * poll
+
+
+def hdmi_hot_plug(box: SimulatedBox, poll: int) -> None:
+    box.state["hdmi"]["input2"]["status"] = "plugged" if poll % 2 == 0 else "unplugged"
+
+
+@pytest.mark.parametrize(
+    ("syncing", "change", "budget"),
+    [
+        # Entities are only written when the snapshot of the box changed
+        pytest.param(False, idle, Budget(0, 0), id="idle"),
+        pytest.param(True, idle, Budget(0, 0), id="syncing_video"),
+        pytest.param(False, brightness_change, Budget(1, 12), id="brightness_change"),
+        pytest.param(False, hdmi_hot_plug, Budget(1, 12), id="hdmi_hot_plug"),
+    ],
+)
+async def test_state_writes_per_poll(
+    hass: HomeAssistant,
+    simulator: Simulator,
+    syncing: bool,  # noqa: FBT001
+    change: Callable[[SimulatedBox, int], None],
+    budget: Budget,
+) -> None:
+    box = await simulator.async_add_box("AABBCCDDEEFF", "Box")
+    if syncing:
+        box.set_execution({"mode": "video"})
+    entry = await setup_simulated_box(hass, box)
+
+    entity_ids = {
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+    }
+    writes = {EVENT_STATE_CHANGED: 0, EVENT_STATE_REPORTED: 0}
+
+    @callback
+    def count_write(event: Event) -> None:
+        if event.data["entity_id"] in entity_ids:
+            writes[event.event_type] += 1
+
+    unsubs = [
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_write),
+        # State reported events are only delivered to listeners with a filter
+        hass.bus.async_listen(
+            EVENT_STATE_REPORTED, count_write, event_filter=lambda _data: True
+        ),
+    ]
+
+    for poll in range(POLLS):
+        change(box, poll)
+        await force_coordinator_update(hass)
+
+    for unsub in unsubs:
+        unsub()
+
+    assert writes[EVENT_STATE_CHANGED] <= budget.state_changed * POLLS, writes
+    assert writes[EVENT_STATE_REPORTED] <= budget.state_reported * POLLS, writes
@@ -0,0 +1,35 @@
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import]
+    get_system_health_info,
+)
+
+from custom_components import huesyncbox
+
+from .conftest import setup_integration
+
+
+async def test_system_health(hass: HomeAssistant, mock_api: Mock) -> None:
+    assert await async_setup_component(hass, "system_health", {})
+    integration = await setup_integration(hass, mock_api)
+
+    info = await get_system_health_info(hass, huesyncbox.DOMAIN)
+    assert info == {
+        "boxes": 1,
+        "online": 1,
+        "poll_latency_p95": "-",
+        "requests_per_second": 0,
+        "slowest_box": "-",
+    }
+
+    poll_statistics = integration.entry.runtime_data.coordinator.poll_statistics
+    for duration in (0.1, 0.2, 0.3):
+        poll_statistics.record_poll(duration, success=True)
+        poll_statistics.record_request()
+
+    info = await get_system_health_info(hass, huesyncbox.DOMAIN)
+    assert info["poll_latency_p95"] == "300 ms"
+    assert info["requests_per_second"] == 0.05
+    assert info["slowest_box"] == "Name (300 ms)"
@@ -0,0 +1,136 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+import pytest
+
+import aiohuesyncbox
+from custom_components import huesyncbox
+from custom_components.huesyncbox.tracing import (
+    DATA_TRACER,
+    TRACE_CONFIG,
+    Tracer,
+    async_start_tracing,
+    operation_for_request,
+)
+
+from .conftest import force_coordinator_update, setup_integration
+
+
+async def start_tracing(hass: HomeAssistant, **data: object) -> None:
+    await hass.services.async_call(
+        huesyncbox.DOMAIN, "start_tracing", data, blocking=True
+    )
+
+
+async def stop_tracing(hass: HomeAssistant) -> dict:
+    return await hass.services.async_call(
+        huesyncbox.DOMAIN, "stop_tracing", {}, blocking=True, return_response=True
+    )
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "operation"),
+    [
+        ("get", "", "poll"),
+        ("put", "/execution", "set_state"),
+        ("put", "/hue", "set_bridge"),
+        ("post", "/registrations", "register"),
+        ("delete", "/registrations/1", "unregister"),
+        ("get", "/registrations", "other"),
+    ],
+)
+def test_operation_for_request(method: str, path: str, operation: str) -> None:
+    assert operation_for_request(method, path) == operation
+
+
+async def test_poll_span(hass: HomeAssistant, mock_api: Mock) -> None:
+    await setup_integration(hass, mock_api)
+
+    await start_tracing(hass, sample_rate=1)
+    await force_coordinator_update(hass)
+
+    mock_api.update.side_effect = aiohuesyncbox.RequestError
+    await force_coordinator_update(hass)
+
+    response = await stop_tracing(hass)
+    assert DATA_TRACER not in hass.data
+    assert response["file"] is None
+
+    spans = response["spans"]
+    assert [span["operation"] for span in spans] == ["poll", "poll"]
+    assert [span["outcome"] for span in spans] == ["ok", "request_error"]
+    assert spans[0]["entry_id"] == "entry_id"
+    assert set(spans[0]) >= {
+        "queue_wait_ms",
+        "connect_ms",
+        "request_ms",
+        "parse_ms",
+        "duration_ms",
+    }
+
+
+async def test_request_span(hass: HomeAssistant, mock_api: Mock) -> None:
+    integration = await setup_integration(hass, mock_api)
+    api = integration.entry.runtime_data.coordinator.api
+
+    await start_tracing(hass, sample_rate=1)
+    await api.request("put", "/execution", {"mode": "video"})
+    spans = (await stop_tracing(hass))["spans"]
+
+    assert len(spans) == 1
+    assert spans[0]["operation"] == "set_state"
+
+    # Not tracing anymore
+    await api.request("put", "/execution", {"mode": "video"})
+    assert (await stop_tracing(hass))["spans"] == []
+
+
+async def test_sampling(hass: HomeAssistant, mock_api: Mock) -> None:
+    await setup_integration(hass, mock_api)
+
+    await start_tracing(hass, sample_rate=0)
+    await force_coordinator_update(hass)
+
+    assert (await stop_tracing(hass))["spans"] == []
+
+
+async def test_trace_file(hass: HomeAssistant, mock_api: Mock, tmp_path: Path) -> None:
+    hass.config.config_dir = str(tmp_path)
+    await setup_integration(hass, mock_api)
+
+    await start_tracing(hass, sample_rate=1, write_file=True)
+    await force_coordinator_update(hass)
+    response = await stop_tracing(hass)
+
+    lines = Path(response["file"]).read_text().splitlines()
+    assert [json.loads(line) for line in lines] == response["spans"]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_request_phases(hass: HomeAssistant) -> None:
+    async def handler(_request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    tracer = await async_start_tracing(hass, 1, to_file=False)
+    assert isinstance(tracer, Tracer)
+
+    async with (
+        TestServer(app) as server,
+        aiohttp.ClientSession(trace_configs=[TRACE_CONFIG]) as session,
+    ):
+        with tracer.span("poll", None):
+            for _ in range(2):
+                async with session.get(server.make_url("/")) as response:
+                    await response.json()
+
+    span = tracer.spans[0]
+    assert span["requests"] == 2
+    assert span["outcome"] == "ok"
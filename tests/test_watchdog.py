@@ -0,0 +1,68 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components import huesyncbox
+from custom_components.huesyncbox.watchdog import (
+    DATA_WATCHDOG,
+    LAG_CHECK_INTERVAL,
+    async_start_watchdog,
+    async_stop_watchdog,
+    callback_name,
+)
+
+from .conftest import force_coordinator_update, setup_integration
+
+
+class FakeEntity:
+    entity_id = "switch.fake"
+
+    def handle_update(self) -> None:
+        time.sleep(0.01)
+
+
+def test_callback_name() -> None:
+    def update() -> None:
+        pass
+
+    assert callback_name(FakeEntity().handle_update) == "switch.fake"
+    assert callback_name(update) == "test_callback_name.<locals>.update"
+
+
+async def test_slow_listener(hass: HomeAssistant, mock_api: Mock) -> None:
+    integration = await setup_integration(hass, mock_api)
+    coordinator = integration.entry.runtime_data.coordinator
+    coordinator.async_add_listener(FakeEntity().handle_update)
+
+    # Not timed when the watchdog is not running
+    await force_coordinator_update(hass)
+
+    await hass.services.async_call(
+        huesyncbox.DOMAIN, "start_watchdog", {"threshold": 5}, blocking=True
+    )
+    # Listeners only run when the state of the box changed
+    mock_api.execution.mode = "video"
+    await force_coordinator_update(hass)
+    report = await hass.services.async_call(
+        huesyncbox.DOMAIN, "stop_watchdog", {}, blocking=True, return_response=True
+    )
+
+    assert DATA_WATCHDOG not in hass.data
+    assert report["threshold_ms"] == 5
+    assert report["slow_callbacks"]["switch.fake"]["count"] == 1
+    assert report["slow_callbacks"]["switch.fake"]["max_ms"] >= 10
+    # Entities of the integration itself are fast
+    assert list(report["slow_callbacks"]) == ["switch.fake"]
+
+
+async def test_loop_lag(hass: HomeAssistant) -> None:
+    watchdog = async_start_watchdog(hass, 0.05)
+
+    time.sleep(LAG_CHECK_INTERVAL + 0.1)  # noqa: ASYNC251
+    await asyncio.sleep(0.01)
+
+    assert watchdog.loop_lag.count == 1
+    assert watchdog.loop_lag.max_duration >= 0.05
+    assert async_stop_watchdog(hass) is watchdog
@@ -0,0 +1,52 @@
+"""Runs Home Assistant on simulated time.
+
+The event loop time and the wall clock only move when the clock is advanced.
+Timers that become due on the way run in order, like they would in real time,
+so hours of polling take milliseconds. This covers everything scheduled on the
+loop, like the polls and debouncers of the coordinator and aiohttp timeouts.
+Tasks that sleep do not finish until the clock is advanced past their wake up.
+"""
+
+import asyncio
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+
+class VirtualClock:
+    def __init__(self, hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+        self._hass = hass
+        self._freezer = freezer
+        self._now = hass.loop.time()
+        hass.loop.time = self.time  # type: ignore[method-assign]
+
+    def close(self) -> None:
+        del self._hass.loop.time
+
+    def time(self) -> float:
+        return self._now
+
+    def _next_timer(self) -> float | None:
+        scheduled: list[asyncio.TimerHandle] = self._hass.loop._scheduled  # type: ignore[attr-defined]  # noqa: SLF001
+        return min(
+            (handle.when() for handle in scheduled if not handle.cancelled()),
+            default=None,
+        )
+
+    def _move_to(self, when: float) -> None:
+        if when > self._now:
+            self._freezer.tick(when - self._now)
+            self._now = when
+
+    async def _async_settle(self) -> None:
+        # Run the timers that are due, then whatever they started
+        await asyncio.sleep(0)
+        await self._hass.async_block_till_done()
+
+    async def async_advance(self, seconds: float) -> None:
+        target = self._now + seconds
+        while (when := self._next_timer()) is not None and when <= target:
+            self._move_to(when)
+            await self._async_settle()
+        self._move_to(target)
+        await self._async_settle()